@@ -0,0 +1,293 @@
+from fractions import Fraction
+
+from ComputationMethods.AnalyticCBS.components import Link, Flow
+from ComputationMethods.AnalyticCBS.curves import ConcaveCurve, RateLatencyCurve
+
+"""
+    Closed form implementation of the CBS NC model of the Nancy implementation according to:
+
+    [1]:  J. A. R. De Azua and M. Boyer, “Complete modelling of AVB in network calculus framework” in Proceedings of
+          the 22nd International Conference on Real-Time Networks and Systems. Versaille, France: ACM Press, Oct. 2014,
+          pp. 55–64.
+"""
+
+
+class AnalyticCBS:
+    """
+        Implementation of the CBS Network Calculus Model [1] for flows with token bucket arrival curves. All arrival
+        curves are concave and all minimal service curves are rate-latency curves, so the bounds are computed with
+        exact fractions in closed form. Flows with worst case (stair) arrival curves are not supported.
+
+        :param max_frame_size_a: maximum frame size of class A in byte
+        :param max_frame_size_b: maximum frame size of class B in byte
+        :param max_frame_size_nsr: maximum frame size of NSR in byte
+        :param is_strict: whether the strict minimal service curves are used
+    """
+
+    def __init__(self, max_frame_size_a, max_frame_size_b, max_frame_size_nsr, is_strict):
+        self.max_frame_size_a = max_frame_size_a * 8
+        self.max_frame_size_b = max_frame_size_b * 8
+        self.max_frame_size_nsr = max_frame_size_nsr * 8
+        self.max_frame_size_n = max(self.max_frame_size_b, self.max_frame_size_nsr)
+        self.is_strict = is_strict
+        self.flows: list[Flow] = []
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+        self._starting_flows = {}
+        self._previous_links = {}
+
+    @staticmethod
+    def is_supported(flows: list[Flow]) -> bool:
+        """
+        :param flows: flows of the network, or objects with their avb_class and is_worst_case
+        :return: whether the bounds of the flows can be computed in closed form
+        """
+        return not any(flow.is_worst_case for flow in flows if flow.avb_class.upper() in ("A", "B"))
+
+    def set_flows(self, flows: list[Flow]):
+        """
+        Sets the flows of the network and indexes the links, which feed each link, like Link.PreviousLinks() in Nancy.
+
+        :param flows: flows of the network
+        """
+        self.flows = list(flows)
+        self._values = {}
+        self._starting_flows = {}
+        self._previous_links = {}
+        for flow in self.flows:
+            self._starting_flows.setdefault((flow.path[0], flow.avb_class), []).append(flow)
+            for link in flow.path:
+                # like Array.IndexOf(), a link passed more than once is mapped to its first position
+                index = flow.path.index(link)
+                previous_links = self._previous_links.setdefault(link, [])
+                if index > 0 and flow.path[index - 1] not in previous_links:
+                    previous_links.append(flow.path[index - 1])
+
+    def _get(self, key, compute):
+        """
+        Returns a cached value or computes and stores it.
+
+        :param key: hashable key
+        :param compute: function computing the value
+        :return: value
+        """
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = self._values[key] = compute()
+        return value
+
+    @staticmethod
+    def _token_bucket(burst: Fraction, rate: Fraction):
+        """
+        Creates the curve b + r * t for t > 0, which is 0 at t = 0.
+
+        :param burst: burst b
+        :param rate: rate r
+        :return: curve
+        """
+        return ConcaveCurve.token_bucket(burst, rate)
+
+    @staticmethod
+    def _rate_latency(rate: Fraction, latency: Fraction):
+        """
+        Creates the curve R * max(t - T, 0).
+
+        :param rate: rate R
+        :param latency: latency T
+        :return: curve
+        """
+        return RateLatencyCurve(rate, latency)
+
+    def source_arrival_curve(self, flow: Flow):
+        """
+        Theorem 1 and 2
+
+        :param flow: flow with non-worst case arrival curve
+        :return: arrival curve of the flow at its first link
+        """
+        if flow.is_worst_case:
+            raise ValueError(f"The worst case arrival curve of flow {flow.name} is not a token bucket.")
+        link_speed = flow.path[0].link_speed
+        m = flow.max_interval_frame * flow.max_frame_size * 8
+        r = m / flow.class_measurement_interval
+        b = m * (1 - r / link_speed)
+        if not flow.is_periodic:
+            b = 2 * b
+        return self._token_bucket(0, link_speed).minimum(self._token_bucket(b, r))
+
+    def minimal_service_curve(self, link: Link, avb_class: str):
+        """
+        Theorem 3, 4, 7 and 8
+
+        :param link: link
+        :param avb_class: "A" or "B"
+        :return: rate-latency minimal service curve
+        """
+        if avb_class == "A":
+            rate = Fraction(link.idle_slope_a * link.link_speed, link.idle_slope_a - link.send_slope_a)
+            latency = Fraction(self.max_frame_size_n, link.link_speed)
+            if self.is_strict:
+                latency -= Fraction(self.max_frame_size_a * link.send_slope_a, link.idle_slope_a * link.link_speed)
+            return self._rate_latency(rate, latency)
+        rate = Fraction(link.idle_slope_b * link.link_speed, link.idle_slope_b - link.send_slope_b)
+        latency = (Fraction(self.max_frame_size_nsr + self.max_frame_size_a, link.link_speed)
+                   - Fraction(self.max_frame_size_n * link.idle_slope_a, link.link_speed * link.send_slope_a))
+        if self.is_strict:
+            latency -= Fraction(self.max_frame_size_b * link.send_slope_b, link.link_speed * link.idle_slope_b)
+        return self._rate_latency(rate, latency)
+
+    def shaping_curve(self, link: Link, avb_class: str):
+        """
+        Theorem 5 and 9
+
+        :param link: link
+        :param avb_class: "A" or "B"
+        :return: shaping curve
+        """
+        if avb_class == "A":
+            rate = Fraction(link.idle_slope_a * link.link_speed, link.idle_slope_a - link.send_slope_a)
+            burst = rate * (Fraction(self.max_frame_size_n, link.link_speed)
+                            - Fraction(self.max_frame_size_a * link.send_slope_a, link.idle_slope_a * link.link_speed))
+        elif avb_class == "B":
+            rate = Fraction(link.idle_slope_b * link.link_speed, link.idle_slope_b - link.send_slope_b)
+            burst = rate * (Fraction(self.max_frame_size_nsr + self.max_frame_size_a, link.link_speed)
+                            - Fraction(self.max_frame_size_n * link.idle_slope_a, link.link_speed * link.send_slope_a)
+                            - Fraction(self.max_frame_size_b * link.send_slope_b,
+                                       link.link_speed * link.idle_slope_b))
+        else:
+            raise ValueError(f"Invalid AVB Class: {avb_class}")
+        return self._token_bucket(burst, rate)
+
+    def maximal_service_curve(self, link: Link, avb_class: str):
+        """
+        Theorem 6 and 10
+
+        :param link: link
+        :param avb_class: "A" or "B"
+        :return: maximal service curve
+        """
+        if avb_class == "A":
+            rate = Fraction(link.idle_slope_a * link.link_speed, link.idle_slope_a - link.send_slope_a)
+            burst = rate * -Fraction(self.max_frame_size_a * link.send_slope_a, link.idle_slope_a * link.link_speed)
+        elif avb_class == "B":
+            rate = Fraction(link.idle_slope_b * link.link_speed, link.idle_slope_b - link.send_slope_b)
+            burst = rate * -Fraction(self.max_frame_size_b * link.send_slope_b, link.link_speed * link.idle_slope_b)
+        else:
+            raise ValueError(f"Invalid AVB Class: {avb_class}")
+        return self._token_bucket(burst, rate)
+
+    def incoming_arrival_curve(self, link: Link, avb_class: str):
+        """
+        :param link: link
+        :param avb_class: "A" or "B"
+        :return: sum of the arrival curves of a class entering the link
+        """
+        def compute():
+            curve = self._token_bucket(0, 0)
+            for flow in self._starting_flows.get((link, avb_class), []):
+                curve = curve + self.source_arrival_curve(flow)
+            for previous_link in self._previous_links.get(link, []):
+                curve = curve + self.outgoing_arrival_curve(previous_link, avb_class)
+            return curve
+
+        if ("incoming", link, avb_class) not in self._values:
+            # computes the outgoing arrival curves upstream first, so that long paths do not exhaust the stack
+            self._propagate_arrival_curves(link, avb_class)
+        return self._get(("incoming", link, avb_class), compute)
+
+    def outgoing_arrival_curve(self, link: Link, avb_class: str):
+        """
+        Computes the outgoing arrival curve min(shaper, (incoming ⊗ max. service) ⊘ min. service).
+
+        :param link: link
+        :param avb_class: "A" or "B"
+        :return: arrival curve of a class leaving the link
+        """
+        def compute():
+            incoming = self.incoming_arrival_curve(link, avb_class)
+            curve = incoming.convolution(self.maximal_service_curve(link, avb_class))
+            curve = curve.deconvolution(self.minimal_service_curve(link, avb_class))
+            shaper = self.shaping_curve(link, avb_class)
+            return shaper if curve is None else shaper.minimum(curve)
+
+        return self._get(("outgoing", link, avb_class), compute)
+
+    def _propagate_arrival_curves(self, link: Link, avb_class: str):
+        """
+        Computes the outgoing arrival curves of all links upstream of a link in topological order.
+
+        :param link: link
+        :param avb_class: "A" or "B"
+        """
+        order = []
+        states = {}
+        stack = [(link, iter(self._previous_links.get(link, [])))]
+        states[link] = "visiting"
+        while stack:
+            current, previous_links = stack[-1]
+            for previous_link in previous_links:
+                if ("outgoing", previous_link, avb_class) in self._values:
+                    continue
+                state = states.get(previous_link)
+                if state == "visiting":
+                    raise ValueError(f"Cyclic dependency between the arrival curves of the links: "
+                                     f"{previous_link.name}, {current.name}")
+                if state is None:
+                    states[previous_link] = "visiting"
+                    stack.append((previous_link, iter(self._previous_links.get(previous_link, []))))
+                    break
+            else:
+                stack.pop()
+                states[current] = "done"
+                order.append(current)
+        for upstream_link in order[:-1]:
+            self.outgoing_arrival_curve(upstream_link, avb_class)
+
+    def delay(self, link: Link, avb_class: str) -> Fraction:
+        """
+        Computes the delay bound of a class at a link like Link.ComputeDelay() in Nancy.
+
+        :param link: link
+        :param avb_class: "A" or "B"
+        :return: delay in s
+        """
+        def compute():
+            if avb_class not in ("A", "B"):
+                raise ValueError("Delay of NSR can not be computed.")
+            delay = self.incoming_arrival_curve(link, avb_class).horizontal_deviation(
+                self.minimal_service_curve(link, avb_class))
+            if delay is None:
+                raise ValueError("Infinite Delay")
+            return delay
+
+        return self._get(("delay", link, avb_class), compute)
+
+    def backlog(self, link: Link, avb_class: str) -> Fraction:
+        """
+        Computes the backlog bound of a class at a link like Link.ComputeBacklog() in Nancy.
+
+        :param link: link
+        :param avb_class: "A" or "B"
+        :return: backlog in bit
+        """
+        def compute():
+            backlog = self.incoming_arrival_curve(link, avb_class).vertical_deviation(
+                self.minimal_service_curve(link, avb_class))
+            if backlog is None:
+                raise ValueError("Infinite Backlog")
+            return backlog
+
+        return self._get(("backlog", link, avb_class), compute)
+
+    def end_to_end_delay(self, flow: Flow) -> Fraction:
+        """
+        Computes the end-to-end delay bound of a flow like Flow.ComputeEndToEndDelay() in Nancy.
+
+        :param flow: flow
+        :return: end-to-end delay in s
+        """
+        return self._get(("end_to_end", flow.name),
+                         lambda: sum((self.delay(link, flow.avb_class) for link in flow.path), Fraction(0)))
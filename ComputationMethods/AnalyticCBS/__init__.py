@@ -0,0 +1,3 @@
+from ComputationMethods.AnalyticCBS.AnalyticCBS import AnalyticCBS
+from ComputationMethods.AnalyticCBS.components import Link, Flow
+from ComputationMethods.AnalyticCBS.curves import ConcaveCurve, RateLatencyCurve
@@ -0,0 +1,59 @@
+"""
+    Links and flows of the analytic CBS model, mirroring Link.cs and Flow.cs of the Nancy implementation.
+"""
+from fractions import Fraction
+
+
+class Link:
+    def __init__(self, name, node_i, node_j, link_speed, idle_slope_a, send_slope_a, idle_slope_b, send_slope_b):
+        """
+        Constructor of a directed Link defined by:
+
+        :param name: name of the link
+        :param node_i: name of the start node
+        :param node_j: name of the end node
+        :param link_speed: transmission rate in bit/s
+        :param idle_slope_a: idle slope of class A in bit/s
+        :param send_slope_a: send slope of class A in bit/s
+        :param idle_slope_b: idle slope of class B in bit/s
+        :param send_slope_b: send slope of class B in bit/s
+        """
+        self.name = name
+        self.node_i = node_i
+        self.node_j = node_j
+        self.link_speed = int(link_speed)
+        self.idle_slope_a = int(idle_slope_a)
+        self.send_slope_a = int(send_slope_a)
+        self.idle_slope_b = int(idle_slope_b)
+        self.send_slope_b = int(send_slope_b)
+
+    def __repr__(self):
+        return f"Link({self.name})"
+
+
+class Flow:
+    def __init__(self, name, path, avb_class, is_periodic, is_worst_case, max_frame_size, class_measurement_interval,
+                 max_interval_frame):
+        """
+        Constructor of a Flow defined by:
+
+        :param name: name of the flow
+        :param path: list of links
+        :param avb_class: "A", "B" or "NSR"
+        :param is_periodic: whether the flow is periodic (Theorem 1) or not (Theorem 2)
+        :param is_worst_case: whether the worst case stair arrival curve is used
+        :param max_frame_size: maximum frame size in byte
+        :param class_measurement_interval: class measurement interval in s
+        :param max_interval_frame: maximum number of frames per class measurement interval
+        """
+        self.name = name
+        self.path = list(path)
+        self.avb_class = avb_class.upper()
+        self.is_periodic = bool(is_periodic)
+        self.is_worst_case = bool(is_worst_case)
+        self.max_frame_size = int(max_frame_size)
+        self.class_measurement_interval = Fraction(class_measurement_interval)
+        self.max_interval_frame = int(max_interval_frame)
+
+    def __repr__(self):
+        return f"Flow({self.name})"
@@ -0,0 +1,178 @@
+"""
+    Concave piecewise linear curves with exact arithmetic.
+"""
+import bisect
+from fractions import Fraction
+
+
+class ConcaveCurve:
+    def __init__(self, xs, ys, slopes):
+        """
+        Constructor of a concave piecewise linear curve f with f(0) = 0, which is continuous for t > 0, defined by:
+
+        :param xs: increasing breakpoints starting with 0
+        :param ys: right limits f(x+) at the breakpoints
+        :param slopes: slopes after the breakpoints, the last one holds up to infinity
+        """
+        self.xs = [Fraction(x) for x in xs]
+        self.ys = [Fraction(y) for y in ys]
+        self.slopes = [Fraction(slope) for slope in slopes]
+
+    @staticmethod
+    def token_bucket(burst, rate) -> 'ConcaveCurve':
+        """
+        Returns the token bucket (sigma-rho) curve b + r * t for t > 0.
+
+        :param burst: burst b
+        :param rate: rate r
+        :return: curve
+        """
+        return ConcaveCurve([0], [burst], [rate])
+
+    def __call__(self, t) -> Fraction:
+        """
+        Returns the right limit f(t+).
+
+        :param t: time >= 0
+        :return: value
+        """
+        k = bisect.bisect_right(self.xs, t) - 1
+        return self.ys[k] + self.slopes[k] * (t - self.xs[k])
+
+    def slope(self, t) -> Fraction:
+        """
+        Returns the slope right of t.
+
+        :param t: time >= 0
+        :return: slope
+        """
+        return self.slopes[bisect.bisect_right(self.xs, t) - 1]
+
+    def is_zero(self) -> bool:
+        return all(y == 0 for y in self.ys) and all(slope == 0 for slope in self.slopes)
+
+    def __add__(self, other: 'ConcaveCurve') -> 'ConcaveCurve':
+        xs = sorted(set(self.xs) | set(other.xs))
+        return ConcaveCurve._simplified(xs, [self(x) + other(x) for x in xs],
+                                        [self.slope(x) + other.slope(x) for x in xs])
+
+    def minimum(self, other: 'ConcaveCurve') -> 'ConcaveCurve':
+        """
+        Returns the pointwise minimum of two curves.
+
+        :param other: curve
+        :return: curve
+        """
+        xs = sorted(set(self.xs) | set(other.xs))
+        points = []
+        for index, x in enumerate(xs):
+            y_a, y_b = self(x), other(x)
+            slope_a, slope_b = self.slope(x), other.slope(x)
+            points.append((x, min(y_a, y_b), slope_a if (y_a, slope_a) <= (y_b, slope_b) else slope_b))
+            if slope_a != slope_b:
+                # the curves cross within the segment
+                crossing = x + (y_b - y_a) / (slope_a - slope_b)
+                if x < crossing and (index + 1 == len(xs) or crossing < xs[index + 1]):
+                    points.append((crossing, self(crossing), min(slope_a, slope_b)))
+        return ConcaveCurve._simplified(*zip(*points))
+
+    def convolution(self, other: 'ConcaveCurve') -> 'ConcaveCurve':
+        """
+        Returns the min-plus convolution, which is the minimum for concave curves through the origin.
+
+        :param other: curve
+        :return: curve
+        """
+        return self.minimum(other)
+
+    def deconvolution(self, service: 'RateLatencyCurve') -> 'ConcaveCurve | None':
+        """
+        Returns the min-plus deconvolution with a rate-latency curve.
+
+        :param service: rate-latency curve
+        :return: curve or None if the deconvolution is infinite
+        """
+        rate, latency = service.rate, service.latency
+        start = self._rate_point(rate)
+        if start is None:
+            return None
+        # the supremum is taken at max(start, T), before that the result grows with the rate R
+        start = max(start, latency)
+        points = []
+        if start > latency:
+            points.append((0, self(start) - rate * (start - latency), rate))
+        points.append((start - latency, self(start), self.slope(start)))
+        points.extend((x - latency, self(x), self.slope(x)) for x in self.xs if x > start)
+        return ConcaveCurve._simplified(*zip(*points))
+
+    def horizontal_deviation(self, service: 'RateLatencyCurve'):
+        """
+        Returns the horizontal deviation to a rate-latency curve, i.e. the delay bound.
+
+        :param service: rate-latency curve
+        :return: deviation or None if it is infinite
+        """
+        rate, latency = service.rate, service.latency
+        if self.is_zero():
+            return Fraction(0)
+        start = self._rate_point(rate)
+        if start is None:
+            return None
+        return latency + self(start) / rate - start
+
+    def vertical_deviation(self, service: 'RateLatencyCurve'):
+        """
+        Returns the vertical deviation to a rate-latency curve, i.e. the backlog bound.
+
+        :param service: rate-latency curve
+        :return: deviation or None if it is infinite
+        """
+        rate, latency = service.rate, service.latency
+        start = self._rate_point(rate)
+        if start is None:
+            return None
+        start = max(start, latency)
+        return self(start) - rate * (start - latency)
+
+    def _rate_point(self, rate):
+        """
+        Returns the first breakpoint after which the slope does not exceed a rate.
+
+        :param rate: rate
+        :return: breakpoint or None if the final slope exceeds the rate
+        """
+        for x, slope in zip(self.xs, self.slopes):
+            if slope <= rate:
+                return x
+        return None
+
+    @staticmethod
+    def _simplified(xs, ys, slopes) -> 'ConcaveCurve':
+        """
+        Creates a curve without breakpoints, which do not change the slope.
+        """
+        points = [(xs[0], ys[0], slopes[0])]
+        for x, y, slope in zip(xs[1:], ys[1:], slopes[1:]):
+            last_x, last_y, last_slope = points[-1]
+            if slope != last_slope or y != last_y + last_slope * (x - last_x):
+                points.append((x, y, slope))
+        return ConcaveCurve(*zip(*points))
+
+    def __repr__(self):
+        return f"ConcaveCurve({[str(x) for x in self.xs]}, {[str(y) for y in self.ys]}, " \
+               f"{[str(slope) for slope in self.slopes]})"
+
+
+class RateLatencyCurve:
+    def __init__(self, rate, latency):
+        """
+        Constructor of a rate-latency curve R * max(t - T, 0) defined by:
+
+        :param rate: rate R
+        :param latency: latency T
+        """
+        self.rate = Fraction(rate)
+        self.latency = Fraction(latency)
+
+    def __repr__(self):
+        return f"RateLatencyCurve({self.rate}, {self.latency})"
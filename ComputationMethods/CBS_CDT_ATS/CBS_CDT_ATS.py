@@ -1,4 +1,10 @@
+import bisect
+import collections
+import itertools
 import math
+from abc import ABC, abstractmethod
+
+import numpy as np
 
 from ComputationMethods.CBS_CDT_ATS import components
 
@@ -24,50 +30,365 @@ class CBS:
 
     def __init__(self, f):
         self.f = f
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = {}
+        self._build_index()
+
+    def _build_index(self, link_table=None):
+        """
+        Aggregates the flow parameters per link, so that the formulas do not have to scan every flow.
+
+        :param link_table: link table to reuse, keeps the keys of unchanged links stable
+        """
+        self.links = components.LinkTable() if link_table is None else link_table
+        self._links = {}
+        self._successors = {}
+        self._entries = {}
+        # flows by the IDs of the link objects on their paths
+        self._link_flows = {}
+        self._positions = itertools.count()
+        self._maxima_counts = {name: collections.Counter() for name in _MAXIMA}
+        self._l_a_max = 0
+        self._l_be_max = 0
+        self._l_a = 0
+        for f in self.f:
+            self._aggregate_flow(f, next(self._positions), self.links.intern_path(f.p))
+
+    def _aggregate_flow(self, f, position, path_keys):
+        """
+        Adds a flow to the aggregates of the links it passes and to the maximum packet lengths.
+
+        :param f: flow object
+        :param position: position of the flow in f, aggregates keep their flows in this order
+        :param path_keys: keys of the links of the path of the flow
+        """
+        entry = self._entries[f] = _FlowEntry(f, position, path_keys)
+        self._add_to_aggregates(f, entry, entry.keys, entry.successor_keys)
+        self._count_maxima(entry.maxima, 1)
+
+    def _withdraw_flow(self, f):
+        """
+        Subtracts a flow from the aggregates it was added to by _aggregate_flow(). Only these aggregates are updated.
+
+        :param f: flow object
+        :return: entry of the flow
+        """
+        entry = self._entries.pop(f)
+        self._remove_from_aggregates(f, entry, entry.keys, entry.successor_keys)
+        self._release_keys(entry.keys)
+        self._count_maxima(entry.maxima, -1)
+        return entry
+
+    def _move_flow(self, f, is_changed):
+        """
+        Interns a flow of the model again after it or one of its links was changed. If only the keys of some links of
+        the flow changed, the flow is only moved between the aggregates of these links.
+
+        :param f: flow object
+        :param is_changed: whether the parameters or the path of the flow changed
+        :return: (entry before the change, entry after the change)
+        """
+        old_entry = self._entries[f]
+        new_entry = self._entries[f] = _FlowEntry(f, old_entry.position, self.links.intern_path(f.p))
+        if is_changed:
+            self._remove_from_aggregates(f, old_entry, old_entry.keys, old_entry.successor_keys)
+            self._add_to_aggregates(f, new_entry, new_entry.keys, new_entry.successor_keys)
+            self._count_maxima(old_entry.maxima, -1)
+            self._count_maxima(new_entry.maxima, 1)
+        else:
+            self._remove_from_aggregates(
+                f, old_entry, [key for key in old_entry.keys if key not in new_entry.keys],
+                [key for key in old_entry.successor_keys if key not in new_entry.successor_keys])
+            self._add_to_aggregates(
+                f, new_entry, [key for key in new_entry.keys if key not in old_entry.keys],
+                [key for key in new_entry.successor_keys if key not in old_entry.successor_keys])
+        self._release_keys(old_entry.keys)
+        return old_entry, new_entry
+
+    def _release_keys(self, keys):
+        """
+        Releases the keys of links in the link table, which are not passed by any flow any more.
+
+        :param keys: link keys
+        """
+        for key in keys:
+            if key not in self._links:
+                self.links.release(key)
+
+    def _add_to_aggregates(self, f, entry, keys, successor_keys):
+        """
+        Adds a flow to link and successor aggregates.
+
+        :param f: flow object
+        :param entry: entry of the flow
+        :param keys: keys of link aggregates
+        :param successor_keys: keys of successor aggregates
+        """
+        for link in entry.links:
+            self._link_flows.setdefault(id(link), {})[f] = None
+        for key in keys:
+            aggregate = self._links.get(key)
+            if aggregate is None:
+                aggregate = self._links[key] = _LinkAggregate()
+            aggregate.add_flow(f, entry.position)
+        for successor_key in successor_keys:
+            successor = self._successors.get(successor_key)
+            if successor is None:
+                successor = self._successors[successor_key] = _SuccessorAggregate()
+            successor.add_flow(f, entry.position)
+
+    def _remove_from_aggregates(self, f, entry, keys, successor_keys):
+        """
+        Removes a flow from link and successor aggregates. Aggregates without flows are deleted.
+
+        :param f: flow object
+        :param entry: entry of the flow
+        :param keys: keys of link aggregates
+        :param successor_keys: keys of successor aggregates
+        """
+        for link in entry.links:
+            flows = self._link_flows.get(id(link))
+            if flows is not None:
+                flows.pop(f, None)
+                if not flows:
+                    del self._link_flows[id(link)]
+        for key in keys:
+            aggregate = self._links[key]
+            aggregate.remove_flow(f)
+            if not aggregate.flows:
+                del self._links[key]
+        for successor_key in successor_keys:
+            successor = self._successors[successor_key]
+            successor.remove_flow(f)
+            if not successor.flows:
+                del self._successors[successor_key]
+
+    def _count_maxima(self, maxima, delta):
+        """
+        Counts the packet lengths of a flow for the maximum packet lengths over all flows used by (1) and (3).
+
+        :param maxima: (name of the maximum, packet length) of the flow
+        :param delta: 1 if the flow is added, -1 if it is removed
+        """
+        for name, l_max in maxima:
+            counts = self._maxima_counts[name]
+            counts[l_max] += delta
+            if counts[l_max] <= 0:
+                del counts[l_max]
+                if l_max == getattr(self, name):
+                    setattr(self, name, max(0, max(counts, default=0)))
+            elif l_max > getattr(self, name):
+                setattr(self, name, l_max)
+
+    def add_flow(self, f):
+        """
+        Adds a flow to the model. Only the aggregates of the links passed by the flow are updated.
+
+        :param f: flow object
+        :return: keys of the links whose results were dropped or None if the whole cache was dropped
+        """
+        maxima = self._l_a_max, self._l_be_max, self._l_a
+        self.f.append(f)
+        self._aggregate_flow(f, next(self._positions), self.links.intern_path(f.p))
+        return self._drop_cached(set(self._entries[f].keys), maxima)
+
+    def remove_flow(self, f):
+        """
+        Removes a flow from the model. Its contribution is subtracted from the aggregates of the links passed by the
+        flow, the other aggregates are not touched.
+
+        :param f: flow object, which was added to the model before
+        :return: keys of the links whose results were dropped or None if the whole cache was dropped
+        """
+        maxima = self._l_a_max, self._l_be_max, self._l_a
+        if self.f and self.f[-1] is f:
+            # e.g. a candidate flow of an admission check
+            self.f.pop()
+        else:
+            self.f.remove(f)
+        entry = self._withdraw_flow(f)
+        return self._drop_cached(set(entry.keys), maxima)
+
+    def _drop_cached(self, affected, maxima):
+        """
+        Drops the cached results of the given links.
+
+        :param affected: keys of links whose aggregates changed
+        :param maxima: maximum packet lengths of (1) and (3) before the change
+        :return: affected or None if the whole cache was dropped
+        """
+        if maxima != (self._l_a_max, self._l_be_max, self._l_a):
+            # (1) and (3) depend on maxima over all flows
+            self._cache.clear()
+            return None
+        for cache_key in [k for k in self._cache if k[2] in affected or (len(k) > 3 and k[3] in affected)]:
+            del self._cache[cache_key]
+        return affected
+
+    def invalidate(self, link=None, flow=None):
+        """
+        Updates the model after a change and drops the cached results affected by it. Only the aggregates of the
+        changed link or of the links passed by the changed flow are updated. Without arguments the whole model is
+        rebuilt. Flows are added and removed by add_flow() and remove_flow().
+
+        :param link: link object whose parameters were changed
+        :param flow: flow object of the model whose parameters or path were changed
+        :return: keys of the links whose results were dropped or None if the whole cache was dropped
+        """
+        if link is None and flow is None:
+            self._cache.clear()
+            self._build_index()
+            return None
+
+        maxima = self._l_a_max, self._l_be_max, self._l_a
+        affected = set()
+        if link is not None:
+            for f in list(self._link_flows.get(id(link), ())):
+                old_entry, _ = self._move_flow(f, is_changed=False)
+                affected.update(key for l, key in zip(old_entry.links, old_entry.path_keys) if l is link)
+            if self.links.key_of(link) is not None:
+                affected.add(self.links.key_of(link))
+        if flow is not None:
+            old_entry, new_entry = self._move_flow(flow, is_changed=True)
+            affected.update(old_entry.keys)
+            affected.update(new_entry.keys)
+        return self._drop_cached(affected, maxima)
+
+    def maxima(self):
+        """
+        Returns the maximum packet lengths over all flows, which every result of (1) and (3) depends on.
+
+        :return: tuple of the maximum packet lengths
+        """
+        return self._l_a_max, self._l_be_max, self._l_a
+
+    def cache_info(self):
+        """
+        Returns statistics about the result cache.
+
+        :return: dictionary with the number of hits, misses and cached results
+        """
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "size": len(self._cache)}
+
+    def _cached(self, cache_key):
+        """
+        Looks up a result in the cache.
+
+        :param cache_key: (quantity, class, link keys...)
+        :return: cached result or _MISSING
+        """
+        if None in cache_key:
+            # results for links which are unknown to the model are not cached
+            return _MISSING
+        value = self._cache.get(cache_key, _MISSING)
+        if value is _MISSING:
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+        return value
+
+    def _store(self, cache_key, value):
+        """
+        Stores a result in the cache.
+
+        :param cache_key: (quantity, class, link keys...)
+        :param value: result
+        :return: result
+        """
+        if None not in cache_key:
+            self._cache[cache_key] = value
+        return value
+
+    def __getstate__(self):
+        attributes = self.__dict__.copy()
+        # the flows are indexed by the IDs of the link objects, which a copy of the model does not keep
+        del attributes["_link_flows"]
+        attributes["_positions"] = max((entry.position for entry in self._entries.values()), default=-1) + 1
+        return attributes
+
+    def __setstate__(self, attributes):
+        self.__dict__.update(attributes)
+        self._positions = itertools.count(attributes["_positions"])
+        self._link_flows = {}
+        for f, entry in self._entries.items():
+            for link in entry.links:
+                self._link_flows.setdefault(id(link), {})[f] = None
+
+    def _hops(self, flow):
+        """
+        Returns the path keys and hop positions of a flow with respect to the link table of this model.
+
+        :param flow: flow object
+        :return: (path keys, first position of every key in the path)
+        """
+        entry = self._entries.get(flow)
+        if entry is None:
+            # keys of flows outside the model may have been released since they were interned
+            path_keys = self.links.intern_path(flow.p)
+        else:
+            path_keys = entry.path_keys
+        return path_keys, _hop_positions(path_keys)
+
+    def _aggregate(self, link):
+        """
+        Returns the aggregated flow parameters of a link.
+
+        :param link: link object
+        :return: link aggregate
+        """
+        aggregate = self._links.get(self.links.key_of(link))
+        if aggregate is None:
+            return _EMPTY_AGGREGATE
+        return aggregate
+
+    def _successor(self, t, link_ij, link_jk):
+        """
+        Returns the aggregated parameters of the flows of a class, which continue from link (i,j) to link (j,k).
+
+        :param t: traffic class
+        :param link_ij: link object (i,j)
+        :param link_jk: link object (j,k)
+        :return: successor aggregate
+        """
+        successor = self._successors.get((t, self.links.key_of(link_ij), self.links.key_of(link_jk)))
+        if successor is None:
+            raise ValueError(f"No flow of class {t} continues from link ({link_ij.i},{link_ij.j}) to link "
+                             f"({link_jk.i},{link_jk.j})")
+        return successor
 
     # (1) & (3)
     def t_i_j(self, flow, link):
-        r = 0
-        b = 0
-        cdt_flows = filter(lambda x: x.t == "CDT", self.f)
-        for f in cdt_flows:
-            if link in f.p:
-                r = r + f.r
-                b = b + f.l_max
-
-        l_max_f = filter(lambda x: link in x.p and (x.t != "CDT"), self.f)
-        l_max = 0
-        for f in l_max_f:
-            if f.l_max > l_max:
-                l_max = f.l_max
-        l_a_max = 0
-        l_a_max_f = filter(lambda x: x.t != "A" and x.t != "CDT", self.f)
-        for f in l_a_max_f:
-            if f.l_max > l_a_max:
-                l_a_max = f.l_max
+        cache_key = "t", flow.t, self.links.key_of(link)
+        value = self._cached(cache_key)
+        if value is _MISSING:
+            value = self._store(cache_key, self._t_i_j(flow, link))
+        return value
+
+    def _t_i_j(self, flow, link):
+        aggregate = self._aggregate(link)
+        r = aggregate.cdt_r
+        b = aggregate.cdt_b
+        l_max = aggregate.l_max
+        l_a_max = self._l_a_max
         if flow.t == "A":
             return 1 / (link.c - r) * (l_a_max + b + (r * l_max) / link.c)
         elif flow.t == "B":
-            l_be_max_f = filter(lambda x: x.t == "BE", self.f)
-            l_be_max = 0
-            for f in l_be_max_f:
-                if f.l_max > l_be_max:
-                    l_be_max = f.l_max
-            l_a_f = filter(lambda x: x.t == "A", self.f)
-            l_a = 0
-            for f in l_a_f:
-                if f.l_max > l_a:
-                    l_a = f.l_max
+            l_be_max = self._l_be_max
+            l_a = self._l_a
             return 1 / (link.c - r) * (l_be_max + l_a - (l_a_max * link.idsl_a) / link.sdsl_a + b +
                                        (r * l_max) / link.c)
 
     # (2) & (4)
     def r_i_j(self, flow, link):
-        r = -1
-        cdt_flows = filter(lambda x: x.t == "CDT", self.f)
-        for f in cdt_flows:
-            if link in f.p:
-                r = f.r
+        cache_key = "r", flow.t, self.links.key_of(link)
+        value = self._cached(cache_key)
+        if value is _MISSING:
+            value = self._store(cache_key, self._r_i_j(flow, link))
+        return value
+
+    def _r_i_j(self, flow, link):
+        r = self._aggregate(link).cdt_last_r
         if flow.t == "A":
             return link.idsl_a * (link.c - r) / (link.idsl_a - link.sdsl_a)
         elif flow.t == "B":
@@ -79,74 +400,436 @@ class CBS:
             ψ_f = flow.l_max
         else:
             ψ_f = flow.l_min
-        f_x = filter(lambda x: x.t == flow.t and link in x.p, self.f)
-        b_tot = 0
-        for f in f_x:
-            b_tot += f.l_max
+        cache_key = "s", flow.t, self.links.key_of(link), ψ_f
+        value = self._cached(cache_key)
+        if value is _MISSING:
+            value = self._store(cache_key, self._s_i_j(flow, link, ψ_f))
+        return value
+
+    def _s_i_j(self, flow, link, ψ_f):
+        b_tot = self._aggregate(link).l_max_total.get(flow.t, 0)
         t = self.t_i_j(flow, link)
         return t + (b_tot - ψ_f) / self.r_i_j(flow, link) + ψ_f / link.c + link.t_var_max
 
     # (7)
     def c_i_j_k(self, flow, link_ij, link_jk):
-        f_x = filter(lambda x: x.t == flow.t and link_ij in x.p, self.f)
-        b_tot = 0
-        for f in f_x:
-            b_tot += f.l_max
-        sup = []
-        for f in self.f:
-            if link_ij in f.p:
-                if f.t == flow.t and f.p.index(link_ij) + 1 < len(f.p):
-                    if f.p[f.p.index(link_ij) + 1] == link_jk:
-                        if f.at == "LRQ":
-                            sup.append(f.l_max / link_ij.c - f.l_max / self.r_i_j(flow, link_ij))
-                        else:
-                            sup.append(f.l_min / link_ij.c - f.l_min / self.r_i_j(flow, link_ij))
-        return self.t_i_j(flow, link_ij) + b_tot / self.r_i_j(flow, link_ij) + link_ij.t_var_max + max(sup) + \
-               link_ij.t_proc_max
+        cache_key = "c", flow.t, self.links.key_of(link_ij), self.links.key_of(link_jk)
+        value = self._cached(cache_key)
+        if value is _MISSING:
+            value = self._store(cache_key, self._c_i_j_k(flow, link_ij, link_jk))
+        return value
+
+    def _c_i_j_k(self, flow, link_ij, link_jk):
+        b_tot = self._aggregate(link_ij).l_max_total.get(flow.t, 0)
+        successor = self._successor(flow.t, link_ij, link_jk)
+        r = self.r_i_j(flow, link_ij)
+        # the supremum of ψ_f / c - ψ_f / r is attained at the smallest or the largest ψ_f
+        sup = max(ψ_f / link_ij.c - ψ_f / r for ψ_f in (successor.ψ_min, successor.ψ_max))
+        return self.t_i_j(flow, link_ij) + b_tot / r + link_ij.t_var_max + sup + link_ij.t_proc_max
 
     # (9)
     def end_to_end_delay(self, flow):
+        path_keys, hop_positions = self._hops(flow)
         sum_c = 0
-        for link in flow.p:
-            if flow.p.index(link) == len(flow.p) - 1:
+        for link, key in zip(flow.p, path_keys):
+            index = hop_positions[key]
+            if index == len(flow.p) - 1:
                 break
-            sum_c += self.c_i_j_k(flow, link, flow.p[flow.p.index(link) + 1])
+            sum_c += self.c_i_j_k(flow, link, flow.p[index + 1])
         return sum_c + self.s_i_j(flow, flow.p[-1])
 
+    # (9) for many flows at once
+    def end_to_end_delays(self, flows):
+        """
+        Computes the end-to-end delays of class A and B flows with vectorized operations.
+
+        :param flows: list of flows
+        :return: array of end-to-end delays in s, NaN for flows that are neither of class A nor B
+        """
+        classes = np.array([0 if flow.t == "A" else 1 if flow.t == "B" else -1 for flow in flows], dtype=np.int64)
+        hops, successors = self._flow_hop_matrices(flows, classes)
+        ψ = np.array([flow.l_max if flow.at == "LRQ" else flow.l_min for flow in flows], dtype=np.float64)
+
+        links = self._link_arrays()
+        is_used = successors >= 0
+        is_used[:, -1] = True
+        self._check_links(links, hops, is_used, classes)
+        is_a = classes == 0
+        t = np.where(is_a[:, None], links["t_a"][hops], links["t_b"][hops])
+        r = np.where(is_a[:, None], links["r_a"][hops], links["r_b"][hops])
+        b_tot = np.where(is_a[:, None], links["b_tot_a"][hops], links["b_tot_b"][hops])
+        c = links["c"][hops]
+
+        # (7) for every hop but the last one of a path
+        ψ_min, ψ_max = self._successor_arrays()
+        ψ_min, ψ_max = ψ_min[successors], ψ_max[successors]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sup = np.maximum(ψ_min / c - ψ_min / r, ψ_max / c - ψ_max / r)
+            c_i_j_k = t + b_tot / r + links["t_var_max"][hops] + sup + links["t_proc_max"][hops]
+
+        sum_c = np.zeros(len(flows))
+        for index in range(hops.shape[1] - 1):
+            sum_c = sum_c + np.where(successors[:, index] >= 0, c_i_j_k[:, index], 0)
+
+        # (5) at the last link of a path
+        last = hops[:, -1]
+        t, r, b_tot, c = t[:, -1], r[:, -1], b_tot[:, -1], c[:, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s_i_j = t + (b_tot - ψ) / r + ψ / c + links["t_var_max"][last]
+
+        delays = sum_c + s_i_j
+        delays[classes < 0] = np.nan
+        return delays
+
+    def end_to_end_delay_bounds(self, flows):
+        """
+        Estimates lower and upper bounds of the end-to-end delays of class A and B flows. Instead of the flows
+        continuing from a link to the next link of a path, (7) uses the packet lengths of all flows leaving the link.
+
+        :param flows: list of flows
+        :return: (lower bounds, upper bounds) as arrays in s, NaN for flows that are neither of class A nor B
+        """
+        classes = np.array([0 if flow.t == "A" else 1 if flow.t == "B" else -1 for flow in flows], dtype=np.int64)
+        max_hops = max((len(flow.p) for flow in flows), default=1)
+        hops = np.zeros((len(flows), max_hops + 1), dtype=np.int64)
+        is_hop = np.zeros((len(flows), max_hops + 1), dtype=bool)
+        for row, flow in enumerate(flows):
+            path_keys, hop_positions = self._hops(flow)
+            hops[row, -1] = path_keys[-1]
+            for column, key in enumerate(path_keys):
+                if hop_positions[key] == len(path_keys) - 1:
+                    break
+                hops[row, column] = key
+                is_hop[row, column] = True
+        ψ = np.array([flow.l_max if flow.at == "LRQ" else flow.l_min for flow in flows], dtype=np.float64)
+
+        # smallest and largest ψ_f of the flows of a class leaving a link towards any next link
+        ψ_low = np.full((2, len(self.links)), np.inf)
+        ψ_high = np.full((2, len(self.links)), -np.inf)
+        for (t, key, _), successor in self._successors.items():
+            if t == "A" or t == "B":
+                row = 0 if t == "A" else 1
+                ψ_low[row, key] = min(ψ_low[row, key], successor.ψ_min)
+                ψ_high[row, key] = max(ψ_high[row, key], successor.ψ_max)
+
+        links = self._link_arrays()
+        is_used = is_hop.copy()
+        is_used[:, -1] = True
+        self._check_links(links, hops, is_used, classes)
+        is_a = classes == 0
+        t = np.where(is_a[:, None], links["t_a"][hops], links["t_b"][hops])
+        r = np.where(is_a[:, None], links["r_a"][hops], links["r_b"][hops])
+        b_tot = np.where(is_a[:, None], links["b_tot_a"][hops], links["b_tot_b"][hops])
+        c = links["c"][hops]
+        ψ_low = np.where(is_a[:, None], ψ_low[0][hops], ψ_low[1][hops])
+        ψ_high = np.where(is_a[:, None], ψ_high[0][hops], ψ_high[1][hops])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # ψ_f / c - ψ_f / r is linear in ψ_f, so its extremes are attained at the extremes of ψ_f
+            sup_low = np.minimum(ψ_low / c - ψ_low / r, ψ_high / c - ψ_high / r)
+            sup_high = np.maximum(ψ_low / c - ψ_low / r, ψ_high / c - ψ_high / r)
+            c_i_j = t + b_tot / r + links["t_var_max"][hops] + links["t_proc_max"][hops]
+            sum_low = np.where(is_hop, c_i_j + sup_low, 0).sum(axis=1)
+            sum_high = np.where(is_hop, c_i_j + sup_high, 0).sum(axis=1)
+
+            last = hops[:, -1]
+            t, r, b_tot, c = t[:, -1], r[:, -1], b_tot[:, -1], c[:, -1]
+            s_i_j = t + (b_tot - ψ) / r + ψ / c + links["t_var_max"][last]
+
+        lower, upper = sum_low + s_i_j, sum_high + s_i_j
+        # guard against rounding errors, the bounds must not be tighter than the exact delays
+        lower, upper = lower - np.abs(lower) * 1e-9, upper + np.abs(upper) * 1e-9
+        lower[classes < 0] = np.nan
+        upper[classes < 0] = np.nan
+        return lower, upper
+
+    def _flow_hop_matrices(self, flows, classes):
+        """
+        Creates the flow x hop incidence matrices used by end_to_end_delays().
+
+        :param flows: list of flows
+        :param classes: class of every flow (0 = A, 1 = B, -1 = other)
+        :return: (link keys of every hop, successor aggregate row of every hop or -1); the last column holds the
+                 last link of every path
+        """
+        max_hops = max((len(flow.p) for flow in flows), default=1)
+        hops = np.zeros((len(flows), max_hops + 1), dtype=np.int64)
+        successors = np.full((len(flows), max_hops + 1), -1, dtype=np.int64)
+        successor_rows = self._successor_rows()
+        for row, flow in enumerate(flows):
+            path_keys, hop_positions = self._hops(flow)
+            hops[row, -1] = path_keys[-1]
+            if classes[row] < 0:
+                continue
+            for column, key in enumerate(path_keys):
+                index = hop_positions[key]
+                if index == len(path_keys) - 1:
+                    break
+                successor_key = flow.t, key, path_keys[index + 1]
+                if successor_key not in successor_rows:
+                    self._successor(flow.t, flow.p[column], flow.p[index + 1])
+                hops[row, column] = key
+                successors[row, column] = successor_rows[successor_key]
+        return hops, successors
+
+    def _check_links(self, links, hops, is_used, classes):
+        """
+        Raises the error of the single flow equations, if a class A or B flow passes a link, at which (1) - (5) divide
+        by zero, instead of returning infinite or NaN delays.
+
+        :param links: arrays of _link_arrays()
+        :param hops: link keys of every hop
+        :param is_used: whether a hop is evaluated
+        :param classes: class of every flow (0 = A, 1 = B, -1 = other)
+        """
+        is_zero = np.where((classes == 0)[:, None], links["is_zero_a"][hops], links["is_zero_b"][hops])
+        is_zero &= is_used & (classes >= 0)[:, None]
+        if is_zero.any():
+            row, column = np.argwhere(is_zero)[0]
+            link = self.links.link(int(hops[row, column]))
+            raise ZeroDivisionError(f"float division by zero at link ({link.i},{link.j})")
+
+    def _link_arrays(self):
+        """
+        Evaluates the link dependent parts of (1) - (5) for every link of the link table.
+
+        :return: dictionary of arrays indexed by link key
+        """
+        links = self.links.to_array()
+        aggregates = [self._links.get(key, _EMPTY_AGGREGATE) for key in range(len(self.links))]
+
+        def array(values):
+            return np.array(list(values), dtype=np.float64)
+
+        c = links["c"]
+        idsl_a, sdsl_a = links["idsl_a"], links["sdsl_a"]
+        idsl_b, sdsl_b = links["idsl_b"], links["sdsl_b"]
+        r_cdt = array(aggregate.cdt_r for aggregate in aggregates)
+        b_cdt = array(aggregate.cdt_b for aggregate in aggregates)
+        r_last = array(aggregate.cdt_last_r for aggregate in aggregates)
+        l_max = array(aggregate.l_max for aggregate in aggregates)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_a = 1 / (c - r_cdt) * (self._l_a_max + b_cdt + (r_cdt * l_max) / c)
+            t_b = 1 / (c - r_cdt) * (self._l_be_max + self._l_a - (self._l_a_max * idsl_a) / sdsl_a + b_cdt +
+                                     (r_cdt * l_max) / c)
+            r_a = idsl_a * (c - r_last) / (idsl_a - sdsl_a)
+            r_b = idsl_b * (c - r_last) / (idsl_b - sdsl_b)
+        # links, at which (1) - (5) divide by zero for a class
+        is_zero = (c == 0) | (c - r_cdt == 0)
+        return {"c": c, "t_a": t_a, "t_b": t_b, "r_a": r_a, "r_b": r_b,
+                "is_zero_a": is_zero | (idsl_a - sdsl_a == 0) | (r_a == 0),
+                "is_zero_b": is_zero | (idsl_b - sdsl_b == 0) | (r_b == 0) | (sdsl_a == 0),
+                "b_tot_a": array(aggregate.l_max_total.get("A", 0) for aggregate in aggregates),
+                "b_tot_b": array(aggregate.l_max_total.get("B", 0) for aggregate in aggregates),
+                "t_var_max": links["t_var_max"], "t_proc_max": links["t_proc_max"]}
+
+    def _successor_rows(self):
+        """
+        Returns the row of every successor aggregate in the arrays of _successor_arrays().
+
+        :return: dictionary mapping (class, key (i,j), key (j,k)) to a row
+        """
+        return {successor_key: row for row, successor_key in enumerate(self._successors)}
+
+    def _successor_arrays(self):
+        """
+        Returns the extreme ψ_f values of every successor aggregate, followed by a neutral row for hops without a
+        successor.
+
+        :return: (smallest ψ_f, largest ψ_f)
+        """
+        successors = list(self._successors.values())
+        return (np.array([successor.ψ_min for successor in successors] + [0], dtype=np.float64),
+                np.array([successor.ψ_max for successor in successors] + [0], dtype=np.float64))
+
     # (8)
     def h_i_j_k(self, flow, link_ij, link_jk):
+        cache_key = "h", flow.t, self.links.key_of(link_ij), self.links.key_of(link_jk), flow.l_max
+        value = self._cached(cache_key)
+        if value is _MISSING:
+            value = self._store(cache_key, self._h_i_j_k(flow, link_ij, link_jk))
+        return value
+
+    def _h_i_j_k(self, flow, link_ij, link_jk):
         return self.c_i_j_k(flow, link_ij, link_jk) - flow.l_max / link_ij.c - link_ij.t_var_min - link_jk.t_proc_min
 
     # (11)
     def backlog_interleaved_regulator(self, flow, link_ij, link_jk):
-        sup = []
-        bs = 0
-        rs = 0
+        successor = self._successor(flow.t, link_ij, link_jk)
+        bs = successor.l_max_total
+        rs = successor.r_total
         bw = 0
-        d_i_j_k = []
-        for f in self.f:
-            if link_ij in f.p:
-                if f.t == flow.t and f.p.index(link_ij) + 1 < len(f.p):
-                    if f.p[f.p.index(link_ij) + 1] == link_jk:
-                        sup.append(f.l_max)
-                        bs += f.l_max
-                        rs += f.r
-                        d_i_j_k.append(self.h_i_j_k(flow, link_ij, link_jk))
-
-        return min(link_ij.c * max(d_i_j_k) + max(sup), rs * max(d_i_j_k) + bs + rs *
+        d_i_j_k = self.h_i_j_k(flow, link_ij, link_jk)
+
+        return min(link_ij.c * d_i_j_k + successor.l_max, rs * d_i_j_k + bs + rs *
                    (self.t_i_j(flow, link_ij) + bw / self.r_i_j(flow, link_ij)))
 
     # (12)
     def backlog_cbfs(self, t, link_ij):
         b = 0
         r_t = 0
-        for f in self.f:
-            if link_ij in f.p and f.t == t:
+        for f in self._aggregate(link_ij).flows:
+            if f.t == t:
                 b += f.l_max
                 r_t += f.r * self.t_i_j(f, link_ij)
         return b + r_t
 
 
+class _Aggregate(ABC):
+    """
+    Parameters aggregated over a set of flows. The flows are kept in the order of the model, so an aggregate, from
+    which a flow was removed, equals the aggregate built from scratch.
+    """
+
+    def __init__(self):
+        self.flows = []
+        self._positions = []
+        self._reset()
+
+    def add_flow(self, f, position):
+        """
+        Adds a flow to the aggregate.
+
+        :param f: flow object
+        :param position: position of the flow in the model
+        """
+        if self._positions and position < self._positions[-1]:
+            index = bisect.bisect(self._positions, position)
+            self.flows.insert(index, f)
+            self._positions.insert(index, position)
+            self._recompute()
+            return
+        self.flows.append(f)
+        self._positions.append(position)
+        self._add(f)
+
+    def remove_flow(self, f):
+        """
+        Removes a flow from the aggregate and recomputes it from its remaining flows.
+
+        :param f: flow object
+        """
+        index = next(index for index, g in enumerate(self.flows) if g is f)
+        del self.flows[index], self._positions[index]
+        self._recompute()
+
+    def _recompute(self):
+        self._reset()
+        for f in self.flows:
+            self._add(f)
+
+    @abstractmethod
+    def _reset(self):
+        """
+        Sets the aggregated parameters to the parameters of an empty set of flows.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _add(self, f):
+        """
+        Adds the parameters of a flow to the aggregated parameters.
+
+        :param f: flow object
+        """
+        raise NotImplementedError()
+
+
+class _LinkAggregate(_Aggregate):
+    """
+    Flow parameters aggregated at a single link.
+    """
+
+    def _reset(self):
+        self.cdt_r = 0
+        self.cdt_b = 0
+        self.cdt_last_r = -1
+        self.l_max = 0
+        self.l_max_total = {}
+
+    def _add(self, f):
+        if f.t == "CDT":
+            self.cdt_r = self.cdt_r + f.r
+            self.cdt_b = self.cdt_b + f.l_max
+            self.cdt_last_r = f.r
+        elif f.l_max > self.l_max:
+            self.l_max = f.l_max
+        self.l_max_total[f.t] = self.l_max_total.get(f.t, 0) + f.l_max
+
+
+_EMPTY_AGGREGATE = _LinkAggregate()
+
+_MISSING = object()
+
+# maximum packet lengths over all flows used by (1) and (3)
+_MAXIMA = ("_l_a_max", "_l_be_max", "_l_a")
+
+
+class _SuccessorAggregate(_Aggregate):
+    """
+    Parameters of the flows of a class, which pass link (i,j) and then link (j,k).
+    """
+
+    def _reset(self):
+        self.ψ_min = math.inf
+        self.ψ_max = -math.inf
+        self.l_max = 0
+        self.l_max_total = 0
+        self.r_total = 0
+
+    def _add(self, f):
+        ψ_f = f.l_max if f.at == "LRQ" else f.l_min
+        self.ψ_min = min(self.ψ_min, ψ_f)
+        self.ψ_max = max(self.ψ_max, ψ_f)
+        self.l_max = max(self.l_max, f.l_max)
+        self.l_max_total += f.l_max
+        self.r_total += f.r
+
+
+class _FlowEntry:
+    """
+    Keys of the aggregates and maxima a flow was added to, so that it can be subtracted later without looking at
+    other flows.
+
+    :param f: flow object
+    :param position: position of the flow in the model
+    :param path_keys: keys of the links of the path of the flow
+    """
+    __slots__ = "position", "links", "path_keys", "keys", "successor_keys", "maxima"
+
+    def __init__(self, f, position, path_keys):
+        self.position = position
+        self.links = tuple(f.p)
+        self.path_keys = path_keys
+        hop_positions = _hop_positions(path_keys)
+        self.keys = tuple(hop_positions)
+        self.successor_keys = tuple((f.t, key, path_keys[index + 1]) for key, index in hop_positions.items()
+                                    if index + 1 < len(path_keys))
+        maxima = []
+        if f.t != "A" and f.t != "CDT":
+            maxima.append(("_l_a_max", f.l_max))
+        if f.t == "BE":
+            maxima.append(("_l_be_max", f.l_max))
+        if f.t == "A":
+            maxima.append(("_l_a", f.l_max))
+        self.maxima = tuple(maxima)
+
+
+def _hop_positions(path_keys):
+    """
+    Returns the position of every link key in a path. Like list.index(), a link passed more than once is mapped to its
+    first position.
+
+    :param path_keys: keys of the links of a path
+    :return: dictionary mapping a link key to its position
+    """
+    hop_positions = {}
+    for index, key in enumerate(path_keys):
+        hop_positions.setdefault(key, index)
+    return hop_positions
+
+
 # recreate case study
 if __name__ == '__main__':
     idsl = 50 * math.pow(10, 6)
@@ -5,9 +5,14 @@
           Congress (ITC 30), volume 2, pages 1–6. IEEE, 2018.
           
 """
+import array
+
+import numpy as np
 
 
 class Flow:
+    __slots__ = "r", "p", "l_min", "l_max", "t", "at"
+
     def __init__(self, r, l_min, l_max, p, t, at):
         """
         Constructor of a Flow for [1] defined by:
@@ -28,6 +33,9 @@ class Flow:
 
 
 class Link:
+    __slots__ = ("i", "j", "c", "idsl_a", "sdsl_a", "idsl_b", "sdsl_b", "t_var_min", "t_var_max", "t_proc_min",
+                 "t_proc_max")
+
     def __init__(self, i, j, c, idsl_a, sdsl_a, idsl_b, sdsl_b, t_var_min, t_var_max, t_proc_min, t_proc_max):
         """
         Constructor of a Link for [1] defined by:
@@ -56,12 +64,120 @@ class Link:
         self.t_proc_min = float(t_proc_min)
         self.t_proc_max = float(t_proc_max)
 
+    def identity(self):
+        """
+        Returns a hashable identity. Two links are equal if and only if their identities are equal.
+
+        :return: link identity
+        """
+        # According to [1] a link (i,j) is the same as (j,i) to get the same results as the case study
+        i, j = (self.i, self.j) if self.i <= self.j else (self.j, self.i)
+        return (i, j, self.c, self.idsl_a, self.sdsl_a, self.idsl_b, self.sdsl_b, self.t_var_min, self.t_var_max,
+                self.t_proc_min, self.t_proc_max)
+
     def __eq__(self, other):
         if not isinstance(other, Link):
             raise Exception("Can't be compared with other classes")
-        # According to [1] a link (i,j) is the same as (j,i) to get the same results as the case study
-        return ((self.i == other.i and self.j == other.j) or (self.i == other.j and self.j == other.i)) and self.c == \
-               other.c and self.idsl_a == other.idsl_a and self.sdsl_a == other.sdsl_a and self.idsl_b == other.idsl_b \
-               and self.sdsl_b == other.sdsl_b and self.t_proc_max == other.t_proc_max and \
-               self.t_var_min == other.t_var_min and self.t_proc_min == other.t_proc_min and \
-               self.t_var_max == other.t_var_max
+        return self.identity() == other.identity()
+
+
+class LinkTable:
+    def __init__(self):
+        """
+        Interns links, every distinct link gets a canonical integer key. A link which is changed after it was interned
+        gets the key of its new parameters the next time it is interned. Keys, which are not used any more, are
+        released and reused by new links.
+        """
+        self._keys = {}
+        self._links = []
+        # identities the keys were created for, they stay valid when an interned link is changed
+        self._identities = []
+        self._free_keys = []
+
+    def intern(self, link):
+        """
+        Returns the key of a link and adds the link to the table if necessary.
+
+        :param link: link object
+        :return: link key
+        """
+        identity = link.identity()
+        key = self._keys.get(identity)
+        if key is None:
+            if self._free_keys:
+                key = self._free_keys.pop()
+                self._links[key] = link
+                self._identities[key] = identity
+            else:
+                key = len(self._links)
+                self._links.append(link)
+                self._identities.append(identity)
+            self._keys[identity] = key
+        elif self._links[key] is not link and self._links[key].identity() != identity:
+            # the link interned first was changed afterwards
+            self._links[key] = link
+        return key
+
+    def intern_path(self, path):
+        """
+        Returns the keys of the links of a path and adds the links to the table if necessary.
+
+        :param path: list of link objects
+        :return: array of link keys
+        """
+        return array.array("q", [self.intern(link) for link in path])
+
+    def release(self, key):
+        """
+        Removes the links with a key from the table. The key is reused by the next new link.
+
+        :param key: link key, which is not used by any path any more
+        """
+        del self._keys[self._identities[key]]
+        self._links[key] = None
+        self._identities[key] = None
+        self._free_keys.append(key)
+
+    def key_of(self, link):
+        """
+        Returns the key of a link without adding it to the table.
+
+        :param link: link object
+        :return: link key or None if the link is unknown
+        """
+        return self._keys.get(link.identity())
+
+    def link(self, key):
+        """
+        Returns a link interned for a key.
+
+        :param key: link key
+        :return: link object
+        """
+        return self._links[key]
+
+    def identity(self, key):
+        """
+        Returns the identity of the links with a key.
+
+        :param key: link key
+        :return: link identity as returned by Link.identity() or None if the key was released
+        """
+        return self._identities[key]
+
+    def __len__(self):
+        return len(self._links)
+
+    def to_array(self):
+        """
+        Returns the parameters of all links as one structured array, the row of a link is its key. Rows of released
+        keys are NaN.
+
+        :return: structured array with the fields of LINK_DTYPE
+        """
+        return np.array([_RELEASED_ROW if identity is None else identity[2:] for identity in self._identities],
+                        dtype=LINK_DTYPE)
+
+
+LINK_DTYPE = np.dtype([(name, np.float64) for name in Link.__slots__[2:]])
+_RELEASED_ROW = (np.nan,) * len(LINK_DTYPE.names)
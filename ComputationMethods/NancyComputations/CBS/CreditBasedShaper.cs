@@ -15,6 +15,7 @@ public class CreditBasedShaper
         MaxFrameSizeNsr = maxFrameSizeNsr * 8;
         MaxFrameSizeN = BigInteger.Max(MaxFrameSizeB, MaxFrameSizeNsr);
         Flows = Array.Empty<Flow>();
+        Links = Array.Empty<Link>();
         IsStrict = isStrict;
     }
 
@@ -23,10 +24,69 @@ public class CreditBasedShaper
     public BigInteger MaxFrameSizeNsr { get; }
     public BigInteger MaxFrameSizeN { get; }
     public Flow[] Flows { get; private set; }
+    public Link[] Links { get; private set; }
     public bool IsStrict { get; }
 
     public void SetFlows(Flow[] flows) => Flows = flows;
 
+    public void SetNetwork(string[] linkNames, string[] nodesI, string[] nodesJ, long[] linkParameters,
+            string[] flowNames, int[] pathOffsets, int[] pathLinks, int[] avbClasses, bool[] isPeriodic,
+            bool[] isWorstCase, long[] maxFrameSizes, long[] cmiNumerators, long[] cmiDenominators,
+            long[] maxIntervalFrames)
+        //creates all links and flows at once, every link has 5 parameters (link speed, idle and send slopes),
+        //the path of flow f consists of the links pathLinks[pathOffsets[f]] to pathLinks[pathOffsets[f + 1] - 1]
+    {
+        Links = new Link[linkNames.Length];
+        for (var i = 0; i < Links.Length; i++)
+        {
+            Links[i] = new Link(this, linkNames[i], nodesI[i], nodesJ[i], linkParameters[5 * i],
+                linkParameters[5 * i + 1], linkParameters[5 * i + 2], linkParameters[5 * i + 3],
+                linkParameters[5 * i + 4]);
+        }
+
+        var flows = new Flow[flowNames.Length];
+        for (var f = 0; f < flows.Length; f++)
+        {
+            var path = new Link[pathOffsets[f + 1] - pathOffsets[f]];
+            for (var h = 0; h < path.Length; h++)
+                path[h] = Links[pathLinks[pathOffsets[f] + h]];
+            flows[f] = new Flow(flowNames[f], path, (AvbClass)avbClasses[f], isPeriodic[f], isWorstCase[f],
+                maxFrameSizes[f], new Rational(cmiNumerators[f], cmiDenominators[f]), maxIntervalFrames[f]);
+        }
+
+        Flows = flows;
+    }
+
+    public static string[] ComputeEndToEndDelays(Flow[] flows)
+        //numerator and denominator of the end-to-end delay of every flow
+    {
+        var values = new string[2 * flows.Length];
+        for (var f = 0; f < flows.Length; f++)
+            WriteRational(values, f, ComputeEndToEndDelay(flows[f]));
+        return values;
+    }
+
+    public static string[] ComputeLinkBounds(Link[] links)
+        //numerator and denominator of the delays of class A and B and the backlogs of class A and B of every link
+    {
+        var values = new string[8 * links.Length];
+        for (var i = 0; i < links.Length; i++)
+        {
+            WriteRational(values, 4 * i, links[i].ComputeDelay(AvbClass.A));
+            WriteRational(values, 4 * i + 1, links[i].ComputeDelay(AvbClass.B));
+            WriteRational(values, 4 * i + 2, links[i].ComputeBacklog(AvbClass.A));
+            WriteRational(values, 4 * i + 3, links[i].ComputeBacklog(AvbClass.B));
+        }
+
+        return values;
+    }
+
+    private static void WriteRational(string[] values, int index, Rational value)
+    {
+        values[2 * index] = value.Numerator.ToString();
+        values[2 * index + 1] = value.Denominator.ToString();
+    }
+
     public static Rational ComputeEndToEndDelay(Flow flow)
     {
         var delay = new Rational(0);
@@ -4,6 +4,7 @@ from typing import overload, Union, Optional
 class Rational:
     def __init__(self, numerator, denominator):
         _ = numerator, denominator
+        self.IsPlusInfinite: bool = False
 
 
 class BigInteger:
@@ -12,7 +13,12 @@ class BigInteger:
 
 
 class Curve:
-    pass
+
+    @staticmethod
+    def HorizontalDeviation(a: 'Curve', b: 'Curve') -> Rational: ...
+
+    @staticmethod
+    def VerticalDeviation(a: 'Curve', b: 'Curve') -> Rational: ...
 
 
 class AvbClass:
@@ -30,10 +36,22 @@ class NancyCBS:
         self.MaxFrameSizeNsr: BigInteger = maxFrameSizeNsr
         self.MaxFrameSizeN: BigInteger = maxFrameSizeNsr
         self.Flows: list['Flow'] = []
+        self.Links: list['Link'] = []
         self.IsStrict: bool = isStrict
 
     def SetFlows(self, flows: list['Flow']): ...
 
+    def SetNetwork(self, linkNames: list[str], nodesI: list[str], nodesJ: list[str], linkParameters: list[int],
+                   flowNames: list[str], pathOffsets: list[int], pathLinks: list[int], avbClasses: list[int],
+                   isPeriodic: list[bool], isWorstCase: list[bool], maxFrameSizes: list[int],
+                   cmiNumerators: list[int], cmiDenominators: list[int], maxIntervalFrames: list[int]): ...
+
+    @staticmethod
+    def ComputeEndToEndDelays(flows: list['Flow']) -> list[str]: ...
+
+    @staticmethod
+    def ComputeLinkBounds(links: list['Link']) -> list[str]: ...
+
     @staticmethod
     def ComputeEndToEndDelay(flow: 'Flow') -> Rational: ...
 
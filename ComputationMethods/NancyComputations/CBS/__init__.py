@@ -1,15 +1,26 @@
 from ComputationMethods.NancyComputations.load_dll import load_dll
-# interface description
+# interface description, replaced by the C# implementation in load_backend()
 from .CsharpInterface import Rational, BigInteger, Curve, AvbClass, NancyCBS, Link, Flow, Plot
 
 dll_dir = "ComputationMethods/NancyComputations/DLLs/CBS/"
 dll_name = "CBS"
-load_dll(dll_dir, dll_name)
+is_loaded = False
 
-# replace interface description with actual C# implementation
-from CBS import CreditBasedShaper as NancyCBS, Link, Flow, AvbClass, Plot  # C# syntax: from NAMESPACE import CLASS
-from Unipi.Nancy.Numerics import Rational
-from System.Numerics import BigInteger
 
-# avoid unused import warning
-_ = NancyCBS, Rational, BigInteger, Link, Flow, AvbClass, Plot
+def load_backend():
+    """
+    Starts the .NET runtime and loads the dll, if it is not loaded yet. Afterwards, the names of this module refer to
+    the actual C# implementation. Until then, the interface description is available without .NET, e.g. for the UI
+    and serialization, so the attributes have to be accessed through the module instead of being imported.
+    """
+    global Rational, BigInteger, Curve, AvbClass, NancyCBS, Link, Flow, Plot, is_loaded
+    if is_loaded:
+        return
+    load_dll(dll_dir, dll_name)
+
+    # replace interface description with actual C# implementation
+    from CBS import CreditBasedShaper as NancyCBS, Link, Flow, AvbClass, Plot  # C# syntax: from NAMESPACE import CLASS
+    from Unipi.Nancy.Numerics import Rational
+    from Unipi.Nancy.MinPlusAlgebra import Curve
+    from System.Numerics import BigInteger
+    is_loaded = True
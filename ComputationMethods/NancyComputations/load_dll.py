@@ -1,17 +1,28 @@
-import pythonnet as pynet
-from clr_loader import get_coreclr
+_is_runtime_loaded = False
 
-# initialize .NET core runtime
-pynet.load(get_coreclr())
 
-import clr
+def load_runtime():
+    """
+    Initializes the .NET core runtime, if it is not initialized yet.
+    """
+    global _is_runtime_loaded
+    if _is_runtime_loaded:
+        return
+    import pythonnet as pynet
+    from clr_loader import get_coreclr
+
+    pynet.load(get_coreclr())
+    _is_runtime_loaded = True
 
 
 def load_dll(dll_dir, dll_name):
     """
-    Loads .NET dll.
+    Loads .NET dll. The .NET core runtime is initialized on the first call.
 
     :param dll_dir: directory of the dll file
     :param dll_name: name of the dll file
     """
+    load_runtime()
+    import clr
+
     clr.AddReference(dll_dir + dll_name)
@@ -0,0 +1,57 @@
+from ComputationMethods.AnalyticCBS import AnalyticCBS, Flow
+from ComputationMethods.NumpyCBS.curves import Curve
+
+"""
+    Floating point implementation of the CBS NC model of the Nancy implementation according to:
+
+    [1]:  J. A. R. De Azua and M. Boyer, “Complete modelling of AVB in network calculus framework” in Proceedings of
+          the 22nd International Conference on Real-Time Networks and Systems. Versaille, France: ACM Press, Oct. 2014,
+          pp. 55–64.
+"""
+
+
+class NumpyCBS(AnalyticCBS):
+    """
+        Implementation of the CBS Network Calculus Model [1] with piecewise linear curves stored in NumPy arrays. In
+        contrast to AnalyticCBS, flows with worst case (stair) arrival curves are supported. The stair curves are kept
+        for a number of steps and continue with their affine upper bound afterwards.
+
+        :param max_frame_size_a: maximum frame size of class A in byte
+        :param max_frame_size_b: maximum frame size of class B in byte
+        :param max_frame_size_nsr: maximum frame size of NSR in byte
+        :param is_strict: whether the strict minimal service curves are used
+        :param stair_steps: number of exact steps of the worst case arrival curves
+    """
+
+    def __init__(self, max_frame_size_a, max_frame_size_b, max_frame_size_nsr, is_strict, stair_steps=100):
+        super().__init__(max_frame_size_a, max_frame_size_b, max_frame_size_nsr, is_strict)
+        self.stair_steps = stair_steps
+
+    @staticmethod
+    def is_supported(flows: list[Flow]) -> bool:
+        return True
+
+    @staticmethod
+    def _token_bucket(burst, rate) -> Curve:
+        return Curve.sigma_rho(float(burst), float(rate))
+
+    @staticmethod
+    def _rate_latency(rate, latency) -> Curve:
+        return Curve.rate_latency(float(rate), float(latency))
+
+    def source_arrival_curve(self, flow: Flow) -> Curve:
+        """
+        Theorem 1 and 2, the worst case arrival curves are m * ceil(t / CMI) ⊗ λ_C for periodic flows and
+        m * (ceil(t / CMI) + 1) ⊗ λ_C otherwise.
+
+        :param flow: flow
+        :return: arrival curve of the flow at its first link
+        """
+        if not flow.is_worst_case:
+            return super().source_arrival_curve(flow)
+        link_speed = flow.path[0].link_speed
+        m = flow.max_interval_frame * flow.max_frame_size * 8
+        curve = Curve.stair(float(m), float(flow.class_measurement_interval), self.stair_steps)
+        if not flow.is_periodic:
+            curve = curve + Curve.sigma_rho(float(m), 0)
+        return curve.convolution(Curve.sigma_rho(0, float(link_speed)))
@@ -0,0 +1,54 @@
+from ComputationMethods.AnalyticCBS import Link, Flow
+from ComputationMethods.NumpyCBS.NumpyCBS import NumpyCBS
+from ComputationMethods.RTCToolboxCBS.CBSInterface import CBSInterface
+
+
+class NumpyWrapper(CBSInterface):
+    """
+    Provides the calls of the MATLAB implementation with NumpyCBS, so the RTC Toolbox configuration can compute the
+    bounds without MATLAB. No curve plots are saved.
+    """
+
+    def CBS(self, max_frame_size_a: float, max_frame_size_b: float, max_frame_size_nsr: float, is_strict: bool,
+            flows: list[Flow]) -> NumpyCBS:
+        cbs = NumpyCBS(max_frame_size_a, max_frame_size_b, max_frame_size_nsr, is_strict)
+        cbs.set_flows(flows)
+        return cbs
+
+    def delay_link(self, cbs: NumpyCBS, link: Link, avb_class: str, path_folder: str, network_name: str) -> float:
+        return float(cbs.delay(link, avb_class))
+
+    def backlog_link(self, cbs: NumpyCBS, link: Link, avb_class: str, path_folder: str, network_name: str) -> float:
+        return float(cbs.backlog(link, avb_class))
+
+    def end_to_end_delay(self, cbs: NumpyCBS, flow: Flow, path_folder: str, network_name: str) -> float:
+        return float(cbs.end_to_end_delay(flow))
+
+    def analyze_network(self, max_frame_size_a: float, max_frame_size_b: float, max_frame_size_nsr: float,
+                        is_strict: bool, links: list[list], flows: list[list], flow_indices: list[int],
+                        link_indices: list[int], path_folder: str, network_name: str,
+                        plot_flow_indices: list[int] = (), plot_link_indices: list[int] = ()
+                        ) -> tuple[list[float], list[list[float]], list[list[float]]]:
+        links = [self.Link(*parameters) for parameters in links]
+        flows = [self.Flow(name, max_frame_size, class_measurement_interval, max_interval_frame,
+                           [links[index] for index in path], avb_class, is_periodic, is_worst_case)
+                 for name, max_frame_size, class_measurement_interval, max_interval_frame, path, avb_class,
+                 is_periodic, is_worst_case in flows]
+        cbs = self.CBS(max_frame_size_a, max_frame_size_b, max_frame_size_nsr, is_strict, flows)
+        return ([float(cbs.end_to_end_delay(flows[index])) for index in flow_indices],
+                [[float(cbs.delay(links[index], avb_class)) for avb_class in ("A", "B")] for index in link_indices],
+                [[float(cbs.backlog(links[index], avb_class)) for avb_class in ("A", "B")] for index in link_indices])
+
+    def Flow(self, name: str, max_frame_size: int, class_measurement_interval: float, max_interval_frame: int,
+             path: list[Link], avb_class: str, is_periodic: str, is_worst_case: str) -> Flow:
+        return Flow(name, path, avb_class, is_periodic == "p", is_worst_case == "wc", max_frame_size,
+                    class_measurement_interval, max_interval_frame)
+
+    def Link(self, name: str, node_i: str, node_j: str, c: float, idle_slope_a: float, send_slope_a: float,
+             idle_slope_b: float, send_slope_b: float) -> Link:
+        return Link(name, node_i, node_j, c, idle_slope_a, send_slope_a, idle_slope_b, send_slope_b)
+
+    def exit(self):
+        """
+        Nothing to shut down.
+        """
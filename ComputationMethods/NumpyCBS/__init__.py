@@ -0,0 +1,3 @@
+from ComputationMethods.NumpyCBS.NumpyCBS import NumpyCBS
+from ComputationMethods.NumpyCBS.curves import Curve
+from ComputationMethods.NumpyCBS.NumpyWrapper import NumpyWrapper
@@ -0,0 +1,323 @@
+"""
+    Ultimately affine piecewise linear curves with NumPy arrays.
+"""
+import numpy as np
+
+
+class Curve:
+    def __init__(self, x, y, y_right, slopes):
+        """
+        Constructor of a piecewise linear curve f on [0, inf), which is affine after its last breakpoint, defined by:
+
+        :param x: increasing breakpoints starting with 0
+        :param y: values f(x) at the breakpoints
+        :param y_right: right limits f(x+) at the breakpoints
+        :param slopes: slopes after the breakpoints, the last one holds up to infinity
+        """
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.y_right = np.asarray(y_right, dtype=np.float64)
+        self.slopes = np.asarray(slopes, dtype=np.float64)
+
+    @staticmethod
+    def sigma_rho(burst, rate) -> 'Curve':
+        """
+        :param burst: burst b
+        :param rate: rate r
+        :return: token bucket curve b + r * t for t > 0, which is 0 at t = 0
+        """
+        return Curve([0], [0], [burst], [rate])
+
+    @staticmethod
+    def rate_latency(rate, latency) -> 'Curve':
+        """
+        :param rate: rate R
+        :param latency: latency T
+        :return: rate-latency curve R * max(t - T, 0)
+        """
+        if latency <= 0:
+            return Curve([0], [-rate * latency], [-rate * latency], [rate])
+        return Curve([0, latency], [0, 0], [0, 0], [0, rate])
+
+    @staticmethod
+    def stair(height, period, steps) -> 'Curve':
+        """
+        Returns the stair curve h * ceil(t / p). Only the first steps are kept, afterwards the curve continues with the
+        affine upper bound h + h * t / p, so bounds computed with it are safe and exact as long as the busy periods
+        end within the kept steps.
+
+        :param height: height h of a step
+        :param period: length p of a step
+        :param steps: number of kept steps
+        :return: curve
+        """
+        k = np.arange(steps + 1, dtype=np.float64)
+        slopes = np.zeros(steps + 1)
+        slopes[-1] = height / period
+        return Curve(k * period, k * height, (k + 1) * height, slopes)
+
+    def __call__(self, t):
+        """
+        :param t: time or array of times >= 0
+        :return: values f(t)
+        """
+        t = np.asarray(t, dtype=np.float64)
+        k = self._index(t)
+        return np.where(t == self.x[k], self.y[k], self.y_right[k] + self.slopes[k] * (t - self.x[k]))
+
+    def right_limit(self, t):
+        """
+        :param t: time or array of times >= 0
+        :return: right limits f(t+)
+        """
+        t = np.asarray(t, dtype=np.float64)
+        k = self._index(t)
+        return self.y_right[k] + self.slopes[k] * (t - self.x[k])
+
+    def left_limit(self, t):
+        """
+        :param t: time or array of times > 0
+        :return: left limits f(t-)
+        """
+        t = np.asarray(t, dtype=np.float64)
+        k = np.maximum(np.searchsorted(self.x, t, side="left") - 1, 0)
+        return self.y_right[k] + self.slopes[k] * (t - self.x[k])
+
+    def slope(self, t):
+        """
+        :param t: time or array of times >= 0
+        :return: slopes right of t
+        """
+        return self.slopes[self._index(np.asarray(t, dtype=np.float64))]
+
+    def _index(self, t):
+        return np.searchsorted(self.x, t, side="right") - 1
+
+    def _left_limits(self):
+        """
+        :return: left limits at the breakpoints except 0
+        """
+        return self.y_right[:-1] + self.slopes[:-1] * np.diff(self.x)
+
+    def __neg__(self) -> 'Curve':
+        return Curve(self.x, -self.y, -self.y_right, -self.slopes)
+
+    def __add__(self, other: 'Curve') -> 'Curve':
+        x = np.union1d(self.x, other.x)
+        return Curve._simplified(x, self(x) + other(x), self.right_limit(x) + other.right_limit(x),
+                                 self.slope(x) + other.slope(x))
+
+    def minimum(self, other: 'Curve') -> 'Curve':
+        """
+        Returns the pointwise minimum of two curves.
+
+        :param other: curve
+        :return: curve
+        """
+        x = np.union1d(self.x, other.x)
+        # the curves cross at most once between two breakpoints
+        difference = self.right_limit(x) - other.right_limit(x)
+        slopes = other.slope(x) - self.slope(x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossings = x + difference / slopes
+        ends = np.append(x[1:], np.inf)
+        x = np.union1d(x, crossings[(slopes != 0) & (crossings > x) & (crossings < ends)])
+
+        # the lower curve of every interval is chosen in its middle
+        middles = np.append((x[:-1] + x[1:]) / 2, x[-1] + 1)
+        is_self = self.right_limit(middles) <= other.right_limit(middles)
+        if self.slopes[-1] != other.slopes[-1]:
+            is_self[-1] = self.slopes[-1] < other.slopes[-1]
+        return Curve._simplified(x, np.minimum(self(x), other(x)),
+                                 np.where(is_self, self.right_limit(x), other.right_limit(x)),
+                                 np.where(is_self, self.slope(x), other.slope(x)))
+
+    def maximum(self, other: 'Curve') -> 'Curve':
+        """
+        Returns the pointwise maximum of two curves.
+
+        :param other: curve
+        :return: curve
+        """
+        return -(-self).minimum(-other)
+
+    def convolution(self, other: 'Curve') -> 'Curve':
+        """
+        Returns the min-plus convolution of two nondecreasing curves, if one of them is concave with f(0) = 0 or a
+        rate-latency curve.
+
+        :param other: curve
+        :return: curve
+        """
+        for curve, operand in ((self, other), (other, self)):
+            if operand._is_concave():
+                result = None
+                # a concave curve is the minimum of token buckets
+                for burst, rate in zip(operand.y_right - operand.slopes * operand.x, operand.slopes):
+                    convolution = curve._token_bucket_convolution(burst, rate)
+                    result = convolution if result is None else result.minimum(convolution)
+                return result
+            rate_latency = operand._get_rate_latency()
+            if rate_latency is not None:
+                rate, latency = rate_latency
+                return curve._token_bucket_convolution(0, rate)._delayed(latency)
+        raise ValueError("The convolution requires a concave or rate-latency curve.")
+
+    def deconvolution(self, other: 'Curve') -> 'Curve | None':
+        """
+        Returns the min-plus deconvolution of a nondecreasing curve with a rate-latency curve.
+
+        :param other: rate-latency curve
+        :return: curve or None if the deconvolution is infinite
+        """
+        rate_latency = other._get_rate_latency()
+        if rate_latency is None:
+            raise ValueError("The deconvolution requires a rate-latency curve.")
+        rate, latency = rate_latency
+        if self.slopes[-1] > rate:
+            return None
+
+        # f ⊘ λ_R (t) = max(f(t), R * t + sup_{s > t} f(s) - R * s), the supremum is taken at a limit of a breakpoint
+        points = self.y - rate * self.x
+        right_limits = self.y_right - rate * self.x
+        left_limits = np.append(-np.inf, self._left_limits() - rate * self.x[1:])
+        anchors = np.maximum(np.maximum(points, right_limits), left_limits)
+        after = np.append(np.maximum.accumulate(anchors[:0:-1])[::-1], -np.inf)
+        after = np.maximum(after, np.append(left_limits[1:], -np.inf))
+        # after the last breakpoint, f decreases faster than R * t, so f itself is the maximum
+        y_right = np.append(rate * self.x[:-1] + after[:-1], self.y_right[-1])
+        y = np.maximum(rate * self.x + right_limits, y_right)
+        slopes = np.append(np.full(len(self.x) - 1, rate), self.slopes[-1])
+        return self.maximum(Curve(self.x, y, y_right, slopes))._advanced(latency)
+
+    def horizontal_deviation(self, other: 'Curve') -> float | None:
+        """
+        Returns the horizontal deviation to a continuous nondecreasing curve, i.e. the delay bound.
+
+        :param other: curve
+        :return: deviation or None if it is infinite
+        """
+        if self.slopes[-1] > other.slopes[-1]:
+            return None
+        # between these times, both the curve and the inverse of the other curve are affine
+        x = self.x[:, np.newaxis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossings = x + (other.y[np.newaxis, :] - self.y_right[:, np.newaxis]) / self.slopes[:, np.newaxis]
+        ends = np.append(self.x[1:], np.inf)[:, np.newaxis]
+        t = np.union1d(self.x, crossings[(crossings > x) & (crossings < ends)])
+
+        deviations = [other._lower_inverse(self(t)) - t,
+                      np.where(self.slope(t) > 0, other._upper_inverse(self.right_limit(t)),
+                               other._lower_inverse(self.right_limit(t))) - t,
+                      other._lower_inverse(self.left_limit(t[1:])) - t[1:]]
+        deviation = max(float(np.max(values, initial=0)) for values in deviations)
+        return None if np.isinf(deviation) else deviation
+
+    def vertical_deviation(self, other: 'Curve') -> float | None:
+        """
+        Returns the vertical deviation to a curve, i.e. the backlog bound.
+
+        :param other: curve
+        :return: deviation or None if it is infinite
+        """
+        if self.slopes[-1] > other.slopes[-1]:
+            return None
+        x = np.union1d(self.x, other.x)
+        return float(max(np.max(self(x) - other(x)), np.max(self.right_limit(x) - other.right_limit(x)),
+                         np.max(self.left_limit(x[1:]) - other.left_limit(x[1:]), initial=-np.inf)))
+
+    def _token_bucket_convolution(self, burst, rate) -> 'Curve':
+        """
+        Returns the convolution with the token bucket curve b + r * t, which is 0 at t = 0:
+        min(f(t), b + r * t + inf_{s < t} f(s) - r * s), the infimum is taken at a limit of a breakpoint.
+
+        :param burst: burst b >= 0
+        :param rate: rate r
+        :return: curve
+        """
+        points = self.y - rate * self.x
+        right_limits = self.y_right - rate * self.x
+        left_limits = np.append(np.inf, self._left_limits() - rate * self.x[1:])
+        before = np.minimum.accumulate(np.minimum(np.minimum(points, right_limits), left_limits))
+        before_points = np.minimum(np.append(np.inf, before[:-1]), left_limits)
+        y = burst + rate * self.x + before_points
+        y[0] = self.y[0]
+        return self.minimum(Curve(self.x, y, burst + rate * self.x + before, np.full(len(self.x), rate)))
+
+    def _delayed(self, delay) -> 'Curve':
+        """
+        :param delay: delay T >= 0
+        :return: nondecreasing curve shifted to the right, f(max(t - T, 0))
+        """
+        if delay <= 0:
+            return self
+        return Curve(np.append(0, self.x + delay), np.append(self.y[0], self.y), np.append(self.y[0], self.y_right),
+                     np.append(0, self.slopes))
+
+    def _advanced(self, advance) -> 'Curve':
+        """
+        :param advance: advance T >= 0
+        :return: curve shifted to the left, f(t + T)
+        """
+        if advance <= 0:
+            return self
+        k = int(self._index(advance))
+        return Curve(np.append(0, self.x[k + 1:] - advance), np.append(self(advance), self.y[k + 1:]),
+                     np.append(self.right_limit(advance), self.y_right[k + 1:]), self.slopes[k:])
+
+    def _is_concave(self) -> bool:
+        """
+        :return: whether the curve is concave for t > 0 with f(0) = 0 <= f(0+)
+        """
+        left_limits = self._left_limits()
+        return bool(self.y[0] == 0 and self.y_right[0] >= 0 and np.all(np.diff(self.slopes) <= 0)
+                    and np.allclose(self.y[1:], left_limits) and np.allclose(self.y_right[1:], left_limits))
+
+    def _get_rate_latency(self) -> tuple[float, float] | None:
+        """
+        :return: (rate, latency) if the curve is a rate-latency curve, else None
+        """
+        if np.any(self.y != 0) or np.any(self.y_right != 0) or self.slopes[-1] < 0:
+            return None
+        if len(self.x) == 1:
+            return float(self.slopes[0]), 0.0
+        if len(self.x) == 2 and self.slopes[0] == 0:
+            return float(self.slopes[1]), float(self.x[1])
+        return None
+
+    def _lower_inverse(self, values):
+        """
+        :param values: array of values
+        :return: inf{t >= 0: f(t) >= value} of a continuous nondecreasing curve
+        """
+        return self._inverse(values, np.searchsorted(self.y, values, side="left"))
+
+    def _upper_inverse(self, values):
+        """
+        :param values: array of values
+        :return: inf{t >= 0: f(t) > value} of a continuous nondecreasing curve
+        """
+        return self._inverse(values, np.searchsorted(self.y, values, side="right"))
+
+    def _inverse(self, values, indices):
+        k = np.maximum(indices - 1, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            times = self.x[k] + (values - self.y[k]) / self.slopes[k]
+        times = np.where((indices == len(self.x)) & (self.slopes[-1] <= 0), np.inf, times)
+        return np.where(indices == 0, 0, times)
+
+    @staticmethod
+    def _simplified(x, y, y_right, slopes) -> 'Curve':
+        """
+        Creates a curve without breakpoints, which do not change the curve.
+        """
+        left_limits = y_right[:-1] + slopes[:-1] * np.diff(x)
+        keep = np.ones(len(x), dtype=bool)
+        keep[1:] = ~(np.isclose(y[1:], left_limits, rtol=1e-12, atol=0)
+                     & np.isclose(y_right[1:], left_limits, rtol=1e-12, atol=0)
+                     & np.isclose(slopes[1:], slopes[:-1], rtol=1e-12, atol=0))
+        return Curve(x[keep], y[keep], y_right[keep], slopes[keep])
+
+    def __repr__(self):
+        return f"Curve(x={self.x.tolist()}, y={self.y.tolist()}, y_right={self.y_right.tolist()}, " \
+               f"slopes={self.slopes.tolist()})"
@@ -183,6 +183,11 @@ classdef CBS < handle
         
         % compute the outgoing arrival curve of a link and a traffic class
         function result = arrival_curve_out( self, link_, tr_type )
+            key = ['out ' char(tr_type)];
+            if isKey(link_.curves, key) % curve was already computed
+                result = link_.curves(key);
+                return
+            end
             % get the incoming arrival curve
             arr_in = arrival_curve_in( self, link_, tr_type );
             
@@ -222,6 +227,7 @@ classdef CBS < handle
                 arr_conv = rtcmindeconv(arr_in, serv_min); % compute convoluted curve
             end
             result = rtcmin(arr_conv, shaping_curve); %compute shaped curve
+            link_.curves(key) = result;
         end
         
 
@@ -237,6 +243,11 @@ classdef CBS < handle
 
         % computes the incoming arrival curve of a link and a traffic class
         function result = arrival_curve_in( self, link_, tr_type)
+            key = ['in ' char(tr_type)];
+            if isKey(link_.curves, key) % curve was already computed
+                result = link_.curves(key);
+                return
+            end
             result = rtccurve([[0 0 0]]); % initialize result as a curve
             for flow = flows_starting_at_link(self, link_, tr_type)
                 result = rtcplus(result, arrival_curve_source( self, flow));
@@ -248,9 +259,11 @@ classdef CBS < handle
                 % link 
                 result = rtcplus(result, arrival_curve_out( self, previous_links_(i), tr_type )); % sum of arrival_curves of links(i) out
             end
+            link_.curves(key) = result;
         end
         
-        % computes the delay for a link and a traffic class
+        % computes the delay for a link and a traffic class, the plot is
+        % only saved if path_folder is not empty
         function result = delay_link(self, link, tr_type, path_folder, net_name)
             % check if delay was already computed and saved to the link
             if tr_type == 'A' & link.delay_A ~= 0
@@ -259,40 +272,9 @@ classdef CBS < handle
             elseif tr_type == 'B' & link.delay_B ~= 0
                 result = link.delay_B; % retrieve value if saved
             else % compute if not computed before
-                % get the incoming arrival curve
-                arrival_curve_in_ = arrival_curve_in(self, link, tr_type);
-                
-                if self.is_strict % use strict minimal service curve
-                    if tr_type == "A" % traffic type = A
-                        serv_min = strict_minimal_service_curve_A(self, link);
-                    else % traffic type = B
-                        serv_min = strict_minimal_service_curve_B(self, link);
-                    end
-                else % use the minimal service curve
-                    if tr_type == "A" % traffic type = A
-                        serv_min = minimal_service_curve_A(self, link);
-                    else % traffic type = B
-                        serv_min = minimal_service_curve_B(self, link);
-                    end
-                end
+                % compute the horizontal deviation without plotting
+                result = rtch(arrival_curve_in(self, link, tr_type), minimal_service_curve(self, link, tr_type));
 
-                % plot the arrival curve in and the service curve using rtc toolbox
-                % the value before 'LineWidth' defines the plotting range
-                rtcplot(arrival_curve_in_, 'b--', serv_min, 'r--', 0.1, 'LineWidth', 1.5);
-                result = rtcploth(arrival_curve_in_, serv_min);
-                % name the plot
-                title("Delay " + link.name + " Class " + tr_type);
-                xlabel('Time in s');
-                ylabel('Size in bit');
-                % choose the correct service curve name
-                if self.is_strict
-                    serv_curve = "strict\_minimal\_service\_curve";
-                else
-                    serv_curve = "minimal\_service\_curve";
-                end
-                % add a legend to the plot
-                legend({'arrival\_curve', serv_curve, "delay"}, 'Location', 'northwest');
-                
                 % save the computed delay to the link
                 if tr_type == 'A'
                     link.delay_A = result;
@@ -300,13 +282,37 @@ classdef CBS < handle
                     link.delay_B = result;
                 end
 
-                % create the folder path for the plots, input from python
-                path_plots = path_folder + "/" + net_name;
-                path_fig = path_plots + "/Delay " + link.name + " Class " + tr_type;
-                % save the plot as matlab .fig datatype
-                savefig( path_fig )
+                if strlength(path_folder) > 0
+                    plot_delay_link(self, link, tr_type, path_folder, net_name);
+                end
             end
         end
+
+        % plots the delay for a link and a traffic class and saves the plot
+        function result = plot_delay_link(self, link, tr_type, path_folder, net_name)
+            % get the incoming arrival curve
+            arrival_curve_in_ = arrival_curve_in(self, link, tr_type);
+            serv_min = minimal_service_curve(self, link, tr_type);
+
+            % plot the arrival curve in and the service curve using rtc toolbox
+            % the value before 'LineWidth' defines the plotting range
+            figure_ = figure('Visible', 'off');
+            rtcplot(arrival_curve_in_, 'b--', serv_min, 'r--', 0.1, 'LineWidth', 1.5);
+            result = rtcploth(arrival_curve_in_, serv_min);
+            % name the plot
+            title("Delay " + link.name + " Class " + tr_type);
+            xlabel('Time in s');
+            ylabel('Size in bit');
+            % add a legend to the plot
+            legend({'arrival\_curve', service_curve_name(self), "delay"}, 'Location', 'northwest');
+
+            % create the folder path for the plots, input from python
+            path_plots = path_folder + "/" + net_name;
+            path_fig = path_plots + "/Delay " + link.name + " Class " + tr_type;
+            % save the plot as matlab .fig datatype
+            savefig( figure_, path_fig )
+            close( figure_ )
+        end
         
         % computes the end to end delay for a flow
         function result = end_to_end_delay(self, flow, path_folder, net_name)
@@ -319,42 +325,62 @@ classdef CBS < handle
             end
         end
         
-        % computes the backlog at a link for a traffic class
+        % computes the backlog at a link for a traffic class, the plot is
+        % only saved if path_folder is not empty
         function result = backlog_link(self, link, tr_type, path_folder, net_name)
+            if strlength(path_folder) > 0
+                result = plot_backlog_link(self, link, tr_type, path_folder, net_name);
+            else % compute the vertical deviation without plotting
+                result = rtcv(arrival_curve_in(self, link, tr_type), minimal_service_curve(self, link, tr_type));
+            end
+        end
+
+        % plots the backlog at a link for a traffic class and saves the plot
+        function result = plot_backlog_link(self, link, tr_type, path_folder, net_name)
             % get the incoming arrival curve
             arrival_curve_in_ = arrival_curve_in(self, link, tr_type);
-            
-            
+            serv_min = minimal_service_curve(self, link, tr_type);
+
+            figure_ = figure('Visible', 'off');
+            rtcplot(arrival_curve_in_, 'b--', serv_min, 'r--', 0.1, 'LineWidth', 1.5);
+            result = rtcplotv(arrival_curve_in_, serv_min);
+            title("Backlog " + link.name + " Class " + tr_type);
+            xlabel('Time in s');
+            ylabel('Size in bit');
+            legend({'arrival\_curve', service_curve_name(self), "backlog"}, 'Location', 'northwest');
+
+            % create path
+            path_plots = path_folder + "/" + net_name;
+            path_fig = path_plots + "/Backlog " + link.name + " Class " + tr_type;
+            savefig( figure_, path_fig )
+            close( figure_ )
+        end
+
+        % returns the (strict) minimal service curve of a link and a traffic
+        % class
+        function result = minimal_service_curve(self, link, tr_type)
             if self.is_strict % use strict minimal service curve
                 if tr_type == "A" % traffic type = A
-                    serv_min = strict_minimal_service_curve_A(self, link);
+                    result = strict_minimal_service_curve_A(self, link);
                 else % traffic type = B
-                    serv_min = strict_minimal_service_curve_B(self, link);
+                    result = strict_minimal_service_curve_B(self, link);
                 end
-            else
+            else % use the minimal service curve
                 if tr_type == "A" % traffic type = A
-                    serv_min = minimal_service_curve_A(self, link);
+                    result = minimal_service_curve_A(self, link);
                 else % traffic type = B
-                    serv_min = minimal_service_curve_B(self, link);
+                    result = minimal_service_curve_B(self, link);
                 end
             end
-            
-            rtcplot(arrival_curve_in_, 'b--', serv_min, 'r--', 0.1, 'LineWidth', 1.5);
-            result = rtcplotv(arrival_curve_in_, serv_min);
-            title("Backlog " + link.name + " Class " + tr_type);
-            xlabel('Time in s');
-            ylabel('Size in bit');
+        end
+
+        % returns the name of the used minimal service curve for legends
+        function result = service_curve_name(self)
             if self.is_strict
-                serv_curve = "strict\_minimal\_service\_curve";
+                result = "strict\_minimal\_service\_curve";
             else
-                serv_curve = "minimal\_service\_curve";
+                result = "minimal\_service\_curve";
             end
-            legend({'arrival\_curve', serv_curve, "backlog"}, 'Location', 'northwest');
-
-            % create path
-            path_plots = path_folder + "/" + net_name;
-            path_fig = path_plots + "/Backlog " + link.name + " Class " + tr_type;
-            savefig( path_fig )
         end
         
     end
@@ -10,6 +10,28 @@ class CBSInterface:
 
     def end_to_end_delay(self, cbs: 'CBS', flow: 'Flow', path_folder: str, network_name: str) -> float: ...
 
+    def analyze_network(self, max_frame_size_a: float, max_frame_size_b: float, max_frame_size_nsr: float,
+                        is_strict: bool, links: list[list], flows: list[list], flow_indices: list[int],
+                        link_indices: list[int], path_folder: str, network_name: str,
+                        plot_flow_indices: list[int] = (), plot_link_indices: list[int] = ()
+                        ) -> tuple[list[float], list[list[float]], list[list[float]]]:
+        """
+        Computes all bounds of a network with a single call.
+
+        :param links: [name, node_i, node_j, c, idle_slope_a, send_slope_a, idle_slope_b, send_slope_b] per link
+        :param flows: [name, max_frame_size, class_measurement_interval, max_interval_frame, link indices of the
+                      path, avb_class, is_periodic, is_worst_case] per flow
+        :param flow_indices: indices of the flows of interest
+        :param link_indices: indices of the analyzed links
+        :param path_folder: folder for the curve plots, nothing is plotted or written if it is empty
+        :param network_name: name of the subfolder of the plots
+        :param plot_flow_indices: indices of the flows, whose link delays are plotted
+        :param plot_link_indices: indices of the links, whose delays and backlogs are plotted
+        :return: (end-to-end delays of the flows of interest, [class A, class B] delays of the analyzed links,
+                 [class A, class B] backlogs of the analyzed links)
+        """
+        ...
+
     # Flow
     def Flow(self, name: str, max_frame_size: int, class_measurement_interval: float, max_interval_frame: int,
              path: list['Link'], avb_class: str, is_periodic: str, is_worst_case: str) -> 'Flow': ...
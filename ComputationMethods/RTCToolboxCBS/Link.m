@@ -16,6 +16,7 @@ classdef Link < handle
         sdsl_B % send slope of class B in bit/s
         delay_A % delay of class A
         delay_B % delay of class B
+        curves % incoming and outgoing arrival curves per traffic class, computed once
     end
     
     methods
@@ -30,6 +31,7 @@ classdef Link < handle
             obj.sdsl_B = double(sdsl_B);
             delay_A = 0;
             delay_B = 0;
+            obj.curves = containers.Map();
         end
         
         function result = get_i(self)
@@ -0,0 +1,323 @@
+import atexit
+import contextlib
+import itertools
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+_SESSION_PREFIX = "npba_"
+_LOCK_DIRECTORY = pathlib.Path(tempfile.gettempdir()).joinpath("npba_matlab")
+
+
+class _PooledEngine:
+    def __init__(self, engine, name: str | None, is_owned: bool):
+        """
+        Engine of a pool defined by:
+
+        :param engine: MATLAB engine or stand-in engine
+        :param name: name of the shared MATLAB session, None if the engine is not shared
+        :param is_owned: whether the engine was started by the pool or is connected to a session of another process
+        """
+        self.engine = engine
+        self.name = name
+        self.is_owned = is_owned
+        self.last_used = time.monotonic()
+
+
+class MatlabEnginePool:
+    """
+    Keeps MATLAB engines alive across computations. Engines are started in the background and shared as MATLAB
+    sessions, so worker processes connect to the engines of the main process instead of starting their own. Engines
+    are reset after every computation and shut down after being idle for idle_timeout seconds.
+
+    A stand-in engine can be used without MATLAB by passing an engine_factory, which returns an object implementing
+    CBSInterface, eval(command, nargout=0) and exit(). Such engines are not shared between processes.
+
+    :param size: number of engines started by warm()
+    :param idle_timeout: seconds after which an idle engine is shut down, None keeps engines forever
+    :param engine_factory: function creating a ready engine, defaults to starting MATLAB
+    :param matlab_files: the path to the .m files
+    """
+
+    def __init__(self, size: int = 1, idle_timeout: float | None = 600.0,
+                 engine_factory: Callable[[], Any] = None,
+                 matlab_files: pathlib.Path = pathlib.Path("ComputationMethods/RTCToolboxCBS")):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._engine_factory = engine_factory
+        self._is_shared = engine_factory is None
+        self._matlab_files = matlab_files.absolute()
+        self._condition = threading.Condition()
+        self._idle: list[_PooledEngine] = []
+        self._busy: dict[int, _PooledEngine] = {}
+        self._starting = 0
+        self._errors = []
+        self._names = itertools.count()
+        self._is_closed = False
+        self._shrink_thread = None
+
+    def warm(self, count: int = None):
+        """
+        Starts engines in the background until the pool holds count engines.
+
+        :param count: number of engines, defaults to the size of the pool
+        """
+        with self._condition:
+            count = self.size if count is None else min(count, self.size)
+            for _ in range(count - len(self._idle) - len(self._busy) - self._starting):
+                self._start()
+
+    def acquire(self):
+        """
+        Returns an idle engine, connects to an idle shared engine of another process or starts a new engine. Waits
+        until the engine is ready.
+
+        :return: engine, which has to be returned with release()
+        """
+        with self._condition:
+            if self._starting == 0:
+                # engines, which failed to start before, are started again
+                self._errors.clear()
+            while True:
+                pooled_engine = self._take_idle() or self._connect_shared()
+                if pooled_engine is not None:
+                    self._busy[id(pooled_engine.engine)] = pooled_engine
+                    return pooled_engine.engine
+                if self._errors:
+                    raise self._errors.pop()
+                if self._starting == 0:
+                    self._start()
+                self._condition.wait()
+
+    def release(self, engine):
+        """
+        Resets an engine and returns it to the pool.
+
+        :param engine: engine returned by acquire()
+        """
+        with self._condition:
+            pooled_engine = self._busy.pop(id(engine))
+        try:
+            engine.eval("clear all; close all force;", nargout=0)
+        except Exception:
+            # the engine is broken, e.g. MATLAB was closed
+            self._shut_down(pooled_engine)
+            return
+        if not pooled_engine.is_owned or self._is_closed:
+            self._shut_down(pooled_engine)
+            return
+        with self._condition:
+            pooled_engine.last_used = time.monotonic()
+            self._idle.append(pooled_engine)
+            _unlock(pooled_engine.name)
+            self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def engine(self):
+        """
+        Provides an engine of the pool for a with statement.
+        """
+        engine = self.acquire()
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+    def shrink(self):
+        """
+        Shuts down the engines, which are idle for longer than idle_timeout.
+        """
+        if self.idle_timeout is None:
+            return
+        with self._condition:
+            now = time.monotonic()
+            expired = [pooled_engine for pooled_engine in self._idle
+                       if now - pooled_engine.last_used > self.idle_timeout and _lock(pooled_engine.name)]
+            self._idle = [pooled_engine for pooled_engine in self._idle if pooled_engine not in expired]
+        for pooled_engine in expired:
+            self._shut_down(pooled_engine)
+
+    def close(self):
+        """
+        Shuts down all idle engines. Engines in use are shut down on release.
+        """
+        with self._condition:
+            self._is_closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled_engine in idle:
+            self._shut_down(pooled_engine)
+
+    def _start(self):
+        """
+        Starts an engine in a background thread. The lock of the condition has to be held.
+        """
+        self._starting += 1
+        threading.Thread(target=self._run_start, daemon=True).start()
+        if self._shrink_thread is None and self.idle_timeout is not None:
+            self._shrink_thread = threading.Thread(target=self._run_shrink, daemon=True)
+            self._shrink_thread.start()
+
+    def _run_start(self):
+        try:
+            if self._is_shared:
+                name = f"{_SESSION_PREFIX}{os.getpid()}_{next(self._names)}"
+                engine = self._start_matlab(name)
+            else:
+                name = None
+                engine = self._engine_factory()
+        except Exception as e:
+            with self._condition:
+                self._starting -= 1
+                self._errors.append(e)
+                self._condition.notify_all()
+            return
+        with self._condition:
+            self._starting -= 1
+            self._idle.append(_PooledEngine(engine, name, is_owned=True))
+            self._condition.notify_all()
+
+    def _start_matlab(self, name: str):
+        """
+        Starts MATLAB and shares the session.
+
+        :param name: name of the shared session
+        :return: MATLAB engine
+        """
+        import matlab.engine
+
+        m_flag_show_plots = "-noFigureWindows"
+        m_flag_show_conv_warnings = " -r 'warning(\"off\",\"CUSTOM:Convolution\")'"
+        engine = matlab.engine.start_matlab(option=m_flag_show_plots + m_flag_show_conv_warnings)
+        engine.addpath(str(self._matlab_files), nargout=0)
+        engine.eval(f"matlab.engine.shareEngine('{name}')", nargout=0)
+        return engine
+
+    def _take_idle(self) -> _PooledEngine | None:
+        """
+        :return: the most recently used idle engine, which is not used by another process
+        """
+        for pooled_engine in reversed(self._idle):
+            if _lock(pooled_engine.name):
+                self._idle.remove(pooled_engine)
+                return pooled_engine
+        return None
+
+    def _connect_shared(self) -> _PooledEngine | None:
+        """
+        :return: engine connected to an idle shared session of another process or None
+        """
+        if not self._is_shared:
+            return None
+        try:
+            import matlab.engine
+            names = matlab.engine.find_matlab()
+        except Exception:
+            return None
+        own_prefix = f"{_SESSION_PREFIX}{os.getpid()}_"
+        for name in names:
+            if not name.startswith(_SESSION_PREFIX) or name.startswith(own_prefix) or not _lock(name):
+                continue
+            try:
+                return _PooledEngine(matlab.engine.connect_matlab(name), name, is_owned=False)
+            except Exception:
+                _unlock(name)
+        return None
+
+    def _shut_down(self, pooled_engine: _PooledEngine):
+        """
+        Shuts down an owned engine or disconnects from a session of another process.
+        """
+        try:
+            if pooled_engine.is_owned:
+                pooled_engine.engine.exit()
+            else:
+                pooled_engine.engine.quit()
+        except Exception:
+            pass
+        _unlock(pooled_engine.name)
+
+    def _run_shrink(self):
+        while not self._is_closed:
+            time.sleep(self.idle_timeout / 2)
+            self.shrink()
+
+
+# open lock files of the sessions used by this process
+_lock_files: dict[str, int] = {}
+
+
+def _lock(name: str | None) -> bool:
+    """
+    Marks a shared session as used, so no other process uses it at the same time. The lock is held by an open file,
+    so the operating system releases it when the process ends, even after a crash.
+
+    :param name: name of the session, None for engines, which are not shared
+    :return: whether the session was free
+    """
+    if name is None:
+        return True
+    _LOCK_DIRECTORY.mkdir(exist_ok=True)
+    path = _LOCK_DIRECTORY.joinpath(name)
+    file_descriptor = os.open(path, os.O_CREAT | os.O_RDWR)
+    try:
+        if os.name == "nt":
+            msvcrt.locking(file_descriptor, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # _unlock() of another process may have deleted the file after it was opened
+            if os.fstat(file_descriptor).st_ino != os.stat(path).st_ino:
+                raise FileNotFoundError(path)
+    except OSError:
+        os.close(file_descriptor)
+        return False
+    _lock_files[name] = file_descriptor
+    return True
+
+
+def _unlock(name: str | None):
+    file_descriptor = _lock_files.pop(name, None) if name is not None else None
+    if file_descriptor is None:
+        return
+    if os.name == "nt":
+        msvcrt.locking(file_descriptor, msvcrt.LK_UNLCK, 1)
+    else:
+        # deleted while it is locked, so no other process holds a lock of the deleted file
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(_LOCK_DIRECTORY.joinpath(name))
+    os.close(file_descriptor)
+
+
+_engine_pool: MatlabEnginePool | None = None
+
+
+def get_engine_pool() -> MatlabEnginePool:
+    """
+    :return: the engine pool of this process
+    """
+    global _engine_pool
+    if _engine_pool is None:
+        _engine_pool = MatlabEnginePool()
+        atexit.register(_engine_pool.close)
+    return _engine_pool
+
+
+def set_engine_pool(engine_pool: MatlabEnginePool):
+    """
+    Replaces the engine pool of this process, e.g. by a pool of stand-in engines.
+
+    :param engine_pool: engine pool
+    """
+    global _engine_pool
+    if _engine_pool is not None:
+        _engine_pool.close()
+    _engine_pool = engine_pool
+    atexit.register(engine_pool.close)
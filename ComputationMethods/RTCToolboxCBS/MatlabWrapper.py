@@ -1,24 +1,20 @@
-import pathlib
 from typing import Any
 
-import matlab.engine
+import numpy as np
 
 from ComputationMethods.RTCToolboxCBS.CBSInterface import CBSInterface
+from ComputationMethods.RTCToolboxCBS.MatlabEnginePool import MatlabEnginePool, get_engine_pool
 
 
 class MatlabWrapper(CBSInterface):
 
-    def __init__(self, matlab_files: pathlib.Path = pathlib.Path("ComputationMethods/RTCToolboxCBS")):
+    def __init__(self, engine_pool: MatlabEnginePool = None):
         """
-        Prepares a MATLAB engine in the background.
+        Prepares a MATLAB engine of an engine pool.
 
-        :param matlab_files: the path to the .m files
+        :param engine_pool: engine pool, defaults to the engine pool of this process
         """
-        m_flag_show_plots = "-noFigureWindows"
-        m_flag_show_conv_warnings = " -r 'warning(\"off\",\"CUSTOM:Convolution\")'"
-        matlab_flags = m_flag_show_plots + m_flag_show_conv_warnings
-        self._future_engine = matlab.engine.start_matlab(option=matlab_flags, background=True)
-        self._matlab_files = matlab_files
+        self._engine_pool = get_engine_pool() if engine_pool is None else engine_pool
         self._engine = None
 
     def _get_engine(self):
@@ -28,16 +24,32 @@ class MatlabWrapper(CBSInterface):
         :return: MATLAB engine
         """
         if self._engine is None:
-            self._engine = self._future_engine.result()
-            self._future_engine = None
-            self._engine.addpath(str(self._matlab_files.absolute()), nargout=0)
+            self._engine = self._engine_pool.acquire()
         return self._engine
 
     def exit(self):
         """
-        Shuts down the engine.
+        Returns the engine to the pool, which resets it for the next computation.
         """
-        self._get_engine().exit()
+        if self._engine is not None:
+            self._engine_pool.release(self._engine)
+            self._engine = None
+
+    def analyze_network(self, max_frame_size_a: float, max_frame_size_b: float, max_frame_size_nsr: float,
+                        is_strict: bool, links: list[list], flows: list[list], flow_indices: list[int],
+                        link_indices: list[int], path_folder: str, network_name: str,
+                        plot_flow_indices: list[int] = (), plot_link_indices: list[int] = ()
+                        ) -> tuple[list[float], list[list[float]], list[list[float]]]:
+        """
+        Computes all bounds of a network with a single call of analyze_network.m, see CBSInterface.
+        """
+        end_to_end_delays, link_delays, link_backlogs = self._get_engine().analyze_network(
+            max_frame_size_a, max_frame_size_b, max_frame_size_nsr, is_strict, links, flows, flow_indices,
+            link_indices, path_folder, network_name, list(plot_flow_indices), list(plot_link_indices),
+            nargout=3)
+        return (np.array(end_to_end_delays, dtype=float).reshape(-1).tolist(),
+                np.array(link_delays, dtype=float).reshape(-1, 2).tolist(),
+                np.array(link_backlogs, dtype=float).reshape(-1, 2).tolist())
 
     def __getattr__(self, item):
         """
@@ -50,12 +62,12 @@ class MatlabWrapper(CBSInterface):
 
     def __getattribute__(self, name: str) -> Any:
         """
-        Passes calls defined in the interface to the MATLAB engine.
+        Passes calls defined in the interface and not in this wrapper to the MATLAB engine.
 
         :param name: call
         :return: reference to the attribute
         """
-        if name in CBSInterface.__dict__:
+        if name in CBSInterface.__dict__ and name not in MatlabWrapper.__dict__:
             return getattr(self._get_engine(), name)
         else:
             return super().__getattribute__(name)
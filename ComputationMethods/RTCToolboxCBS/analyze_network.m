@@ -0,0 +1,76 @@
+% Computes all bounds of a network with a single call from Python.
+% links: cell array of {name, i, j, c, idsl_A, sdsl_A, idsl_B, sdsl_B}
+% flows: cell array of {name, mfs, cmi, mif, path, type, periodic, worst_case},
+%        path holds the zero-based indices of the links of the flow
+% flow_indices: zero-based indices of the flows of interest
+% link_indices: zero-based indices of the analyzed links
+% plot_flow_indices: zero-based indices of the flows, whose link delays are
+%                    plotted
+% plot_link_indices: zero-based indices of the links, whose delays and
+%                    backlogs are plotted
+% the plots are saved at path_folder/net_name, nothing is plotted or written
+% if path_folder is empty
+% returns the end-to-end delays of the flows of interest and the delays and
+% backlogs of the analyzed links, one column per traffic class (A, B)
+function [end_to_end_delays, link_delays, link_backlogs] = analyze_network(l_a_max, l_b_max, l_nsr_max, is_strict, links, flows, flow_indices, link_indices, path_folder, net_name, plot_flow_indices, plot_link_indices)
+    link_objects = Link.empty;
+    for k=1:length(links)
+        p = links{k};
+        link_objects(end+1) = Link(p{1}, p{2}, p{3}, p{4}, p{5}, p{6}, p{7}, p{8});
+    end
+
+    flow_objects = Flow.empty;
+    for k=1:length(flows)
+        p = flows{k};
+        path = link_objects(to_indices(p{5}));
+        flow_objects(end+1) = Flow(p{1}, p{2}, p{3}, p{4}, path, p{6}, p{7}, p{8});
+    end
+
+    cbs = CBS(l_a_max, l_b_max, l_nsr_max, is_strict, flow_objects);
+
+    flow_indices = to_indices(flow_indices);
+    end_to_end_delays = zeros(length(flow_indices), 1);
+    for k=1:length(flow_indices)
+        end_to_end_delays(k) = end_to_end_delay(cbs, flow_objects(flow_indices(k)), "", net_name);
+    end
+
+    link_indices = to_indices(link_indices);
+    tr_types = ["A", "B"];
+    link_delays = zeros(length(link_indices), 2);
+    link_backlogs = zeros(length(link_indices), 2);
+    for k=1:length(link_indices)
+        link = link_objects(link_indices(k));
+        for t=1:2
+            link_delays(k, t) = delay_link(cbs, link, tr_types(t), "", net_name);
+            link_backlogs(k, t) = backlog_link(cbs, link, tr_types(t), "", net_name);
+        end
+    end
+
+    % the plots are created after the bounds from the cached curves, only
+    % for the requested flows and links
+    if strlength(path_folder) == 0
+        return
+    end
+    for index = to_indices(plot_flow_indices)
+        flow = flow_objects(index);
+        for link = flow.path
+            plot_delay_link(cbs, link, flow.type, path_folder, net_name);
+        end
+    end
+    for index = to_indices(plot_link_indices)
+        for t=1:2
+            plot_delay_link(cbs, link_objects(index), tr_types(t), path_folder, net_name);
+            plot_backlog_link(cbs, link_objects(index), tr_types(t), path_folder, net_name);
+        end
+    end
+end
+
+% converts zero-based indices from Python, which arrive as a cell array, to
+% one-based indices
+function result = to_indices(indices)
+    if iscell(indices)
+        result = cellfun(@double, indices) + 1;
+    else
+        result = double(indices) + 1;
+    end
+end
@@ -13,6 +13,8 @@ class GUIController:
 
     def __init__(self, model_facade: Model.ModelFacade):
         self.model_facade = model_facade
+        # starts the worker processes while the user edits the network
+        self.model_facade.computation_service.warm()
 
     def update_parameter(self, new_value, parameter, component: Union[Network, Node, Edge, Flow]):
         """
@@ -208,7 +210,13 @@ class GUIController:
         """
         Runs the computation.
         """
-        self.model_facade.run_computation()
+        self.model_facade.run_computation(stream_updates=True)
+
+    def pump_computation_updates(self):
+        """
+        Delivers the partial results of running computations to their result objects.
+        """
+        self.model_facade.computation_service.pump_updates()
 
     def cancel_computation(self, computation: Model.Computation):
         """
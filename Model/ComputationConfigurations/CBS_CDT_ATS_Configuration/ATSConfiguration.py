@@ -12,13 +12,23 @@ from Model.ComputationConfigurations.CBS_CDT_ATS_Configuration.FlowConfiguration
 from Model.ComputationConfigurations.ConfigurationTemplate.AbstractNetworkConfiguration import \
     AbstractNetworkConfiguration
 from Model.ComputationConfigurations.ConfigurationTemplate.DefaultNodeConfiguration import DefaultNodeConfiguration
+from Model.ParameterSweep import compute_grid
 from Model.Result import Result
 
 
 class ATSConfiguration(AbstractNetworkConfiguration):
 
-    def __init__(self, **kwargs):
+    def __init__(self, incremental=False, top_k=0, **kwargs):
+        """
+        :param incremental: whether a computation reuses the bounds of the previous computation, which are not
+                            affected by changed flows or edges
+        :param top_k: number of flows of interest with the largest end-to-end delays to analyze, 0 analyzes all
+        """
         super().__init__(**kwargs)
+        self.incremental = incremental
+        self.top_k = top_k
+        self._incremental_state = None
+        self._admission_state = None
 
     @staticmethod
     def get_configuration_information() -> str:
@@ -46,6 +56,174 @@ class ATSConfiguration(AbstractNetworkConfiguration):
     def get_flow_configuration_class() -> Type[FlowConfiguration]:
         return FlowConfiguration
 
+    def make_parameter_dict(self):
+        own_dict = {"incremental re-analysis": self.incremental, "top-k flows (0 = all)": self.top_k}
+        return super().make_parameter_dict() | own_dict
+
+    def update_parameter_dict(self, dictionary):
+        value = int(dictionary["top-k flows (0 = all)"])
+        if value < 0:
+            raise ValueError("No negative value allowed")
+        self.top_k = value
+
+        true_values = ['true', '1', 't', 'y', 'yes']
+        false_values = ['false', '0', 'f', 'n', 'no']
+        value = str(dictionary["incremental re-analysis"]).lower()
+        if value in true_values:
+            value = True
+        elif value in false_values:
+            value = False
+        else:
+            raise ValueError(f"Wrong input, allowed are: {true_values} or {false_values}")
+        self.incremental = value
+        if not self.incremental:
+            self._incremental_state = None
+
+        return super().update_parameter_dict(dictionary)
+
+    def to_serializable_dict(self) -> dict:
+        own_dict = {"incremental": self.incremental, "top_k": self.top_k}
+        return super().to_serializable_dict() | own_dict
+
+    @staticmethod
+    def to_constructor_dict(json_dict: dict, model, network) -> dict:
+        own_dict = {"incremental": json_dict.get("incremental", False), "top_k": json_dict.get("top_k", 0)}
+        return AbstractNetworkConfiguration.to_constructor_dict(json_dict, model, network) | own_dict
+
+    def receive_result(self, result: Result):
+        state = result.configuration_state
+        result.configuration_state = None
+        if self.incremental:
+            self._incremental_state = state
+
+    def is_result_cacheable(self) -> bool:
+        # a stored result does not contain the state of the incremental re-analysis
+        return not self.incremental
+
+    def check_admission(self, network, path, flow_params, deadline):
+        """
+        Checks whether a candidate flow can be added to the network without exceeding its deadline or the deadline of
+        another class A or B flow. Only flows, which pass a link affected by the candidate, are evaluated. The
+        computation model is kept between calls and only updated by the changes of the network.
+
+        :param network: network object
+        :param path: path of the candidate flow as list of nodes
+        :param flow_params: dictionary with the keys "regulation_rate", "l_min", "l_max", "flow_type" and "ac_type"
+                            as in the constructor of FlowConfiguration
+        :param deadline: maximal end-to-end delay of the candidate flow in s
+        :return: (whether the flow can be admitted, {flow ID or None for the candidate: (end-to-end delay, deadline)})
+        """
+        if len(path) < 2:
+            raise ValueError("Path too short")
+        allowed_types = ["CDT", "A", "B", "BE"]
+        if flow_params["flow_type"] not in allowed_types:
+            raise ValueError(f"Unknown flow type: '{flow_params['flow_type']}'. Expected: {allowed_types}")
+        allowed_ac_types = ["LRQ", "LB"]
+        if flow_params["ac_type"] not in allowed_ac_types:
+            raise ValueError(f"Unknown ac type: '{flow_params['ac_type']}'. Expected: {allowed_ac_types}")
+        node_pairs = {(edge.start.id, edge.end.id) for edge in network.edges.values()}
+        for node_i, node_j in zip(path, path[1:]):
+            if (node_i.id, node_j.id) not in node_pairs and (node_j.id, node_i.id) not in node_pairs:
+                raise ValueError(f"No edge between {node_i.name} and {node_j.name}")
+
+        # the admission model is kept apart from the model of the computations
+        compute_args = self._compute_args
+        self._compute_args = {}
+        try:
+            state = self._admission_state
+            if state is not None and self._has_same_topology(network, state):
+                self._update_computation_model(network, state)
+            else:
+                self.make_computation_model(network)
+            self._admission_state = self._make_model_state(network)
+        finally:
+            self._compute_args = compute_args
+        cbs = self._admission_state["cbs"]
+        flow_mapping = self._admission_state["flow_mapping"]
+        links = self._admission_state["link_mapping"]
+
+        candidate_path = [links[node_i.id, node_j.id] for node_i, node_j in zip(path, path[1:])]
+        candidate = ATS_flow(flow_params["regulation_rate"] * 10 ** 6, flow_params["l_min"] * 10 ** 6,
+                             flow_params["l_max"] * 10 ** 6, candidate_path, flow_params["flow_type"],
+                             flow_params["ac_type"])
+
+        affected = cbs.add_flow(candidate)
+        try:
+            flow_ids = [None] if candidate.t == "A" or candidate.t == "B" else []
+            deadlines = [deadline] if flow_ids else []
+            for flow_id, ats_flow in flow_mapping.items():
+                flow_deadline = network.flows[flow_id].configurations[self.group_id].deadline
+                if ats_flow.t != "A" and ats_flow.t != "B" or flow_deadline is None:
+                    continue
+                if affected is None or affected.intersection(cbs.links.key_of(link) for link in ats_flow.p):
+                    flow_ids.append(flow_id)
+                    deadlines.append(flow_deadline)
+            flows = [candidate if flow_id is None else flow_mapping[flow_id] for flow_id in flow_ids]
+            delays = cbs.end_to_end_delays(flows).tolist()
+        finally:
+            cbs.remove_flow(candidate)
+
+        bounds = {flow_id: (delay, flow_deadline) for flow_id, delay, flow_deadline in zip(flow_ids, delays, deadlines)}
+        return all(delay <= flow_deadline for delay, flow_deadline in bounds.values()), bounds
+
+    @staticmethod
+    def get_sweep_parameters() -> dict[str, str]:
+        return {parameter: component for parameter, (component, _) in _SWEEP_PARAMETERS.items()}
+
+    def compute_sweep(self, network, grid, number_of_workers):
+        """
+        Computes the bounds of a sweep with the worker processes of the computation service. The grid is split into
+        one chunk per worker, every chunk translates the network once. Between two grid points, only the changed links
+        and flows are invalidated, so the bounds of unaffected links are reused.
+        """
+        flow_ids = [flow_id for flow_id in self.flow_ids_of_interest
+                    if network.flows[flow_id].configurations[self.group_id].type in ("A", "B")]
+        used_links = {}
+        for flow_id in self.flow_ids_of_interest:
+            path = network.flows[flow_id].path
+            for node_i, node_j in zip(path, path[1:]):
+                used_links[f"{node_i.name}-{node_j.name}"] = node_i.id, node_j.id
+        used_links = sorted(used_links.items())
+
+        bounds = compute_grid(_compute_sweep_points, (network, self.group_id, flow_ids, used_links), grid,
+                              number_of_workers)
+        return ([network.flows[flow_id].name for flow_id in flow_ids], [name for name, _ in used_links],
+                [delays for delays, _ in bounds], [backlogs for _, backlogs in bounds])
+
+    def _apply_overrides(self, network, overrides):
+        """
+        Changes the parameters of the translated links and flows to the values of a grid point of a sweep and
+        invalidates the changed ones.
+
+        :param network: network object
+        :param overrides: {edge or flow ID: {parameter name: value}}
+        """
+        cbs = self._compute_args["cbs"]
+        flow_mapping = self._compute_args["flow_mapping"]
+        links = self._compute_args["link_mapping"]
+        # links compare equal by their parameters, so changed components are kept by identity
+        changed_links = {}
+        changed_flows = {}
+        for component_id, values in overrides.items():
+            if component_id in network.edges:
+                edge = network.edges[component_id]
+                components = [links[edge.start.id, edge.end.id], links[edge.end.id, edge.start.id]]
+                changed = changed_links
+            else:
+                components = [flow_mapping[component_id]]
+                changed = changed_flows
+            for parameter, value in values.items():
+                name = _SWEEP_PARAMETERS[parameter][1]
+                value = float(value) * 10 ** 6
+                for component in components:
+                    if getattr(component, name) != value:
+                        setattr(component, name, value)
+                        changed[id(component)] = component
+        for link in changed_links.values():
+            cbs.invalidate(link=link)
+        for ats_flow in changed_flows.values():
+            cbs.invalidate(flow=ats_flow)
+
     def compute(self, network, result: Result):
         plt.style.use(["science"])
         plt.rcParams.update({'figure.dpi': '150'})
@@ -55,18 +233,84 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         self._compute_args["network"] = network
 
         result.set_start_time()
-        self.make_computation_model(network)
-
+        self._set_phase("Translating the network")
+        state = self._incremental_state if self.incremental else None
+        if state is not None and self._has_same_topology(network, state):
+            # the model of the previous computation is only updated by the changes of the network
+            self._update_computation_model(network, state)
+            self._compute_args["flow_records"] = {}
+            self._compute_args["link_records"] = {}
+        else:
+            self.make_computation_model(network)
+        if state is not None:
+            self._load_incremental_records(network, state)
+        self._load_work_unit_results()
+
+        self._select_flows()
+        self._set_phase("Computing end-to-end delays")
+        self._compute_flow_records()
         self._compute_end_to_end_delay()
         result.append_result("Response time:")
         self._compute_response_time_ir()
         self._compute_response_time_link()
+        self._set_phase("Computing backlogs")
         result.append_result("Backlog:")
         self._compute_backlog_link()
         self._compute_backlog_ir()
         result.set_end_time()
 
+        self._set_phase("Creating plots")
         self._make_plots()
+        if self.incremental:
+            result.configuration_state = self._make_incremental_state(network)
+
+    def get_work_units(self, network):
+        # top-k mode prunes flows by their bounds and incremental computations reuse most records, so both are
+        # computed as a whole
+        if self.top_k > 0 or self.incremental and self._incremental_state is not None:
+            return None
+        used_links = set()
+        for flow_id in self.flow_ids_of_interest:
+            path = network.flows[flow_id].path
+            used_links.update((node_i.id, node_j.id) for node_i, node_j in zip(path, path[1:]))
+        return ([("flow", flow_id) for flow_id in self.flow_ids_of_interest] +
+                [("link", link_id) for link_id in sorted(used_links, key=str)])
+
+    def compute_work_units(self, network, units, result=None):
+        """
+        Computes the records of the flows and the class A and B backlogs of the links of a shard.
+        """
+        self._compute_args["result"] = result
+        self._compute_args["network"] = network
+        self._set_phase(f"Computing a shard of {len(units)} flows and links")
+        self.make_computation_model(network)
+        links = self._compute_args["link_mapping"]
+        flow_records = self._compute_args["flow_records"]
+        link_records = self._compute_args["link_records"]
+
+        self._compute_args["flow_ids"] = [unit_id for kind, unit_id in units if kind == "flow"]
+        self._compute_flow_records()
+        partial_result = {("flow", flow_id): flow_records[flow_id] for flow_id in self._compute_args["flow_ids"]}
+        for kind, link_id in units:
+            if kind == "link":
+                link = links[link_id]
+                name = f"{network.nodes[link_id[0]].name}-{network.nodes[link_id[1]].name}"
+                for traffic_class in ("A", "B"):
+                    self._compute_link_backlog(name, link, traffic_class)
+                partial_result[kind, link_id] = link_records[link_id]
+        return partial_result
+
+    def _load_work_unit_results(self):
+        """
+        Adds the records computed by the shards of a sharded computation to the computation model.
+        """
+        flow_records = self._compute_args["flow_records"]
+        link_records = self._compute_args["link_records"]
+        for (kind, unit_id), record in self._compute_args.get("work_unit_results", {}).items():
+            if kind == "flow":
+                flow_records[unit_id] = record
+            else:
+                link_records[unit_id] = record
 
     def make_computation_model(self, network):
         """
@@ -76,56 +320,317 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         """
         links = {}
         for edge in network.edges.values():
-            configuration = edge.configurations[self.group_id]
             i, j = edge.start.id, edge.end.id
-            links[i, j] = ATS_link(str(i), str(j), configuration.link_speed * 10 ** 6,
-                                   configuration.idle_slope_A * 10 ** 6,
-                                   configuration.send_slope_A * 10 ** 6, configuration.idle_slope_B * 10 ** 6,
-                                   configuration.send_slope_B * 10 ** 6, configuration.t_var_min,
-                                   configuration.t_var_max, configuration.t_proc_min, configuration.t_proc_max)
-            links[j, i] = ATS_link(str(j), str(i), configuration.link_speed * 10 ** 6,
-                                   configuration.idle_slope_A * 10 ** 6,
-                                   configuration.send_slope_A * 10 ** 6, configuration.idle_slope_B * 10 ** 6,
-                                   configuration.send_slope_B * 10 ** 6, configuration.t_var_min,
-                                   configuration.t_var_max, configuration.t_proc_min, configuration.t_proc_max)
+            links[i, j], links[j, i] = self._make_links(edge)
 
         flow_mapping = {}
         for flow in network.flows.values():
-            config = flow.configurations[self.group_id]
-            path = []
-            for index, node_i in enumerate(flow.path):
-                if index + 1 >= len(flow.path):
-                    break
-                node_j = flow.path[index + 1]
-                link_i_j = links[node_i.id, node_j.id]
-                path.append(link_i_j)
-
-            flow_mapping[flow.id] = ATS_flow(config.regulation_rate * 10 ** 6, config.l_min * 10 ** 6,
-                                             config.l_max * 10 ** 6, path, config.type, config.ac_type)
+            flow_mapping[flow.id] = self._make_flow(flow, links)
         cbs = CBS(list(flow_mapping.values()))
         self._compute_args["cbs"] = cbs
         self._compute_args["flow_mapping"] = flow_mapping
         self._compute_args["link_mapping"] = links
+        self._compute_args["flow_records"] = {}
+        self._compute_args["link_records"] = {}
+
+    def _make_links(self, edge):
+        """
+        Translates an edge into the two ATS-CBS links of both directions.
+
+        :param edge: edge object
+        :return: (link from start to end node, link from end to start node)
+        """
+        configuration = edge.configurations[self.group_id]
+        i, j = edge.start.id, edge.end.id
+        return tuple(ATS_link(str(start), str(end), configuration.link_speed * 10 ** 6,
+                              configuration.idle_slope_A * 10 ** 6,
+                              configuration.send_slope_A * 10 ** 6, configuration.idle_slope_B * 10 ** 6,
+                              configuration.send_slope_B * 10 ** 6, configuration.t_var_min,
+                              configuration.t_var_max, configuration.t_proc_min, configuration.t_proc_max)
+                     for start, end in ((i, j), (j, i)))
+
+    def _make_flow(self, flow, links):
+        """
+        Translates a flow into an ATS-CBS flow.
+
+        :param flow: flow object
+        :param links: ATS-CBS links by the IDs of their nodes
+        :return: ATS-CBS flow
+        """
+        config = flow.configurations[self.group_id]
+        path = []
+        for index, node_i in enumerate(flow.path):
+            if index + 1 >= len(flow.path):
+                break
+            node_j = flow.path[index + 1]
+            link_i_j = links[node_i.id, node_j.id]
+            path.append(link_i_j)
+
+        return ATS_flow(config.regulation_rate * 10 ** 6, config.l_min * 10 ** 6, config.l_max * 10 ** 6, path,
+                        config.type, config.ac_type)
+
+    def _edge_fingerprint(self, edge):
+        """
+        Returns the parameters of an edge, which are used by the computation model.
+
+        :param edge: edge object
+        :return: hashable fingerprint
+        """
+        configuration = edge.configurations[self.group_id]
+        return (edge.start.id, edge.end.id, configuration.link_speed, configuration.idle_slope_A,
+                configuration.send_slope_A, configuration.idle_slope_B, configuration.send_slope_B,
+                configuration.t_var_min, configuration.t_var_max, configuration.t_proc_min, configuration.t_proc_max)
+
+    def _flow_fingerprint(self, flow):
+        """
+        Returns the parameters of a flow, which are used by the computation model.
+
+        :param flow: flow object
+        :return: hashable fingerprint
+        """
+        config = flow.configurations[self.group_id]
+        return (tuple(node.id for node in flow.path), config.regulation_rate, config.l_min, config.l_max, config.type,
+                config.ac_type)
+
+    def _make_fingerprints(self, network):
+        """
+        Returns the fingerprints of all edges and flows of a network.
+
+        :param network: network object
+        :return: {"edge_fingerprints": {edge ID: fingerprint}, "flow_fingerprints": {flow ID: fingerprint}}
+        """
+        return {"edge_fingerprints": {edge_id: self._edge_fingerprint(edge) for edge_id, edge in network.edges.items()},
+                "flow_fingerprints": {flow_id: self._flow_fingerprint(flow) for flow_id, flow in network.flows.items()}}
+
+    def _make_incremental_state(self, network):
+        """
+        Creates the state a following incremental computation starts from. It travels with the configuration to the
+        worker process, which updates the computation model instead of translating the network again.
+
+        :param network: network object
+        :return: computation model, computed bounds, maximum packet lengths of the model and fingerprints of the
+                 network components
+        """
+        return self._make_model_state(network) | {
+            "maxima": self._compute_args["cbs"].maxima(),
+            "flow_records": self._compute_args["flow_records"],
+            "link_records": self._compute_args["link_records"]}
+
+    def _load_incremental_records(self, network, state):
+        """
+        Adds the bounds of a previous computation to a new computation model, which are not affected by the changes of
+        the network since then. Bounds of flows and links depend only on the flows passing the same edges and on the
+        maximum packet lengths over all flows.
+
+        :param network: network object
+        :param state: state created by _make_incremental_state()
+        """
+        if self._compute_args["cbs"].maxima() != state["maxima"]:
+            return
+        changed_edges = set()
+
+        def add_path(path):
+            changed_edges.update(frozenset(hop) for hop in zip(path, path[1:]))
+
+        edge_fingerprints = state["edge_fingerprints"]
+        for edge_id, edge in network.edges.items():
+            fingerprint = self._edge_fingerprint(edge)
+            if edge_fingerprints.get(edge_id) != fingerprint:
+                add_path(fingerprint[:2])
+                add_path(edge_fingerprints.get(edge_id, ())[:2])
+        for edge_id, fingerprint in edge_fingerprints.items():
+            if edge_id not in network.edges:
+                add_path(fingerprint[:2])
+
+        flow_fingerprints = state["flow_fingerprints"]
+        for flow_id, flow in network.flows.items():
+            fingerprint = self._flow_fingerprint(flow)
+            if flow_fingerprints.get(flow_id) != fingerprint:
+                add_path(fingerprint[0])
+                add_path(flow_fingerprints.get(flow_id, ((),))[0])
+        for flow_id, fingerprint in flow_fingerprints.items():
+            if flow_id not in network.flows:
+                add_path(fingerprint[0])
+
+        links = self._compute_args["link_mapping"]
+        for flow_id, record in state["flow_records"].items():
+            if flow_id not in network.flows:
+                continue
+            path = flow_fingerprints[flow_id][0]
+            if changed_edges.isdisjoint(frozenset(hop) for hop in zip(path, path[1:])):
+                self._compute_args["flow_records"][flow_id] = record
+        for link_id, record in state["link_records"].items():
+            if link_id in links and frozenset(link_id) not in changed_edges:
+                self._compute_args["link_records"][link_id] = record
+
+    def _make_model_state(self, network):
+        """
+        Creates the state, from which the computation model of a following admission check or incremental
+        computation is updated.
+
+        :param network: network object
+        :return: computation model and fingerprints of the network components
+        """
+        return self._make_fingerprints(network) | {key: self._compute_args[key] for key in
+                                                   ("cbs", "flow_mapping", "link_mapping")}
+
+    def _has_same_topology(self, network, state):
+        """
+        Checks whether the computation model of a state can be updated, i.e. no edge connects other nodes than before.
+
+        :param network: network object
+        :param state: state created by _make_model_state()
+        :return: whether the model can be updated, otherwise the network is translated again
+        """
+        edge_fingerprints = state["edge_fingerprints"]
+        return all(edge_fingerprints[edge_id][:2] == (edge.start.id, edge.end.id)
+                   for edge_id, edge in network.edges.items() if edge_id in edge_fingerprints)
+
+    def _update_computation_model(self, network, state):
+        """
+        Applies the changes of a network since the state was created to its computation model. Changed links and
+        flows are invalidated, added and removed flows are added to and removed from the model.
+
+        :param network: network object
+        :param state: state created by _make_model_state()
+        """
+        cbs = state["cbs"]
+        flow_mapping = state["flow_mapping"]
+        links = state["link_mapping"]
+        edge_fingerprints = state["edge_fingerprints"]
+        flow_fingerprints = state["flow_fingerprints"]
+
+        changed_links = []
+        for edge_id, edge in network.edges.items():
+            fingerprint = self._edge_fingerprint(edge)
+            if edge_fingerprints.get(edge_id) == fingerprint:
+                continue
+            i, j = edge.start.id, edge.end.id
+            new_links = self._make_links(edge)
+            if edge_id not in edge_fingerprints:
+                links[i, j], links[j, i] = new_links
+                continue
+            for link, new_link in zip((links[i, j], links[j, i]), new_links):
+                for name in _LINK_PARAMETERS:
+                    setattr(link, name, getattr(new_link, name))
+                changed_links.append(link)
+        for edge_id, fingerprint in edge_fingerprints.items():
+            if edge_id not in network.edges:
+                i, j = fingerprint[0], fingerprint[1]
+                links.pop((i, j), None)
+                links.pop((j, i), None)
+
+        for link in changed_links:
+            cbs.invalidate(link=link)
+        for flow_id, flow in network.flows.items():
+            fingerprint = self._flow_fingerprint(flow)
+            if flow_fingerprints.get(flow_id) == fingerprint:
+                continue
+            new_flow = self._make_flow(flow, links)
+            if flow_id in flow_mapping:
+                ats_flow = flow_mapping[flow_id]
+                for name in _FLOW_PARAMETERS:
+                    setattr(ats_flow, name, getattr(new_flow, name))
+                cbs.invalidate(flow=ats_flow)
+            else:
+                flow_mapping[flow_id] = new_flow
+                cbs.add_flow(new_flow)
+        for flow_id in list(flow_mapping):
+            if flow_id not in network.flows:
+                cbs.remove_flow(flow_mapping.pop(flow_id))
+
+        self._compute_args["cbs"] = cbs
+        self._compute_args["flow_mapping"] = flow_mapping
+        self._compute_args["link_mapping"] = links
+
+    def _select_flows(self):
+        """
+        Selects the flows of interest to analyze. In top-k mode, these are the k class A and B flows with the largest
+        end-to-end delays, ranked by cheap bounds first.
+        """
+        flow_mapping = self._compute_args["flow_mapping"]
+        flow_records = self._compute_args["flow_records"]
+        cbs = self._compute_args["cbs"]
+        if self.top_k <= 0:
+            self._compute_args["flow_ids"] = self.flow_ids_of_interest
+            return
+
+        flow_ids = [flow_id for flow_id in self.flow_ids_of_interest
+                    if flow_mapping[flow_id].t == "A" or flow_mapping[flow_id].t == "B"]
+        unknown = [flow_id for flow_id in flow_ids if flow_id not in flow_records]
+        lower, upper = cbs.end_to_end_delay_bounds([flow_mapping[flow_id] for flow_id in unknown])
+        bounds = dict(zip(unknown, zip(lower.tolist(), upper.tolist())))
+        for flow_id in flow_ids:
+            if flow_id in flow_records:
+                delay = flow_records[flow_id]["end_to_end_delay"]
+                bounds[flow_id] = delay, delay
+
+        def compute_delays(candidates):
+            delays = cbs.end_to_end_delays([flow_mapping[flow_id] for flow_id in candidates]).tolist()
+            return [flow_records[flow_id]["end_to_end_delay"] if flow_id in flow_records else delay
+                    for flow_id, delay in zip(candidates, delays)]
+
+        ranking = self._select_top_k(bounds, self.top_k, compute_delays)
+        self._compute_args["flow_ids"] = [flow_id for flow_id, _ in ranking]
+
+    def _compute_flow_records(self):
+        """
+        Computes the bounds of every selected flow, which are not known from a previous computation. The delays are
+        computed in chunks of flows, so the bounds are streamed and a canceled computation stops early.
+        """
+        flow_mapping = self._compute_args["flow_mapping"]
+        flow_records = self._compute_args["flow_records"]
+        cbs = self._compute_args["cbs"]
+
+        flow_ids = [flow_id for flow_id in self._compute_args["flow_ids"] if flow_id not in flow_records]
+        for start in range(0, len(flow_ids), _FLOW_CHUNK_SIZE):
+            chunk = flow_ids[start:start + _FLOW_CHUNK_SIZE]
+            delays = cbs.end_to_end_delays([flow_mapping[flow_id] for flow_id in chunk]).tolist()
+            for flow_id, delay in zip(chunk, delays):
+                self._poll_canceled()
+                self._compute_flow_record(flow_id, delay)
+
+    def _compute_flow_record(self, flow_id: uuid.UUID, delay: float):
+        """
+        Computes the bounds of a flow at its links and interleaved regulators.
+
+        :param flow_id: ID of the flow
+        :param delay: end-to-end delay of the flow in s
+        """
+        flow_mapping = self._compute_args["flow_mapping"]
+        flow_records = self._compute_args["flow_records"]
+        cbs = self._compute_args["cbs"]
+
+        ats_flow = flow_mapping[flow_id]
+        hops = list(zip(ats_flow.p, ats_flow.p[1:]))
+        if ats_flow.t == "A" or ats_flow.t == "B":
+            self._publish("End-to-End Delay (s)", self._compute_args["network"].flows[flow_id].name, delay)
+        flow_records[flow_id] = {
+            "end_to_end_delay": None if ats_flow.t == "CDT" or ats_flow.t == "BE" else delay,
+            "response_time_ir": [cbs.h_i_j_k(ats_flow, link_i_j, link_j_k) for link_i_j, link_j_k in hops],
+            "response_time_link": [cbs.s_i_j(ats_flow, link_i_j) for link_i_j in ats_flow.p],
+            "backlog_ir": [cbs.backlog_interleaved_regulator(ats_flow, link_i_j, link_j_k)
+                           for link_i_j, link_j_k in hops]}
 
     def _compute_end_to_end_delay(self):
         """
-        Computes the end-to-end delay for every flow of interest.
+        Computes the end-to-end delay for every selected flow of interest.
         """
         network = self._compute_args["network"]
         result = self._compute_args["result"]
         flow_mapping = self._compute_args["flow_mapping"]
-        cbs = self._compute_args["cbs"]
+        flow_records = self._compute_args["flow_records"]
 
         names_a = []
         names_b = []
         values_a = []
         values_b = []
         result_text = ""
-        for flow_id in self.flow_ids_of_interest:
+        for flow_id in self._compute_args["flow_ids"]:
             ats_flow = flow_mapping[flow_id]
-            if ats_flow.t == "CDT" or ats_flow.t == "BE":
+            delay = flow_records[flow_id]["end_to_end_delay"]
+            if delay is None:
                 continue
-            delay = cbs.end_to_end_delay(ats_flow)
             flow_name = network.flows[flow_id].name
             result_text += f"Flow {flow_name}: {str(delay)}s\n"
             if ats_flow.t == "A":
@@ -139,6 +644,13 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         result.append_result(result_text, 1)
         self._compute_args["e2e"] = names_a, values_a, names_b, values_b
 
+        if self.top_k > 0:
+            rows = [(rank, network.flows[flow_id].name, flow_mapping[flow_id].t,
+                     flow_records[flow_id]["end_to_end_delay"])
+                    for rank, flow_id in enumerate(self._compute_args["flow_ids"], start=1)]
+            result.add_table(["Rank", "Flow", "Class", "End-to-End Delay (s)"], rows,
+                             f"Top {self.top_k} End-to-End Delays")
+
     def _compute_backlog_link(self):
         """
         Computes the backlog bounds for used links.
@@ -163,17 +675,32 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         :param traffic_class: "A" or "B"
         :return: (result string, link names, backlog bounds)
         """
-        cbs = self._compute_args["cbs"]
         names = []
         values = []
         result = ""
         for (name, link) in self._get_used_links(network):
-            backlog = cbs.backlog_cbfs(traffic_class, link)
+            backlog = self._compute_link_backlog(name, link, traffic_class)
             result += f"{name}: {backlog} bit\n"
             names.append(name)
             values.append(backlog)
         return result, names, values
 
+    def _compute_link_backlog(self, name, link, traffic_class):
+        """
+        Computes the backlog bound of a traffic class at a link, if it is not known from the records.
+
+        :param name: name of the link
+        :param link: ATS-CBS link
+        :param traffic_class: "A" or "B"
+        :return: backlog in bit
+        """
+        cbs = self._compute_args["cbs"]
+        record = self._compute_args["link_records"].setdefault((uuid.UUID(link.i), uuid.UUID(link.j)), {})
+        if traffic_class not in record:
+            record[traffic_class] = cbs.backlog_cbfs(traffic_class, link)
+            self._publish(f"Backlog class {traffic_class} (bit)", name, record[traffic_class])
+        return record[traffic_class]
+
     def _compute_backlog_for_interleaved_regulator(self, network, flow):
         """
         Computes the backlog bounds at every passed interleaved regulator of a flow.
@@ -183,7 +710,7 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         :return: result string
         """
         flow_mapping = self._compute_args["flow_mapping"]
-        cbs = self._compute_args["cbs"]
+        record = self._compute_args["flow_records"][flow.id]
         result = ""
         ats_flow = flow_mapping[flow.id]
         for index, link_i_j in enumerate(ats_flow.p):
@@ -193,7 +720,7 @@ class ATSConfiguration(AbstractNetworkConfiguration):
             name_i = network.nodes[uuid.UUID(link_i_j.i)].name
             name_j = network.nodes[uuid.UUID(link_i_j.j)].name
             name_k = network.nodes[uuid.UUID(link_j_k.j)].name
-            backlog = cbs.backlog_interleaved_regulator(ats_flow, link_i_j, link_j_k)
+            backlog = record["backlog_ir"][index]
             result += f"{name_i}-{name_j}-{name_k}: {backlog} bit\n"
         return result
 
@@ -206,7 +733,7 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         :return: result string
         """
         flow_mapping = self._compute_args["flow_mapping"]
-        cbs = self._compute_args["cbs"]
+        record = self._compute_args["flow_records"][flow.id]
         result = ""
         ats_flow = flow_mapping[flow.id]
         for index, link_i_j in enumerate(ats_flow.p):
@@ -216,7 +743,7 @@ class ATSConfiguration(AbstractNetworkConfiguration):
             name_i = network.nodes[uuid.UUID(link_i_j.i)].name
             name_j = network.nodes[uuid.UUID(link_i_j.j)].name
             name_k = network.nodes[uuid.UUID(link_j_k.j)].name
-            response_time = cbs.h_i_j_k(ats_flow, link_i_j, link_j_k)
+            response_time = record["response_time_ir"][index]
             result += f"{name_i}-{name_j}-{name_k}: {response_time} s\n"
         return result
 
@@ -229,13 +756,13 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         :return: result string
         """
         flow_mapping = self._compute_args["flow_mapping"]
-        cbs = self._compute_args["cbs"]
+        record = self._compute_args["flow_records"][flow.id]
         result = ""
         ats_flow = flow_mapping[flow.id]
         for index, link_i_j in enumerate(ats_flow.p):
             name_i = network.nodes[uuid.UUID(link_i_j.i)].name
             name_j = network.nodes[uuid.UUID(link_i_j.j)].name
-            response_time = cbs.s_i_j(ats_flow, link_i_j)
+            response_time = record["response_time_link"][index]
             result += f"{name_i}-{name_j}: {response_time} s\n"
         return result
 
@@ -248,7 +775,7 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         """
         link_mapping = self._compute_args["link_mapping"]
         used_links = {}
-        for flow_id in self.flow_ids_of_interest:
+        for flow_id in self._compute_args["flow_ids"]:
             flow = network.flows[flow_id]
             for index, node_i in enumerate(flow.path):
                 if index + 1 >= len(flow.path):
@@ -261,13 +788,13 @@ class ATSConfiguration(AbstractNetworkConfiguration):
 
     def _compute_response_time_ir(self):
         """
-        Computes the response time of interleaved regulators for every flow of interest.
+        Computes the response time of interleaved regulators for every selected flow of interest.
         """
         network = self._compute_args["network"]
         result = self._compute_args["result"]
 
         result.append_result("Response time for interleaved regulator:", 1)
-        for flow_id in self.flow_ids_of_interest:
+        for flow_id in self._compute_args["flow_ids"]:
             flow = network.flows[flow_id]
             result.append_result(f"Flow {flow.name}:", 2)
             result.append_result(
@@ -275,29 +802,35 @@ class ATSConfiguration(AbstractNetworkConfiguration):
 
     def _compute_response_time_link(self):
         """
-        Computes the response time at every link for every flow of interest.
+        Computes the response time at every link for every selected flow of interest.
         """
         network = self._compute_args["network"]
         result = self._compute_args["result"]
         result.append_result("Response time for link:", 1)
-        for flow_id in self.flow_ids_of_interest:
+        for flow_id in self._compute_args["flow_ids"]:
             flow = network.flows[flow_id]
             result.append_result(f"Flow {flow.name}:", 2)
             result.append_result(self._compute_response_time_for_link(network, flow), 3)
 
     def _compute_backlog_ir(self):
         """
-        Computes the backlog bounds of interleaved regulators for every flow of interest.
+        Computes the backlog bounds of interleaved regulators for every selected flow of interest.
         """
         network = self._compute_args["network"]
         result = self._compute_args["result"]
         result.append_result("Backlog for interleaved regulator:", 1)
-        for flow_id in self.flow_ids_of_interest:
+        for flow_id in self._compute_args["flow_ids"]:
             flow = network.flows[flow_id]
             result.append_result(f"Flow {flow.name}:", 2)
             result.append_result(
                 self._compute_backlog_for_interleaved_regulator(network, flow), 3)
 
+    def __getstate__(self):
+        attributes = super().__getstate__()
+        # the admission model is only used in the main process
+        attributes["_admission_state"] = None
+        return attributes
+
     def _make_plots(self):
         """
         Creates plots based on the delay and backlog bounds.
@@ -385,3 +918,41 @@ class ATSConfiguration(AbstractNetworkConfiguration):
         axe.legend()
         result = self._compute_args["result"]
         result.add_plot(fig, "Backlog")
+
+
+def _compute_sweep_points(network, configuration_id: uuid.UUID, flow_ids: list, used_links: list[tuple],
+                          grid: list[dict]) -> list[tuple[list, list]]:
+    """
+    Computes the bounds of grid points of a sweep in a worker process. The network is translated once and only the
+    varied parameters are changed between the grid points.
+
+    :param network: network object
+    :param configuration_id: group ID of the configuration
+    :param flow_ids: IDs of the analyzed class A and B flows
+    :param used_links: analyzed links as (name, (start node ID, end node ID))
+    :param grid: {edge or flow ID: {parameter name: value}} for every grid point
+    :return: (end-to-end delays, [class A, class B] backlogs per link) for every grid point
+    """
+    configuration: ATSConfiguration = network.configurations[configuration_id]
+    configuration._compute_args = {}
+    configuration.make_computation_model(network)
+    cbs = configuration._compute_args["cbs"]
+    links = configuration._compute_args["link_mapping"]
+    flows = [configuration._compute_args["flow_mapping"][flow_id] for flow_id in flow_ids]
+    bounds = []
+    for overrides in grid:
+        configuration._apply_overrides(network, overrides)
+        backlogs = [[cbs.backlog_cbfs("A", links[link_id]), cbs.backlog_cbfs("B", links[link_id])]
+                    for _, link_id in used_links]
+        bounds.append((cbs.end_to_end_delays(flows).tolist(), backlogs))
+    return bounds
+
+
+# number of flows, whose end-to-end delays are computed at once
+_FLOW_CHUNK_SIZE = 256
+
+_LINK_PARAMETERS = ("c", "idsl_a", "sdsl_a", "idsl_b", "sdsl_b", "t_var_min", "t_var_max", "t_proc_min", "t_proc_max")
+_FLOW_PARAMETERS = ("r", "l_min", "l_max", "p", "t", "at")
+# sweep parameter: (component, attribute of the ATS-CBS link or flow), the values are given in Mbit/s or Mbit
+_SWEEP_PARAMETERS = {"idle_slope_A": ("edge", "idsl_a"), "idle_slope_B": ("edge", "idsl_b"),
+                     "link_speed": ("edge", "c"), "regulation_rate": ("flow", "r"), "l_max": ("flow", "l_max")}
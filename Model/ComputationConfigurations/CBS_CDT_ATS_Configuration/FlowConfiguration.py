@@ -4,7 +4,7 @@ from Model.ComputationConfigurations.ConfigurationTemplate.DefaultFlowConfigurat
 
 class FlowConfiguration(DefaultFlowConfiguration):
     def __init__(self, regulation_rate=20.0, l_min=0.001, l_max=0.001, flow_type="A",
-                 ac_type="LRQ", **kwargs):
+                 ac_type="LRQ", deadline=None, **kwargs):
         """
             Constructor of a Flow for [1] defined by:
             :param regulation_rate: regulation rate of every flow in Mbit/s
@@ -12,6 +12,7 @@ class FlowConfiguration(DefaultFlowConfiguration):
             :param l_max: maximum packet length in Mbit
             :param flow_type: CDT / A / B / BE
             :param ac_type: arrival curve type: LRQ / LB
+            :param deadline: maximal end-to-end delay in s, used by admission control, None for no deadline
 
         """
         super().__init__(**kwargs)
@@ -20,13 +21,14 @@ class FlowConfiguration(DefaultFlowConfiguration):
         self.l_max = l_max
         self.type = flow_type
         self.ac_type = ac_type
+        self.deadline = deadline
 
     def make_parameter_dict(self):
         super_dict = super().make_parameter_dict()
 
         own_dict = {"regulation rate (Mbit/s)": self.regulation_rate, "minimum packet length (Mbit)": self.l_min,
                     "maximum packet length (Mbit)": self.l_max, "flow type (CDT/A/B/BE)": self.type,
-                    "arrival curve type (LRQ/LB)": self.ac_type}
+                    "arrival curve type (LRQ/LB)": self.ac_type, "deadline (s)": self.deadline}
         return super_dict | own_dict
 
     def update_parameter_dict(self, dictionary):
@@ -59,17 +61,27 @@ class FlowConfiguration(DefaultFlowConfiguration):
             raise ValueError(f"Unknown ac type: '{new_value}'. Expected: {allowed_ac_types}")
         self.ac_type = new_value
 
+        new_value = str(dictionary["deadline (s)"]).strip()
+        if new_value.lower() in ["", "none"]:
+            self.deadline = None
+        else:
+            new_value = float(new_value)
+            if new_value <= 0 or new_value == float("inf"):
+                raise ValueError("Only positive deadlines allowed, None for no deadline")
+            self.deadline = new_value
+
         super().update_parameter_dict(dictionary)
 
     def to_serializable_dict(self) -> dict:
         super_dict = super().to_serializable_dict()
         own_dict = {"regulation_rate": self.regulation_rate, "l_min": self.l_min, "l_max": self.l_max,
-                    "type": self.type, "ac_type": self.ac_type}
+                    "type": self.type, "ac_type": self.ac_type, "deadline": self.deadline}
         return super_dict | own_dict
 
     @staticmethod
     def to_constructor_dict(json_dict, model, flow):
         super_dict = DefaultFlowConfiguration.to_constructor_dict(json_dict, model, flow)
         own_dict = {"regulation_rate": json_dict["regulation_rate"], "ac_type": json_dict["ac_type"],
-                    "flow_type": json_dict["type"], "l_min": json_dict["l_min"], "l_max": json_dict["l_max"]}
+                    "flow_type": json_dict["type"], "l_min": json_dict["l_min"], "l_max": json_dict["l_max"],
+                    "deadline": json_dict.get("deadline")}
         return super_dict | own_dict
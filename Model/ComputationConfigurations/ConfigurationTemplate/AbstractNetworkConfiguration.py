@@ -69,6 +69,147 @@ class AbstractNetworkConfiguration(AbstractConfiguration):
         """
         raise NotImplementedError()
 
+    def prepare_computation(self) -> None:
+        """
+        Is called in the main process, before the configuration is computed by a worker process. Can be used to start
+        external tools in the background, which the worker processes share.
+        """
+        pass
+
+    def receive_result(self, result: Result) -> None:
+        """
+        Receives a finished result in the main process. Can be used to keep a state of the computation, which was
+        stored in result.configuration_state by compute().
+
+        :param result: finished result object
+        """
+        pass
+
+    def is_result_cacheable(self) -> bool:
+        """
+        Returns whether a stored result can replace the computation, see ResultCache. A configuration, whose
+        computation has side effects or keeps a state in receive_result(), has to be computed every time.
+
+        :return: whether the results of the configuration can be taken from the result cache
+        """
+        return True
+
+    def get_work_units(self, network) -> list | None:
+        """
+        Returns the independent parts of a computation, e.g. ("flow", flow ID) for the bounds of a flow and ("link",
+        (start node ID, end node ID)) for the bounds of a link. The units are split into shards, which are computed
+        by compute_work_units() in parallel and combined by merge_work_units(). Runs in the main process.
+
+        :param network: network object
+        :return: hashable work units or None, if the configuration is computed by compute() as a whole
+        """
+        return None
+
+    def compute_work_units(self, network, units: list, result: Result = None) -> dict:
+        """
+        Computes a shard of work units. Runs in a separate process.
+
+        :param network: network object
+        :param units: work units returned by get_work_units()
+        :param result: result object of the configuration, only used to stream partial results
+        :return: {work unit: picklable result of the unit}
+        """
+        raise NotImplementedError()
+
+    def merge_work_units(self, network, result: Result, partial_results: list[dict]) -> None:
+        """
+        Computes the configuration from the results of all shards. The results are merged into
+        _compute_args["work_unit_results"], which compute() uses instead of computing the units again. Runs in a
+        separate process.
+
+        :param network: network object
+        :param result: a result object for storing results and plots
+        :param partial_results: return values of compute_work_units() for every shard
+        """
+        work_unit_results = {}
+        for partial_result in partial_results:
+            work_unit_results.update(partial_result)
+        self._compute_args["work_unit_results"] = work_unit_results
+        self.compute(network, result)
+
+    def _publish(self, kind: str, name: str, value):
+        """
+        Streams a bound of the running computation to the main process, see Result.publish().
+
+        :param kind: kind of the bound with its unit
+        :param name: name of the flow or link
+        :param value: bound
+        """
+        result = self._compute_args.get("result")
+        if result is not None:
+            result.publish(kind, name, value)
+
+    def _poll_canceled(self):
+        """
+        Stops the running computation, if it was canceled, see Result.poll_canceled().
+        """
+        result = self._compute_args.get("result")
+        if result is not None:
+            result.poll_canceled()
+
+    def _set_phase(self, phase: str):
+        """
+        Streams the current phase of the running computation to the main process.
+
+        :param phase: description of the phase
+        """
+        result = self._compute_args.get("result")
+        if result is not None:
+            result.set_phase(phase)
+
+    @staticmethod
+    def _select_top_k(bounds: dict, k: int, compute_delays) -> list[tuple]:
+        """
+        Selects the k flows with the largest end-to-end delays. Exact delays are only computed for flows, which can
+        still enter the top k according to their lower and upper bounds.
+
+        :param bounds: {flow ID: (lower bound, upper bound)}
+        :param k: number of flows
+        :param compute_delays: function computing the exact delays of a list of flow IDs
+        :return: list of (flow ID, delay) sorted by decreasing delay
+        """
+        if k >= len(bounds):
+            candidates = list(bounds)
+            return sorted(zip(candidates, compute_delays(candidates)), key=lambda flow_delay: -flow_delay[1])
+
+        # at least k flows have a delay larger than the k-th largest lower bound
+        threshold = sorted((lower for lower, _ in bounds.values()), reverse=True)[k - 1]
+        candidates = sorted((flow_id for flow_id, (_, upper) in bounds.items() if upper >= threshold),
+                            key=lambda flow_id: -bounds[flow_id][1])
+        ranking = []
+        for start in range(0, len(candidates), k):
+            if len(ranking) == k and ranking[-1][1] >= bounds[candidates[start]][1]:
+                break
+            batch = candidates[start:start + k]
+            ranking = sorted(ranking + list(zip(batch, compute_delays(batch))),
+                             key=lambda flow_delay: -flow_delay[1])[:k]
+        return ranking
+
+    @staticmethod
+    def get_sweep_parameters() -> dict[str, str]:
+        """
+        Returns the parameters, which can be varied by a sweep, see ParameterSweep.sweep().
+
+        :return: {parameter name: "edge" or "flow"}
+        """
+        return {}
+
+    def compute_sweep(self, network, grid: list[dict], number_of_workers) -> tuple[list, list, list, list]:
+        """
+        Computes the bounds of the grid points of a sweep, see ParameterSweep.sweep().
+
+        :param network: network object
+        :param grid: {edge or flow ID: {parameter name: value}} for every grid point
+        :param number_of_workers: number of processes
+        :return: (flow names, link names, end-to-end delays and [class A, class B] link backlogs per grid point)
+        """
+        raise ValueError(f"{self.get_configuration_name()} does not support sweeps")
+
     @staticmethod
     def get_node_configuration_class() -> Type[DefaultNodeConfiguration]:
         """
@@ -1,5 +1,5 @@
+import math
 from fractions import Fraction
-from multiprocessing import Process
 from typing import Type
 from uuid import UUID
 
@@ -7,8 +7,9 @@ import numpy as np
 import scienceplots
 from matplotlib import pyplot as plt
 
-from ComputationMethods.NancyComputations.CBS import NancyCBS, AvbClass, Rational, Link as NancyLink, \
-    Flow as NancyFlow, Plot
+from ComputationMethods.AnalyticCBS import AnalyticCBS, Link as AnalyticLink, Flow as AnalyticFlow
+from ComputationMethods.NancyComputations import CBS as nancy
+from ComputationMethods.NumpyCBS import NumpyCBS
 from Model import Result
 from Model.ComputationConfigurations.ConfigurationTemplate.AbstractNetworkConfiguration import \
     AbstractNetworkConfiguration
@@ -16,14 +17,19 @@ from Model.ComputationConfigurations.ConfigurationTemplate.DefaultEdgeConfigurat
 from Model.ComputationConfigurations.ConfigurationTemplate.DefaultFlowConfiguration import DefaultFlowConfiguration
 from Model.ComputationConfigurations.Nancy_CBS_Configuration.NancyCBSEdgeConfiguration import NancyCBSEdgeConfiguration
 from Model.ComputationConfigurations.Nancy_CBS_Configuration.NancyCBSFlowConfiguration import NancyCBSFlowConfiguration
+from Model.ComputationConfigurations.Nancy_CBS_Configuration.NancyPlotSession import NancyPlotSession
 from Model.Network import Network, Node, Flow, Edge
+from Model.ParameterSweep import compute_grid
 
 
 class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
 
     def __init__(self, max_frame_size_a: int = 64, max_frame_size_b: int = 1522, max_frame_size_nsr: int = 1522,
-                 is_strict: bool = False, plot_on_change_in_browser: bool = False, **kwargs):
+                 is_strict: bool = False, plot_on_change_in_browser: bool = False, top_k: int = 0,
+                 engine: str = "Nancy", **kwargs):
         super().__init__(**kwargs)
+        self.engine: str = engine
+        self.top_k: int = top_k
         self.plot_on_change_in_browser: bool = plot_on_change_in_browser
         self.max_frame_size_a: int = max_frame_size_a
         self.max_frame_size_b: int = max_frame_size_b
@@ -58,7 +64,8 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
     def to_serializable_dict(self) -> dict:
         own_dict = {"max_frame_size_a": self.max_frame_size_a, "max_frame_size_b": self.max_frame_size_b,
                     "max_frame_size_nsr": self.max_frame_size_nsr, "is_strict": self.is_strict,
-                    "plot_on_change_in_browser": self.plot_on_change_in_browser}
+                    "plot_on_change_in_browser": self.plot_on_change_in_browser, "top_k": self.top_k,
+                    "engine": self.engine}
         return super().to_serializable_dict() | own_dict
 
     @staticmethod
@@ -66,14 +73,16 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
         own_dict = {"max_frame_size_a": json_dict["max_frame_size_a"],
                     "max_frame_size_b": json_dict["max_frame_size_b"],
                     "max_frame_size_nsr": json_dict["max_frame_size_nsr"], "is_strict": json_dict["is_strict"],
-                    "plot_on_change_in_browser": json_dict["plot_on_change_in_browser"]}
+                    "plot_on_change_in_browser": json_dict["plot_on_change_in_browser"],
+                    "top_k": json_dict.get("top_k", 0), "engine": json_dict.get("engine", "Nancy")}
         return AbstractNetworkConfiguration.to_constructor_dict(json_dict, model, network) | own_dict
 
     def make_parameter_dict(self):
         own_dict = {"plot on change in browser": self.plot_on_change_in_browser,
                     "max. frame size A (Byte)": self.max_frame_size_a,
                     "max. frame size B (Byte)": self.max_frame_size_b,
-                    "max. frame size NSR (Byte)": self.max_frame_size_nsr, "is strict": self.is_strict}
+                    "max. frame size NSR (Byte)": self.max_frame_size_nsr, "is strict": self.is_strict,
+                    "top-k flows (0 = all)": self.top_k, "engine (Nancy/Analytic/NumPy)": self.engine}
         return super().make_parameter_dict() | own_dict
 
     def update_parameter_dict(self, dictionary):
@@ -92,6 +101,17 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
             raise ValueError("No negative Frame Size allowed")
         self.max_frame_size_nsr = value
 
+        value = int(dictionary["top-k flows (0 = all)"])
+        if value < 0:
+            raise ValueError("No negative value allowed")
+        self.top_k = value
+
+        engines = {"nancy": "Nancy", "analytic": "Analytic", "numpy": "NumPy"}
+        value = str(dictionary["engine (Nancy/Analytic/NumPy)"]).lower()
+        if value not in engines:
+            raise ValueError(f"Unknown engine: {value}")
+        self.engine = engines[value]
+
         true_values = ['true', '1', 't', 'y', 'yes']
         false_values = ['false', '0', 'f', 'n', 'no']
         value = str(dictionary["is strict"]).lower()
@@ -114,6 +134,55 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
 
         return super().update_parameter_dict(dictionary)
 
+    @staticmethod
+    def get_sweep_parameters() -> dict[str, str]:
+        return {"idle_slope_a": "edge", "idle_slope_b": "edge", "link_speed": "edge", "max_frame_size": "flow",
+                "max_interval_frame": "flow"}
+
+    def compute_sweep(self, network, grid, number_of_workers):
+        """
+        Computes the bounds of a sweep with the worker processes of the computation service. The grid is split into
+        one chunk per worker, every chunk translates the network once.
+        """
+        self._compute_args["network"] = network
+        self._compute_args["flow_ids"] = self.flow_ids_of_interest
+        flow_ids = [flow_id for flow_id in self.flow_ids_of_interest
+                    if network.flows[flow_id].configurations[self.group_id].avb_class.upper() in ("A", "B")]
+        used_links = [(node_i.id, node_j.id) for node_i, node_j in self._get_used_links()]
+        self._compute_args = {}
+
+        bounds = compute_grid(_compute_sweep_points, (network, self.group_id, flow_ids, used_links), grid,
+                              number_of_workers)
+        return ([network.flows[flow_id].name for flow_id in flow_ids],
+                [f"{network.nodes[node_i].name}-{network.nodes[node_j].name}" for node_i, node_j in used_links],
+                [delays for delays, _ in bounds], [backlogs for _, backlogs in bounds])
+
+    def _apply_overrides(self, overrides: dict):
+        """
+        Changes the parameters of the translated AnalyticCBS or NumpyCBS network to the values of a grid point of a
+        sweep, so the network does not have to be translated again.
+
+        :param overrides: {edge or flow ID: {parameter name: value}}
+        """
+        network = self._compute_args["network"]
+        link_mapping = self._compute_args["link_mapping"]
+        flow_mapping = self._compute_args["flow_mapping"]
+        engine: AnalyticCBS = self._compute_args["engine"]
+        self._compute_args["overrides"] = overrides
+        for component_id in overrides:
+            if component_id in network.edges:
+                edge = network.edges[component_id]
+                parameters = self._get_link_parameters(edge)
+                for link in (link_mapping[edge.start, edge.end], link_mapping[edge.end, edge.start]):
+                    (link.link_speed, link.idle_slope_a, link.send_slope_a, link.idle_slope_b,
+                     link.send_slope_b) = parameters
+            else:
+                flow = network.flows[component_id]
+                flow_mapping[flow].max_frame_size = int(self._get_parameter(flow, "max_frame_size"))
+                flow_mapping[flow].max_interval_frame = int(self._get_parameter(flow, "max_interval_frame"))
+        # drops the curves and bounds of the previous grid point
+        engine.set_flows(engine.flows)
+
     def compute(self, network: Network, result: Result):
         self._compute_args["result"] = result
         self._compute_args["network"] = network
@@ -122,109 +191,284 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
         _ = scienceplots.inode  # avoid unused import warning
         try:
             result.set_start_time()
-            self._make_cbs_object()
+            if "work_unit_results" in self._compute_args:
+                self._use_work_unit_results()
+            else:
+                self._set_phase("Translating the network")
+                self._make_engine()
+                self._set_phase("Computing end-to-end delays")
+                self._select_flows()
+                self._load_bounds()
 
             self._compute_end_to_end_delays()
+            self._set_phase("Computing link delays and backlogs")
             self._compute_link_delays()
             self._compute_link_backlogs()
             result.set_end_time()
+            engine = self._compute_args["engine"]
+            description = _describe_engine(engine)
+            if description is not None:
+                result.append_result(description)
+            result.append_result(f"Curve cache: {engine.hits} reused, {engine.misses} computed")
 
+            self._set_phase("Creating plots")
             self._make_plots()
         except Exception as e:
             raise Exception(repr(e))
 
+    def get_work_units(self, network: Network):
+        # top-k mode prunes flows by their bounds, so it is computed as a whole
+        if self.top_k > 0:
+            return None
+        compute_args, self._compute_args = self._compute_args, {"network": network}
+        try:
+            used_links = self._get_used_links()
+        finally:
+            self._compute_args = compute_args
+        return ([("flow", flow_id) for flow_id in self.flow_ids_of_interest] +
+                [("link", (node_i.id, node_j.id)) for node_i, node_j in used_links])
+
+    def compute_work_units(self, network: Network, units, result: Result = None):
+        """
+        Computes the end-to-end delays of the flows and the class A and B delays and backlogs of the links of a shard.
+        Every shard translates the whole network, so the curves of upstream links are computed by each shard needing
+        them.
+        """
+        self._compute_args["result"] = result
+        self._compute_args["network"] = network
+        try:
+            self._set_phase(f"Computing a shard of {len(units)} flows and links")
+            self._make_engine()
+            flow_mapping = self._compute_args["flow_mapping"]
+            link_mapping = self._compute_args["link_mapping"]
+            engine = self._compute_args["engine"]
+            self._compute_args["flow_ids"] = [unit_id for kind, unit_id in units if kind == "flow"]
+            links = [(network.nodes[unit_id[0]], network.nodes[unit_id[1]])
+                     for kind, unit_id in units if kind == "link"]
+            self._load_bounds(links)
+
+            partial_result = {}
+            for flow_id in self._compute_args["flow_ids"]:
+                flow = network.flows[flow_id]
+                partial_result["flow", flow_id] = delay = engine.end_to_end_delay(flow_mapping[flow])
+                self._publish("End-to-End Delay (s)", flow.name, delay)
+            for node_i, node_j in links:
+                link = link_mapping[node_i, node_j]
+                bounds = partial_result["link", (node_i.id, node_j.id)] = {}
+                for avb_class in ("A", "B"):
+                    bounds[avb_class] = engine.delay(link, avb_class), engine.backlog(link, avb_class)
+                    self._publish(f"Backlog class {avb_class} (bit)", f"{node_i.name}-{node_j.name}",
+                                  bounds[avb_class][1])
+            partial_result["engine"] = _describe_engine(engine), engine.hits, engine.misses
+            return partial_result
+        except Exception as e:
+            raise Exception(repr(e))
+
+    def merge_work_units(self, network: Network, result: Result, partial_results: list[dict]):
+        self._compute_args["engine_summaries"] = [partial_result.pop("engine") for partial_result in partial_results]
+        super().merge_work_units(network, result, partial_results)
+
     def plot_link_curves(self, edge: Edge, run_in_new_process=True):
         """
         Plots curves for a given edge.
 
         :param edge: edge object
-        :param run_in_new_process: whether the plot should be created in a separate process
+        :param run_in_new_process: whether the plot should be created by the plot session of the configuration, which
+                                   keeps the Nancy network of previous plots
         """
         if run_in_new_process:
-            Process(target=self.plot_link_curves, args=(edge, False)).start()
+            self.get_plot_session().plot_link(edge.id)
             return
-        self._compute_args["network"] = self.associated_component
+        self.open_plot_model()
+        curves, names = self.get_link_curves(edge)
+        nancy.Plot.PythonPlot(curves, names)
+
+    def plot_flow_source_ac(self, flow: Flow, run_in_new_process=True):
+        """
+        Plots curves for a given flow.
+
+        :param flow: flow object
+        :param run_in_new_process: whether the plot should be created by the plot session of the configuration, which
+                                   keeps the Nancy network of previous plots
+        """
+        if run_in_new_process:
+            self.get_plot_session().plot_flow(flow.id)
+            return
+        self.open_plot_model()
+        nancy.Plot.PythonPlot(self.get_flow_source_ac(flow), f"Arrival Curve {flow.name}")
+
+    def get_plot_session(self) -> NancyPlotSession:
+        """
+        :return: the plot session of this configuration, which is created on first use
+        """
+        if getattr(self, "_plot_session", None) is None:
+            self._plot_session = NancyPlotSession(self)
+        return self._plot_session
+
+    def get_network_state(self) -> tuple:
+        """
+        Returns the parameters, which define the Nancy network of the associated network. A plot session translates
+        the network again, if they changed.
+
+        :return: hashable state
+        """
+        network = self.associated_component
+        edges = tuple((edge.id, edge.start.id, edge.end.id, self._get_link_parameters(edge))
+                      for edge in network.edges.values())
+        flows = []
+        for flow in network.flows.values():
+            config: NancyCBSFlowConfiguration = flow.configurations[self.group_id]
+            flows.append((flow.id, tuple(node.id for node in flow.path), config.avb_class, config.is_periodic,
+                          config.is_worst_case, config.max_frame_size, config.class_measurement_interval,
+                          config.max_interval_frame))
+        return (self.max_frame_size_a, self.max_frame_size_b, self.max_frame_size_nsr, self.is_strict, edges,
+                tuple(flows))
+
+    def open_plot_model(self):
+        """
+        Translates the associated network into a Nancy network for plots. Curves are computed on demand and kept for
+        later plots.
+        """
+        self._compute_args = {"network": self.associated_component}
         self._make_cbs_object()
+
+    def get_link_curves(self, edge: Edge) -> tuple[list, list[str]]:
+        """
+        Returns the curves of both links of an edge. open_plot_model() has to be called before.
+
+        :param edge: edge object
+        :return: (Nancy curves, names of the curves)
+        """
+        self._propagate_arrival_curves([(edge.start, edge.end), (edge.end, edge.start)])
         network = self.associated_component
         link_mapping = self._compute_args["link_mapping"]
+        curve_cache: _CurveCache = self._compute_args["curve_cache"]
         nancy_edge_i_j = link_mapping[edge.start, edge.end]
         nancy_edge_j_i = link_mapping[edge.end, edge.start]
 
-        link: NancyLink
+        curves = []
+        names = []
+        link: nancy.Link
         for link in [nancy_edge_i_j, nancy_edge_j_i]:
-            curves = []
-            names = []
             name_i = network.nodes[UUID(link.NodeI)].name
             name_j = network.nodes[UUID(link.NodeJ)].name
 
-            curves.append(link.ComputeShapingCurve(AvbClass.A))
+            curves.append(link.ComputeShapingCurve(nancy.AvbClass.A))
             names.append(f"Shaper Class A at {name_i}-{name_j}")
-            curves.append(link.ComputeShapingCurve(AvbClass.B))
+            curves.append(link.ComputeShapingCurve(nancy.AvbClass.B))
             names.append(f"Shaper Class B at {name_i}-{name_j}")
 
-            curves.append(link.ComputeMinimalServiceCurve(AvbClass.A))
+            curves.append(curve_cache.minimal_service_curve(link, "A"))
             names.append(f"Min_sc Class A at {name_i}-{name_j}")
-            curves.append(link.ComputeMinimalServiceCurve(AvbClass.B))
+            curves.append(curve_cache.minimal_service_curve(link, "B"))
             names.append(f"Min_sc Class B at {name_i}-{name_j}")
 
-            curves.append(link.ComputeMaximalServiceCurve(AvbClass.A))
+            curves.append(link.ComputeMaximalServiceCurve(nancy.AvbClass.A))
             names.append(f"Max_sc Class A at {name_i}-{name_j}")
-            curves.append(link.ComputeMaximalServiceCurve(AvbClass.B))
+            curves.append(link.ComputeMaximalServiceCurve(nancy.AvbClass.B))
             names.append(f"Max_sc Class B at {name_i}-{name_j}")
 
-            curves.append(link.ComputeIncomingArrivalCurve(AvbClass.A))
+            curves.append(curve_cache.incoming_arrival_curve(link, "A"))
             names.append(f"Incoming_ac Class A at {name_i}-{name_j}")
-            curves.append(link.ComputeIncomingArrivalCurve(AvbClass.B))
+            curves.append(curve_cache.incoming_arrival_curve(link, "B"))
             names.append(f"Incoming_ac Class B at {name_i}-{name_j}")
 
-            curves.append(link.ComputeOutgoingArrivalCurve(AvbClass.A))
+            curves.append(link.ComputeOutgoingArrivalCurve(nancy.AvbClass.A))
             names.append(f"Outgoing_ac Class A at {name_i}-{name_j}")
-            curves.append(link.ComputeOutgoingArrivalCurve(AvbClass.B))
+            curves.append(link.ComputeOutgoingArrivalCurve(nancy.AvbClass.B))
             names.append(f"Outgoing_ac Class B at {name_i}-{name_j}")
+        return curves, names
 
-            Plot.PythonPlot(curves, names)
-
-    def plot_flow_source_ac(self, flow: Flow, run_in_new_process=True):
+    def get_flow_source_ac(self, flow: Flow):
         """
-        Plots curves for a given flow.
+        Returns the source arrival curve of a flow. open_plot_model() has to be called before.
 
         :param flow: flow object
-        :param run_in_new_process: whether the plot should be created in a separate process
+        :return: Nancy curve
         """
-        if run_in_new_process:
-            Process(target=self.plot_flow_source_ac, args=(flow, False)).start()
+        return self._compute_args["flow_mapping"][flow].ComputeSourceAc()
+
+    def __getstate__(self):
+        attributes = super().__getstate__()
+        # the plot session belongs to the process, which created it
+        attributes.pop("_plot_session", None)
+        return attributes
+
+    def _make_engine(self):
+        """
+        Prepares the computation of the bounds. By default, Nancy computes the bounds. With the Analytic engine, the
+        bounds are computed in closed form by AnalyticCBS, if all class A and B flows have token bucket arrival
+        curves. Otherwise, the stair arrival curves of worst case flows require the min-plus algebra of Nancy. With
+        the NumPy engine, NumpyCBS computes the bounds of all flows. _compute_args["engine"] holds the object
+        computing the bounds.
+        """
+        if self.engine == "NumPy":
+            self._make_analytic_object(NumpyCBS)
+            return
+        network = self._compute_args["network"]
+        if self.engine == "Analytic" and AnalyticCBS.is_supported(
+                [flow.configurations[self.group_id] for flow in network.flows.values()]):
+            self._make_analytic_object()
             return
-        self._compute_args["network"] = self.associated_component
         self._make_cbs_object()
-        nancy_flow = self._compute_args["flow_mapping"][flow]
-        ac = nancy_flow.ComputeSourceAc()
-        Plot.PythonPlot(ac, f"Arrival Curve {flow.name}")
+        self._propagate_arrival_curves()
+
+    def _make_analytic_object(self, engine_class: Type[AnalyticCBS] = AnalyticCBS):
+        """
+        Translates the network into an AnalyticCBS network. Parameters in _compute_args["overrides"] replace the
+        configured ones.
+
+        :param engine_class: AnalyticCBS or NumpyCBS
+        """
+        network = self._compute_args["network"]
+        analytic_cbs = engine_class(self.max_frame_size_a, self.max_frame_size_b, self.max_frame_size_nsr,
+                                    self.is_strict)
+        self._compute_args["engine"] = analytic_cbs
+
+        link_mapping: dict[tuple[Node, Node], AnalyticLink] = {}
+        self._compute_args["link_mapping"] = link_mapping
+        for edge in network.edges.values():
+            parameters = self._get_link_parameters(edge)
+            for node_i, node_j in ((edge.start, edge.end), (edge.end, edge.start)):
+                link_mapping[node_i, node_j] = AnalyticLink(f"{node_i.name}-{node_j.name}", str(node_i.id),
+                                                            str(node_j.id), *parameters)
+
+        flow_mapping: dict[Flow, AnalyticFlow] = {}
+        self._compute_args["flow_mapping"] = flow_mapping
+        for flow in network.flows.values():
+            config: NancyCBSFlowConfiguration = flow.configurations[self.group_id]
+            path = [link_mapping[link] for link in zip(flow.path, flow.path[1:])]
+            flow_mapping[flow] = AnalyticFlow(str(flow.id), path, config.avb_class, config.is_periodic,
+                                              config.is_worst_case, int(self._get_parameter(flow, "max_frame_size")),
+                                              config.class_measurement_interval,
+                                              int(self._get_parameter(flow, "max_interval_frame")))
+        analytic_cbs.set_flows(list(flow_mapping.values()))
 
     def _make_cbs_object(self):
         """
-        Translated the network into a Nancy network.
+        Translated the network into a Nancy network. Parameters in _compute_args["overrides"] replace the configured
+        ones.
         """
+        # starts the .NET runtime on first use, in the process computing the configuration
+        nancy.load_backend()
         network = self._compute_args["network"]
-        cbs = NancyCBS(self.max_frame_size_a, self.max_frame_size_b, self.max_frame_size_nsr, self.is_strict)
+        cbs = nancy.NancyCBS(self.max_frame_size_a, self.max_frame_size_b, self.max_frame_size_nsr, self.is_strict)
         self._compute_args["cbs"] = cbs
+        self._compute_args["curve_cache"] = self._compute_args["engine"] = _CurveCache()
+        if hasattr(cbs, "SetNetwork"):
+            self._set_network(cbs)
+            return
 
-        link_mapping: dict[tuple[Node, Node], NancyLink] = {}
+        link_mapping: dict[tuple[Node, Node], nancy.Link] = {}
         self._compute_args["link_mapping"] = link_mapping
         for edge in network.edges.values():
-            config: NancyCBSEdgeConfiguration = edge.configurations[self.group_id]
-            megabit = 10 ** 6
-            link_i_j = NancyLink(cbs, str(edge.id), str(edge.start.id), str(edge.end.id),
-                                 int(config.link_speed * megabit), int(config.idle_slope_a * megabit),
-                                 int(config.send_slope_a * megabit), int(config.idle_slope_b * megabit),
-                                 int(config.send_slope_b * megabit))
-            link_j_i = NancyLink(cbs, str(edge.id), str(edge.end.id), str(edge.start.id),
-                                 int(config.link_speed * megabit), int(config.idle_slope_a * megabit),
-                                 int(config.send_slope_a * megabit), int(config.idle_slope_b * megabit),
-                                 int(config.send_slope_b * megabit))
+            parameters = self._get_link_parameters(edge)
+            link_i_j = nancy.Link(cbs, str(edge.id), str(edge.start.id), str(edge.end.id), *parameters)
+            link_j_i = nancy.Link(cbs, str(edge.id), str(edge.end.id), str(edge.start.id), *parameters)
             link_mapping[edge.start, edge.end] = link_i_j
             link_mapping[edge.end, edge.start] = link_j_i
 
-        flow_mapping: dict[Flow, NancyFlow] = {}
+        flow_mapping: dict[Flow, nancy.Flow] = {}
         self._compute_args["flow_mapping"] = flow_mapping
         for flow in network.flows.values():
             config: NancyCBSFlowConfiguration = flow.configurations[self.group_id]
@@ -237,30 +481,311 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
                 path.append(link_mapping[node_i, node_j])
 
             if config.avb_class.upper() == "A":
-                avb_class = AvbClass.A
+                avb_class = nancy.AvbClass.A
             elif config.avb_class.upper() == "B":
-                avb_class = AvbClass.B
+                avb_class = nancy.AvbClass.B
             else:
-                avb_class = AvbClass.Nsr
+                avb_class = nancy.AvbClass.Nsr
 
-            cmi = Rational(config.class_measurement_interval.numerator, config.class_measurement_interval.denominator)
+            cmi = nancy.Rational(config.class_measurement_interval.numerator,
+                                 config.class_measurement_interval.denominator)
 
-            flow_mapping[flow] = NancyFlow(str(flow.id), path, avb_class, config.is_periodic, config.is_worst_case,
-                                           config.max_frame_size, cmi, config.max_interval_frame)
+            flow_mapping[flow] = nancy.Flow(str(flow.id), path, avb_class, config.is_periodic,
+                                            config.is_worst_case, int(self._get_parameter(flow, "max_frame_size")),
+                                            cmi, int(self._get_parameter(flow, "max_interval_frame")))
         cbs.SetFlows(list(flow_mapping.values()))
 
-    def _get_used_links(self) -> list[NancyLink]:
+    def _set_network(self, cbs: nancy.NancyCBS):
+        """
+        Translates the network into a Nancy network with a single call, which receives the parameters of all links
+        and flows as flat arrays.
+
+        :param cbs: empty Nancy network
+        """
+        network = self._compute_args["network"]
+        links = []
+        names, nodes_i, nodes_j, link_parameters = [], [], [], []
+        for edge in network.edges.values():
+            parameters = self._get_link_parameters(edge)
+            for node_i, node_j in ((edge.start, edge.end), (edge.end, edge.start)):
+                links.append((node_i, node_j))
+                names.append(str(edge.id))
+                nodes_i.append(str(node_i.id))
+                nodes_j.append(str(node_j.id))
+                link_parameters.extend(parameters)
+        link_indices = {link: index for index, link in enumerate(links)}
+
+        flows = list(network.flows.values())
+        path_offsets, path_links = [0], []
+        avb_classes, is_periodic, is_worst_case = [], [], []
+        max_frame_sizes, cmi_numerators, cmi_denominators, max_interval_frames = [], [], [], []
+        for flow in flows:
+            config: NancyCBSFlowConfiguration = flow.configurations[self.group_id]
+            path_links.extend(link_indices[link] for link in zip(flow.path, flow.path[1:]))
+            path_offsets.append(len(path_links))
+            avb_classes.append(_AVB_CLASS_ORDINALS.get(config.avb_class.upper(), _AVB_CLASS_ORDINALS["NSR"]))
+            is_periodic.append(bool(config.is_periodic))
+            is_worst_case.append(bool(config.is_worst_case))
+            max_frame_sizes.append(int(self._get_parameter(flow, "max_frame_size")))
+            cmi_numerators.append(config.class_measurement_interval.numerator)
+            cmi_denominators.append(config.class_measurement_interval.denominator)
+            max_interval_frames.append(int(self._get_parameter(flow, "max_interval_frame")))
+
+        cbs.SetNetwork(names, nodes_i, nodes_j, link_parameters, [str(flow.id) for flow in flows], path_offsets,
+                       path_links, avb_classes, is_periodic, is_worst_case, max_frame_sizes, cmi_numerators,
+                       cmi_denominators, max_interval_frames)
+        self._compute_args["link_mapping"] = dict(zip(links, cbs.Links))
+        self._compute_args["flow_mapping"] = dict(zip(flows, cbs.Flows))
+
+    def _load_bounds(self, links: list[tuple[Node, Node]] = None):
+        """
+        Computes the end-to-end delays of the selected flows and the delays and backlogs of the used links with one
+        call to Nancy each, if the Nancy library supports it. Otherwise, they are computed one by one later.
+
+        :param links: links as (node i, node j), defaults to the used links
+        """
+        if (not isinstance(self._compute_args["engine"], _CurveCache)
+                or not hasattr(nancy.NancyCBS, "ComputeLinkBounds")):
+            return
+        network = self._compute_args["network"]
         flow_mapping = self._compute_args["flow_mapping"]
-        used_links = set()
-        flow: NancyFlow
-        for flow in flow_mapping.values():
-            [used_links.add(link) for link in flow.Path]
+        link_mapping = self._compute_args["link_mapping"]
+        curve_cache: _CurveCache = self._compute_args["curve_cache"]
+        flows = [flow_mapping[network.flows[flow_id]] for flow_id in self._compute_args["flow_ids"]]
+        if links is None:
+            links = self._get_used_links()
+        curve_cache.load_bounds([link_mapping[link] for link in links],
+                                [flow for flow in flows if flow.AvbClass != nancy.AvbClass.Nsr])
+
+    def _use_work_unit_results(self):
+        """
+        Prepares the computation from the bounds of a sharded computation, so the network is not translated again.
+        The links and flows are mapped to their IDs, which _WorkUnitBounds uses to look up the bounds.
+        """
+        network = self._compute_args["network"]
+        link_mapping = {}
+        for edge in network.edges.values():
+            for node_i, node_j in ((edge.start, edge.end), (edge.end, edge.start)):
+                link_mapping[node_i, node_j] = node_i.id, node_j.id
+        self._compute_args["link_mapping"] = link_mapping
+        self._compute_args["flow_mapping"] = {flow: flow.id for flow in network.flows.values()}
+        self._compute_args["flow_ids"] = self.flow_ids_of_interest
+        self._compute_args["end_to_end_delays"] = {}
+        self._compute_args["engine"] = _WorkUnitBounds(self._compute_args["work_unit_results"],
+                                                       self._compute_args["engine_summaries"])
+
+    def _get_link_parameters(self, edge: Edge) -> tuple[int, int, int, int, int]:
+        """
+        Returns the parameters of the Nancy links of an edge.
+
+        :param edge: edge object
+        :return: (link speed, idle slope A, send slope A, idle slope B, send slope B) in bit/s
+        """
+        config: NancyCBSEdgeConfiguration = edge.configurations[self.group_id]
+        megabit = 10 ** 6
+        return (int(self._get_parameter(edge, "link_speed") * megabit),
+                int(self._get_parameter(edge, "idle_slope_a") * megabit), int(config.send_slope_a * megabit),
+                int(self._get_parameter(edge, "idle_slope_b") * megabit), int(config.send_slope_b * megabit))
+
+    def _get_parameter(self, component, name):
+        """
+        Returns a parameter of the configuration of an edge or flow, unless it is replaced by a sweep.
+
+        :param component: edge or flow object
+        :param name: attribute name of the parameter
+        :return: parameter value
+        """
+        overrides = self._compute_args.get("overrides", {}).get(component.id, {})
+        if name in overrides:
+            return overrides[name]
+        return getattr(component.configurations[self.group_id], name)
+
+    def _get_previous_links(self) -> dict[tuple[Node, Node], list[tuple[Node, Node]]]:
+        """
+        Returns the links, whose outgoing arrival curves enter a link, like Link.PreviousLinks() in Nancy.
 
+        :return: {(node i, node j): [(node h, node i), ...]}
+        """
         network = self._compute_args["network"]
-        used_links = sorted(
-            used_links,
-            key=lambda link: f"{network.nodes[UUID(link.NodeI)].name}-{network.nodes[UUID(link.NodeJ)].name}")
-        return used_links
+        previous_links = {}
+        for flow in network.flows.values():
+            path = list(zip(flow.path, flow.path[1:]))
+            for link in path:
+                # like Array.IndexOf(), a link passed more than once is mapped to its first position
+                index = path.index(link)
+                if index > 0 and path[index - 1] not in previous_links.setdefault(link, []):
+                    previous_links[link].append(path[index - 1])
+        return previous_links
+
+    def _propagate_arrival_curves(self, links: list[tuple[Node, Node]] = None):
+        """
+        Computes the outgoing arrival curves of all links upstream of the given links in topological order. Nancy
+        keeps these curves, so an incoming arrival curve is afterwards computed from the direct predecessors instead
+        of recursing along the flow paths. The links are evaluated one by one, because Nancy computes the curves of
+        a link lazily without synchronization.
+
+        :param links: links as (node i, node j), defaults to the links of the flows of interest
+        """
+        network = self._compute_args["network"]
+        link_mapping = self._compute_args["link_mapping"]
+        if links is None:
+            links = [link for flow_id in self.flow_ids_of_interest
+                     for link in zip(network.flows[flow_id].path, network.flows[flow_id].path[1:])]
+        previous_links = self._get_previous_links()
+
+        upstream_links = set()
+        stack = list(links)
+        while stack:
+            for previous_link in previous_links.get(stack.pop(), []):
+                if previous_link not in upstream_links:
+                    upstream_links.add(previous_link)
+                    stack.append(previous_link)
+
+        missing = {link: len(previous_links.get(link, [])) for link in upstream_links}
+        next_links = {}
+        for link in upstream_links:
+            for previous_link in previous_links.get(link, []):
+                next_links.setdefault(previous_link, []).append(link)
+        levels = []
+        level = [link for link, count in missing.items() if count == 0]
+        while level:
+            levels.append(level)
+            next_level = []
+            for link in level:
+                for next_link in next_links.get(link, []):
+                    missing[next_link] -= 1
+                    if missing[next_link] == 0:
+                        next_level.append(next_link)
+            level = next_level
+        if sum(len(level) for level in levels) < len(upstream_links):
+            names = sorted(f"{node_i.name}-{node_j.name}" for (node_i, node_j), count in missing.items() if count > 0)
+            raise ValueError(f"Cyclic dependency between the arrival curves of the links: {', '.join(names)}")
+
+        for level in levels:
+            for link in level:
+                for avb_class in (nancy.AvbClass.A, nancy.AvbClass.B):
+                    link_mapping[link].ComputeOutgoingArrivalCurve(avb_class)
+
+    def _select_flows(self):
+        """
+        Selects the flows of interest to analyze. In top-k mode, these are the k class A and B flows with the largest
+        end-to-end delays, ranked by the bounds of _end_to_end_delay_bounds() first.
+        """
+        network = self._compute_args["network"]
+        flow_mapping = self._compute_args["flow_mapping"]
+        engine = self._compute_args["engine"]
+        self._compute_args["end_to_end_delays"] = {}
+        if self.top_k <= 0:
+            self._compute_args["flow_ids"] = self.flow_ids_of_interest
+            return
+
+        flow_ids = [flow_id for flow_id in self.flow_ids_of_interest
+                    if network.flows[flow_id].configurations[self.group_id].avb_class.upper() in ("A", "B")]
+        bounds = self._end_to_end_delay_bounds(flow_ids)
+
+        def compute_delays(candidates):
+            return [engine.end_to_end_delay(flow_mapping[network.flows[flow_id]]) for flow_id in candidates]
+
+        ranking = self._select_top_k(bounds, self.top_k, compute_delays)
+        self._compute_args["flow_ids"] = [flow_id for flow_id, _ in ranking]
+        self._compute_args["end_to_end_delays"] = dict(ranking)
+
+    def _end_to_end_delay_bounds(self, flow_ids) -> dict:
+        """
+        Estimates bounds of the end-to-end delays without Nancy. The delay at a link is at least the latency of its
+        minimal service curve. Upper bounds follow from token bucket arrival curves, which bound the source arrival
+        curves and are propagated along the flows.
+
+        :param flow_ids: IDs of class A and B flows
+        :return: {flow ID: (lower bound, upper bound)} in s
+        """
+        network = self._compute_args["network"]
+        max_frame_size_a, max_frame_size_b = self.max_frame_size_a * 8, self.max_frame_size_b * 8
+        max_frame_size_nsr = self.max_frame_size_nsr * 8
+        max_frame_size_n = max(max_frame_size_b, max_frame_size_nsr)
+
+        parameters = {}
+        for edge in network.edges.values():
+            parameters[edge.start, edge.end] = parameters[edge.end, edge.start] = self._get_link_parameters(edge)
+
+        def service_curve(link, avb_class):
+            # rate and latency of the minimal service curve and burst of the shaping curve (Theorem 3 - 9)
+            link_speed, idle_slope_a, send_slope_a, idle_slope_b, send_slope_b = parameters[link]
+            if avb_class == "A":
+                rate = Fraction(idle_slope_a * link_speed, idle_slope_a - send_slope_a)
+                shaper_latency = (Fraction(max_frame_size_n, link_speed) -
+                                  Fraction(max_frame_size_a * send_slope_a, idle_slope_a * link_speed))
+                latency = shaper_latency if self.is_strict else Fraction(max_frame_size_n, link_speed)
+            else:
+                rate = Fraction(idle_slope_b * link_speed, idle_slope_b - send_slope_b)
+                latency = (Fraction(max_frame_size_nsr + max_frame_size_a, link_speed) -
+                           Fraction(max_frame_size_n * idle_slope_a, link_speed * send_slope_a))
+                shaper_latency = latency - Fraction(max_frame_size_b * send_slope_b, link_speed * idle_slope_b)
+                if self.is_strict:
+                    latency = shaper_latency
+            return rate, latency, rate * shaper_latency
+
+        def source_token_bucket(flow):
+            # token bucket bounding the source arrival curve (Theorem 1 and 2)
+            config: NancyCBSFlowConfiguration = flow.configurations[self.group_id]
+            link_speed = parameters[flow.path[0], flow.path[1]][0]
+            m = self._get_parameter(flow, "max_interval_frame") * self._get_parameter(flow, "max_frame_size") * 8
+            rate = m / Fraction(config.class_measurement_interval)
+            burst = m if config.is_worst_case else max(m * (1 - rate / link_speed), 0)
+            return (burst if config.is_periodic else 2 * burst), rate
+
+        starting_flows = {}
+        for flow in network.flows.values():
+            starting_flows.setdefault((flow.path[0], flow.path[1]), []).append(flow)
+        previous_links = self._get_previous_links()
+
+        incoming = {}
+
+        def incoming_token_bucket(link, avb_class):
+            if (link, avb_class) in incoming:
+                burst_rate = incoming[link, avb_class]
+                # a cyclic dependency can not be bounded
+                return burst_rate if burst_rate is not None else (math.inf, math.inf)
+            incoming[link, avb_class] = None
+            burst, rate = 0, 0
+            for flow in starting_flows.get(link, []):
+                if flow.configurations[self.group_id].avb_class.upper() == avb_class:
+                    flow_burst, flow_rate = source_token_bucket(flow)
+                    burst, rate = burst + flow_burst, rate + flow_rate
+            for previous_link in previous_links.get(link, []):
+                previous_burst, previous_rate = incoming_token_bucket(previous_link, avb_class)
+                service_rate, latency, shaper_burst = service_curve(previous_link, avb_class)
+                if previous_rate <= service_rate:
+                    burst, rate = burst + previous_burst + previous_rate * latency, rate + previous_rate
+                else:
+                    burst, rate = burst + shaper_burst, rate + service_rate
+            incoming[link, avb_class] = burst, rate
+            return burst, rate
+
+        bounds = {}
+        for flow_id in flow_ids:
+            flow = network.flows[flow_id]
+            avb_class = flow.configurations[self.group_id].avb_class.upper()
+            lower, upper = 0, 0
+            for link in zip(flow.path, flow.path[1:]):
+                service_rate, latency, _ = service_curve(link, avb_class)
+                burst, rate = incoming_token_bucket(link, avb_class)
+                lower += latency
+                upper += latency + burst / service_rate if rate <= service_rate else math.inf
+            bounds[flow_id] = lower, upper
+        return bounds
+
+    def _get_used_links(self) -> list[tuple[Node, Node]]:
+        """
+        :return: links passed by flows as (node i, node j), sorted by name
+        """
+        network = self._compute_args["network"]
+        flows = network.flows.values()
+        if self.top_k > 0:
+            # only the links of the selected flows are analyzed
+            flows = [network.flows[flow_id] for flow_id in self._compute_args["flow_ids"]]
+        used_links = {link for flow in flows for link in zip(flow.path, flow.path[1:])}
+        return sorted(used_links, key=lambda link: f"{link[0].name}-{link[1].name}")
 
     def _compute_end_to_end_delays(self):
         """
@@ -269,18 +794,24 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
         result = self._compute_args["result"]
         flow_mapping = self._compute_args["flow_mapping"]
         network = self._compute_args["network"]
+        engine = self._compute_args["engine"]
+
+        delays = self._compute_args["end_to_end_delays"]
 
         delays_a = []
         delays_b = []
         names_a = []
         names_b = []
         result.append_result("End-to-End Delay:")
-        for flow_id in self.flow_ids_of_interest:
+        for flow_id in self._compute_args["flow_ids"]:
             flow = network.flows[flow_id]
-            nancy_flow: NancyFlow = flow_mapping[flow]
-            delay = Fraction(str(nancy_flow.ComputeEndToEndDelay()))
+            if flow_id in delays:
+                delay = delays[flow_id]
+            else:
+                delay = engine.end_to_end_delay(flow_mapping[flow])
             result.append_result(f"{flow.name}: ~{delay.__float__()}s ({delay})", 1)
-            if nancy_flow.AvbClass == AvbClass.A:
+            self._publish("End-to-End Delay (s)", flow.name, delay)
+            if flow.configurations[self.group_id].avb_class.upper() == "A":
                 delays_a.append(delay.__float__())
                 names_a.append(flow.name)
             else:
@@ -290,24 +821,32 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
 
         self._compute_args["e2e"] = names_a, delays_a, names_b, delays_b
 
+        if self.top_k > 0:
+            rows = [(rank, network.flows[flow_id].name, network.flows[flow_id].configurations[self.group_id].avb_class,
+                     f"~{delays[flow_id].__float__()} ({delays[flow_id]})")
+                    for rank, flow_id in enumerate(self._compute_args["flow_ids"], start=1)]
+            result.add_table(["Rank", "Flow", "Class", "End-to-End Delay (s)"], rows,
+                             f"Top {self.top_k} End-to-End Delays")
+
     def _compute_link_delays(self):
         """
         Computes the delays at every link for class A and B flows.
         """
         result = self._compute_args["result"]
-        network: Network = self._compute_args["network"]
+        link_mapping = self._compute_args["link_mapping"]
+        engine = self._compute_args["engine"]
 
         results_a = []
         results_b = []
         names = []
         result_a = ""
         result_b = ""
-        for nancy_link in self._get_used_links():
-            node_i, node_j = network.nodes[UUID(nancy_link.NodeI)], network.nodes[UUID(nancy_link.NodeJ)]
+        for node_i, node_j in self._get_used_links():
+            link = link_mapping[node_i, node_j]
             link_name = f"{node_i.name}-{node_j.name}"
-            delay_a = Fraction(str(nancy_link.ComputeDelay(AvbClass.A)))
+            delay_a = engine.delay(link, "A")
             result_a += f"{link_name}: ~{delay_a.__float__()}s ({delay_a})\n"
-            delay_b = Fraction(str(nancy_link.ComputeDelay(AvbClass.B)))
+            delay_b = engine.delay(link, "B")
             result_b += f"{link_name}: ~{delay_b.__float__()}s ({delay_b})\n"
 
             names.append(link_name)
@@ -326,20 +865,23 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
         Computes backlog bounds at links of class A and B flows.
         """
         result = self._compute_args["result"]
-        network: Network = self._compute_args["network"]
+        link_mapping = self._compute_args["link_mapping"]
+        engine = self._compute_args["engine"]
 
         results_a = []
         results_b = []
         names = []
         result_a = ""
         result_b = ""
-        for nancy_link in self._get_used_links():
-            node_i, node_j = network.nodes[UUID(nancy_link.NodeI)], network.nodes[UUID(nancy_link.NodeJ)]
+        for node_i, node_j in self._get_used_links():
+            link = link_mapping[node_i, node_j]
             link_name = f"{node_i.name}-{node_j.name}"
-            backlog_a = Fraction(str(nancy_link.ComputeBacklog(AvbClass.A)))
+            backlog_a = engine.backlog(link, "A")
             result_a += f"{link_name}: ~{backlog_a.__float__()} bit ({backlog_a})\n"
-            backlog_b = Fraction(str(nancy_link.ComputeBacklog(AvbClass.B)))
+            self._publish("Backlog class A (bit)", link_name, backlog_a)
+            backlog_b = engine.backlog(link, "B")
             result_b += f"{link_name}: ~{backlog_b.__float__()} bit ({backlog_b})\n"
+            self._publish("Backlog class B (bit)", link_name, backlog_b)
 
             names.append(link_name)
             results_a.append(backlog_a)
@@ -422,3 +964,211 @@ class NancyCBSNetworkConfiguration(AbstractNetworkConfiguration):
 
         result = self._compute_args["result"]
         result.add_plot(fig, display_name)
+
+
+# ordinals of the AvbClass enumeration of Nancy
+_AVB_CLASS_ORDINALS = {"A": 0, "B": 1, "NSR": 2}
+
+# names of the AvbClass enumeration of Nancy, which is available once the backend is loaded
+_AVB_CLASS_NAMES = {"A": "A", "B": "B", "NSR": "Nsr"}
+
+
+def _avb_class(avb_class: str) -> nancy.AvbClass:
+    """
+    :param avb_class: "A", "B" or "NSR"
+    :return: member of the AvbClass enumeration of Nancy
+    """
+    return getattr(nancy.AvbClass, _AVB_CLASS_NAMES[avb_class])
+
+
+def _compute_sweep_points(network: Network, configuration_id: UUID, flow_ids: list,
+                          used_links: list[tuple[UUID, UUID]], grid: list[dict]) -> list[tuple[list, list]]:
+    """
+    Computes the bounds of grid points of a sweep in a worker process. AnalyticCBS and NumpyCBS networks are
+    translated once and only their varied parameters are changed, Nancy networks are translated for every grid point.
+
+    :param network: network object
+    :param configuration_id: group ID of the configuration
+    :param flow_ids: IDs of the analyzed flows
+    :param used_links: analyzed links as (start node ID, end node ID)
+    :param grid: {edge or flow ID: {parameter name: value}} for every grid point
+    :return: (end-to-end delays, [class A, class B] backlogs per link) for every grid point
+    """
+    configuration: NancyCBSNetworkConfiguration = network.configurations[configuration_id]
+    configuration._compute_args = {}
+    bounds = []
+    for overrides in grid:
+        if isinstance(configuration._compute_args.get("engine"), AnalyticCBS):
+            configuration._apply_overrides(overrides)
+        else:
+            configuration._compute_args = {"network": network, "overrides": overrides}
+            configuration._make_engine()
+            configuration._compute_args["flow_ids"] = flow_ids
+            configuration._load_bounds()
+        flow_mapping = configuration._compute_args["flow_mapping"]
+        link_mapping = configuration._compute_args["link_mapping"]
+        engine = configuration._compute_args["engine"]
+        delays = [float(engine.end_to_end_delay(flow_mapping[network.flows[flow_id]])) for flow_id in flow_ids]
+        backlogs = []
+        for node_i, node_j in used_links:
+            link = link_mapping[network.nodes[node_i], network.nodes[node_j]]
+            backlogs.append([float(engine.backlog(link, avb_class)) for avb_class in ("A", "B")])
+        bounds.append((delays, backlogs))
+    return bounds
+
+
+def _describe_engine(engine) -> str | None:
+    """
+    :param engine: object computing the bounds
+    :return: note on how the bounds were computed or None
+    """
+    if isinstance(engine, _WorkUnitBounds):
+        return engine.description
+    if isinstance(engine, NumpyCBS):
+        return "Bounds computed with NumPy curves"
+    if isinstance(engine, AnalyticCBS):
+        return "Bounds computed in closed form, all arrival curves are token buckets"
+    return None
+
+
+class _WorkUnitBounds:
+    """
+    Provides the bounds computed by the shards of a sharded computation like an engine. Links are given as (start
+    node ID, end node ID) and flows by their IDs.
+
+    :param work_unit_results: merged results of compute_work_units()
+    :param summaries: (description, cache hits, cache misses) of the engine of every shard
+    """
+
+    def __init__(self, work_unit_results: dict, summaries: list[tuple[str | None, int, int]]):
+        self._values = work_unit_results
+        self.description = summaries[0][0]
+        self.hits = sum(hits for _, hits, _ in summaries)
+        self.misses = sum(misses for _, _, misses in summaries)
+
+    def delay(self, link: tuple[UUID, UUID], avb_class: str) -> Fraction:
+        return self._values["link", link][avb_class][0]
+
+    def backlog(self, link: tuple[UUID, UUID], avb_class: str) -> Fraction:
+        return self._values["link", link][avb_class][1]
+
+    def end_to_end_delay(self, flow: UUID) -> Fraction:
+        return self._values["flow", flow]
+
+
+class _CurveCache:
+    """
+    Keeps the incoming arrival curves, minimal service curves and delays of the links of one Nancy network, so they
+    are computed once for the end-to-end delays, link delays, backlogs and plots.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+
+    def _get(self, key, compute):
+        """
+        Returns a cached value or computes and stores it.
+
+        :param key: hashable key
+        :param compute: function computing the value
+        :return: value
+        """
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = self._values[key] = compute()
+        return value
+
+    def incoming_arrival_curve(self, link: nancy.Link, avb_class: str) -> nancy.Curve:
+        """
+        :param link: Nancy link
+        :param avb_class: "A", "B" or "NSR"
+        :return: sum of the arrival curves of a class entering the link
+        """
+        return self._incoming_arrival_curve(link, _avb_class(avb_class))
+
+    def _incoming_arrival_curve(self, link: nancy.Link, avb_class: nancy.AvbClass) -> nancy.Curve:
+        return self._get(("incoming", link.NodeI, link.NodeJ, avb_class),
+                         lambda: link.ComputeIncomingArrivalCurve(avb_class))
+
+    def minimal_service_curve(self, link: nancy.Link, avb_class: str) -> nancy.Curve:
+        """
+        :param link: Nancy link
+        :param avb_class: "A", "B" or "NSR"
+        :return: minimal service curve of a class at the link
+        """
+        return self._minimal_service_curve(link, _avb_class(avb_class))
+
+    def _minimal_service_curve(self, link: nancy.Link, avb_class: nancy.AvbClass) -> nancy.Curve:
+        return self._get(("service", link.NodeI, link.NodeJ, avb_class),
+                         lambda: link.ComputeMinimalServiceCurve(avb_class))
+
+    def delay(self, link: nancy.Link, avb_class: str) -> Fraction:
+        """
+        Computes the delay bound of a class at a link like Link.ComputeDelay().
+
+        :param link: Nancy link
+        :param avb_class: "A" or "B"
+        :return: delay in s
+        """
+        return self._delay(link, _avb_class(avb_class))
+
+    def _delay(self, link: nancy.Link, avb_class: nancy.AvbClass) -> Fraction:
+        def compute():
+            if avb_class == nancy.AvbClass.Nsr:
+                raise ValueError("Delay of NSR can not be computed.")
+            delay = nancy.Curve.HorizontalDeviation(self._incoming_arrival_curve(link, avb_class),
+                                                    self._minimal_service_curve(link, avb_class))
+            if delay.IsPlusInfinite:
+                # raises the error of Nancy
+                link.ComputeDelay(avb_class)
+            return Fraction(str(delay))
+
+        return self._get(("delay", link.NodeI, link.NodeJ, avb_class), compute)
+
+    def backlog(self, link: nancy.Link, avb_class: str) -> Fraction:
+        """
+        Computes the backlog bound of a class at a link like Link.ComputeBacklog().
+
+        :param link: Nancy link
+        :param avb_class: "A", "B" or "NSR"
+        :return: backlog in bit
+        """
+        avb_class = _avb_class(avb_class)
+        return self._get(("backlog", link.NodeI, link.NodeJ, avb_class),
+                         lambda: Fraction(str(nancy.Curve.VerticalDeviation(
+                             self._incoming_arrival_curve(link, avb_class),
+                             self._minimal_service_curve(link, avb_class)))))
+
+    def end_to_end_delay(self, flow: nancy.Flow) -> Fraction:
+        """
+        Computes the end-to-end delay bound of a flow like Flow.ComputeEndToEndDelay().
+
+        :param flow: Nancy flow
+        :return: end-to-end delay in s
+        """
+        return self._get(("end_to_end", flow.Name),
+                         lambda: sum((self._delay(link, flow.AvbClass) for link in flow.Path), Fraction(0)))
+
+    def load_bounds(self, links: list[nancy.Link], flows: list[nancy.Flow]):
+        """
+        Computes the delays and backlogs of class A and B at links and the end-to-end delays of class A and B flows
+        with one call to Nancy each. The results are returned as numerators and denominators.
+
+        :param links: Nancy links
+        :param flows: Nancy flows of class A or B
+        """
+        flows = [flow for flow in flows if ("end_to_end", flow.Name) not in self._values]
+        values = iter(nancy.NancyCBS.ComputeEndToEndDelays(flows))
+        for flow in flows:
+            self._values["end_to_end", flow.Name] = Fraction(int(next(values)), int(next(values)))
+        values = iter(nancy.NancyCBS.ComputeLinkBounds(links))
+        for link in links:
+            for quantity in ("delay", "backlog"):
+                for avb_class in (nancy.AvbClass.A, nancy.AvbClass.B):
+                    self._values[quantity, link.NodeI, link.NodeJ, avb_class] = Fraction(int(next(values)),
+                                                                                         int(next(values)))
+        self.misses += len(flows) + 4 * len(links)
@@ -0,0 +1,118 @@
+import multiprocessing
+import queue
+import traceback
+from uuid import UUID
+
+from ComputationMethods.NancyComputations import CBS as nancy
+
+
+class NancyPlotSession:
+    """
+    Long-lived process serving the curve plots of a Nancy configuration. The process keeps the translated Nancy
+    network and its cached curves, so plots of further links and flows reuse the curves computed before. The network
+    is only translated again after its parameters changed. Plot requests arriving within batch_delay seconds of each
+    other are shown in one figure.
+
+    :param configuration: Nancy configuration
+    :param batch_delay: seconds to wait for further plot requests before plotting
+    """
+
+    def __init__(self, configuration, batch_delay: float = 0.2):
+        self.configuration = configuration
+        self.batch_delay = batch_delay
+        self._requests = None
+        self._process = None
+        self._network_state = None
+
+    def plot_link(self, edge_id: UUID):
+        """
+        Plots the curves of both links of an edge.
+
+        :param edge_id: ID of the edge
+        """
+        self._send(("link", edge_id))
+
+    def plot_flow(self, flow_id: UUID):
+        """
+        Plots the source arrival curve of a flow.
+
+        :param flow_id: ID of the flow
+        """
+        self._send(("flow", flow_id))
+
+    def close(self, timeout: float = 5.0):
+        """
+        Stops the process of the session.
+
+        :param timeout: seconds to wait for the process
+        """
+        if self._process is not None and self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout)
+        self._process = None
+        self._network_state = None
+
+    def _send(self, request: tuple[str, UUID]):
+        """
+        Sends a plot request to the process of the session. The process is started on the first request and the
+        network is sent again, if its parameters changed since the last request.
+
+        :param request: (kind, ID of the edge or flow)
+        """
+        if self._process is None or not self._process.is_alive():
+            context = multiprocessing.get_context("spawn")
+            self._requests = context.Queue()
+            self._process = context.Process(target=_run_session, args=(self._requests, self.batch_delay),
+                                            daemon=True)
+            self._process.start()
+            self._network_state = None
+        network_state = self.configuration.get_network_state()
+        if network_state != self._network_state:
+            self._requests.put(("network", self.configuration))
+            self._network_state = network_state
+        self._requests.put(request)
+
+
+def _run_session(requests: multiprocessing.Queue, batch_delay: float):
+    """
+    Serves plot requests until None is received.
+
+    :param requests: queue of ("network", configuration), ("link", edge ID) and ("flow", flow ID)
+    :param batch_delay: seconds to wait for further plot requests before plotting
+    """
+    configuration = None
+    is_running = True
+    while is_running:
+        batch = [requests.get()]
+        while batch[-1] is not None:
+            try:
+                batch.append(requests.get(timeout=batch_delay))
+            except queue.Empty:
+                break
+        if batch[-1] is None:
+            batch.pop()
+            is_running = False
+
+        curves = []
+        names = []
+        for kind, payload in batch:
+            try:
+                if kind == "network":
+                    configuration = payload
+                    configuration.open_plot_model()
+                elif kind == "link":
+                    link_curves, link_names = configuration.get_link_curves(
+                        configuration.associated_component.edges[payload])
+                    curves.extend(link_curves)
+                    names.extend(link_names)
+                else:
+                    curves.append(configuration.get_flow_source_ac(configuration.associated_component.flows[payload]))
+                    names.append(f"Arrival Curve {configuration.associated_component.flows[payload].name}")
+            except Exception:
+                # keeps the session alive for further requests, e.g. after a component was removed
+                traceback.print_exc()
+        if curves:
+            try:
+                nancy.Plot.PythonPlot(curves, names)
+            except Exception:
+                traceback.print_exc()
@@ -1,5 +1,4 @@
 import pathlib
-import shutil
 import tempfile
 from typing import Type
 
@@ -7,6 +6,9 @@ import numpy as np
 import scienceplots
 from matplotlib import pyplot as plt
 
+from ComputationMethods.NumpyCBS import NumpyWrapper
+from ComputationMethods.RTCToolboxCBS.CBSInterface import CBSInterface
+from ComputationMethods.RTCToolboxCBS.MatlabEnginePool import get_engine_pool
 from ComputationMethods.RTCToolboxCBS.MatlabWrapper import MatlabWrapper
 from Model import Result
 from Model.ComputationConfigurations.ConfigurationTemplate.AbstractNetworkConfiguration import \
@@ -23,14 +25,20 @@ from Model.Network import Network
 class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
 
     def __init__(self, max_frame_size_a: int = 64, max_frame_size_b: int = 1522, max_frame_size_nsr: int = 1522,
-                 is_strict: bool = False, save_matlab_plots=False, **kwargs):
+                 is_strict: bool = False, save_matlab_plots=False, engine: str = "RTC Toolbox",
+                 matlab_plot_names: list[str] = None, **kwargs):
         super().__init__(**kwargs)
+        if matlab_plot_names is None:
+            matlab_plot_names = []
+        self.engine: str = engine
         self.max_frame_size_a: int = max_frame_size_a
         self.max_frame_size_b: int = max_frame_size_b
         self.max_frame_size_nsr: int = max_frame_size_nsr
         self.is_strict: bool = is_strict
 
         self.save_matlab_plots = save_matlab_plots
+        # names of the links and flows, whose curves are plotted, all used links are plotted if it is empty
+        self.matlab_plot_names: list[str] = matlab_plot_names
 
     @staticmethod
     def get_configuration_information() -> str:
@@ -60,7 +68,8 @@ class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
     def to_serializable_dict(self) -> dict:
         own_dict = {"save_matlab_plots": self.save_matlab_plots, "max_frame_size_a": self.max_frame_size_a,
                     "max_frame_size_b": self.max_frame_size_b, "max_frame_size_nsr": self.max_frame_size_nsr,
-                    "is_strict": self.is_strict}
+                    "is_strict": self.is_strict, "engine": self.engine,
+                    "matlab_plot_names": self.matlab_plot_names}
         return super().to_serializable_dict() | own_dict
 
     @staticmethod
@@ -68,13 +77,17 @@ class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
         own_dict = {"save_matlab_plots": json_dict["save_matlab_plots"],
                     "max_frame_size_a": json_dict["max_frame_size_a"],
                     "max_frame_size_b": json_dict["max_frame_size_b"],
-                    "max_frame_size_nsr": json_dict["max_frame_size_nsr"], "is_strict": json_dict["is_strict"]}
+                    "max_frame_size_nsr": json_dict["max_frame_size_nsr"], "is_strict": json_dict["is_strict"],
+                    "engine": json_dict.get("engine", "RTC Toolbox"),
+                    "matlab_plot_names": json_dict.get("matlab_plot_names", [])}
         return AbstractNetworkConfiguration.to_constructor_dict(json_dict, model, network) | own_dict
 
     def make_parameter_dict(self):
         own_dict = {"save matlab plots": self.save_matlab_plots, "max. frame size A (Byte)": self.max_frame_size_a,
                     "max. frame size B (Byte)": self.max_frame_size_b,
-                    "max. frame size NSR (Byte)": self.max_frame_size_nsr, "is strict": self.is_strict}
+                    "max. frame size NSR (Byte)": self.max_frame_size_nsr, "is strict": self.is_strict,
+                    "engine (RTC Toolbox/NumPy)": self.engine,
+                    "matlab plots of (link/flow names)": ", ".join(self.matlab_plot_names)}
         return super().make_parameter_dict() | own_dict
 
     def update_parameter_dict(self, dictionary):
@@ -93,6 +106,12 @@ class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
             raise ValueError("No negative Frame Size allowed")
         self.max_frame_size_nsr = value
 
+        engines = {"rtc toolbox": "RTC Toolbox", "numpy": "NumPy"}
+        value = str(dictionary["engine (RTC Toolbox/NumPy)"]).lower()
+        if value not in engines:
+            raise ValueError(f"Unknown engine: {value}")
+        self.engine = engines[value]
+
         true_values = ['true', '1', 't', 'y', 'yes']
         false_values = ['false', '0', 'f', 'n', 'no']
         value = str(dictionary["is strict"]).lower()
@@ -113,56 +132,80 @@ class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
             raise ValueError(f"Wrong input, allowed are: {true_values} or {false_values}")
         self.save_matlab_plots = value
 
+        names = [name.strip() for name in str(dictionary["matlab plots of (link/flow names)"]).split(",")]
+        names = [name for name in names if name]
+        network = self.model.network
+        known_names = {flow.name for flow in network.flows.values()}
+        for edge in network.edges.values():
+            known_names.update((f"{edge.start.name}-{edge.end.name}", f"{edge.end.name}-{edge.start.name}"))
+        for name in names:
+            if name not in known_names:
+                raise ValueError(f"Unknown link or flow: {name}")
+        self.matlab_plot_names = names
+
         return super().update_parameter_dict(dictionary)
 
+    def prepare_computation(self):
+        if self.engine == "RTC Toolbox":
+            # starts MATLAB in the background, the worker processes connect to its shared session
+            get_engine_pool().warm()
+
+    def is_result_cacheable(self) -> bool:
+        # the MATLAB plots are saved as files by every computation
+        return not self.save_matlab_plots
+
     def compute(self, network: Network, result: Result):
         plt.style.use(["science"])
         plt.rcParams.update({'figure.dpi': '150'})
         _ = scienceplots.inode  # avoid unused import warning
 
-        self._compute_args["matlab"] = matlab = MatlabWrapper()
+        if self.engine == "NumPy":
+            self._compute_args["matlab"] = matlab = NumpyWrapper()
+        else:
+            self._compute_args["matlab"] = matlab = MatlabWrapper()
+            matlab._get_engine()
         self._compute_args["result"] = result
         self._compute_args["network"] = network
-        self._compute_args["tmp_dir"] = tempfile.gettempdir()
+        # without plots nothing is written to the disk
+        self._compute_args["tmp_dir"] = tempfile.gettempdir() if self.save_matlab_plots else ""
         tmp_dir_path = pathlib.Path(tempfile.gettempdir()).joinpath(str(result.id))
-        tmp_dir_path.mkdir()
-
-        matlab._get_engine()
-        result.set_start_time()
-        self._make_matlab_objects()
-        self._compute_end_to_end_delays()
-        self._compute_link_delays()
-        self._compute_link_backlogs()
-        result.set_end_time()
+        if self.save_matlab_plots:
+            tmp_dir_path.mkdir()
+
+        try:
+            result.set_start_time()
+            self._make_matlab_objects()
+            self._analyze_network()
+            self._compute_end_to_end_delays()
+            self._compute_link_delays()
+            self._compute_link_backlogs()
+            result.set_end_time()
+        finally:
+            # returns the engine to the pool
+            matlab.exit()
         self._make_plots()
 
         if self.save_matlab_plots:
             result.append_result(f"\nCurve plots are saved at:\n{tmp_dir_path}\n")
-        else:
-            shutil.rmtree(tmp_dir_path, ignore_errors=True)
-        matlab.exit()
 
     def _make_matlab_objects(self):
         """
-        Translates the current network into a MATLAB network.
+        Translates the current network into rows of links and flows, which are sent to MATLAB at once.
         """
-        matlab: MatlabWrapper = self._compute_args["matlab"]
         self._compute_args["link_mapping"] = link_mapping = {}
+        self._compute_args["links"] = links = []
         megabit = 10 ** 6
         for edge in self.associated_component.edges.values():
             configuration: RTCToolboxCBSEdgeConfiguration = edge.configurations[self.group_id]
-            link_mapping[edge.start, edge.end] = matlab.Link(
-                f"{edge.start.name}-{edge.end.name}", edge.start.name, edge.end.name,
-                configuration.link_speed * megabit, configuration.idle_slope_a * megabit,
-                configuration.send_slope_a * megabit, configuration.idle_slope_b * megabit,
-                configuration.send_slope_b * megabit)
-            link_mapping[edge.end, edge.start] = matlab.Link(
-                f"{edge.end.name}-{edge.start.name}", edge.end.name, edge.start.name,
-                configuration.link_speed * megabit, configuration.idle_slope_a * megabit,
-                configuration.send_slope_a * megabit, configuration.idle_slope_b * megabit,
-                configuration.send_slope_b * megabit)
+            for node_i, node_j in ((edge.start, edge.end), (edge.end, edge.start)):
+                link_mapping[node_i, node_j] = len(links)
+                links.append([f"{node_i.name}-{node_j.name}", node_i.name, node_j.name,
+                              configuration.link_speed * megabit, configuration.idle_slope_a * megabit,
+                              configuration.send_slope_a * megabit, configuration.idle_slope_b * megabit,
+                              configuration.send_slope_b * megabit])
 
         self._compute_args["flow_mapping"] = flow_mapping = {}
+        self._compute_args["flows"] = flows = []
         for flow in self.associated_component.flows.values():
             path = []
             for index, node_i in enumerate(flow.path):
@@ -171,35 +214,63 @@ class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
                 node_j = flow.path[index + 1]
                 path.append(link_mapping[node_i, node_j])
             configuration: RTCToolboxCBSFlowConfiguration = flow.configurations[self.group_id]
-            flow_mapping[flow] = matlab.Flow(
-                flow.name, configuration.max_frame_size, configuration.class_measurement_interval,
-                configuration.max_interval_frame, path, configuration.avb_class,
-                "p" if configuration.is_periodic else "np", "wc" if configuration.is_worst_case else "nwc")
+            flow_mapping[flow] = len(flows)
+            flows.append([flow.name, configuration.max_frame_size, configuration.class_measurement_interval,
+                          configuration.max_interval_frame, path, configuration.avb_class,
+                          "p" if configuration.is_periodic else "np", "wc" if configuration.is_worst_case else "nwc"])
 
-        m_flows = list(flow_mapping.values())
-        self._compute_args["cbs"] = matlab.CBS(
-            self.max_frame_size_a, self.max_frame_size_b, self.max_frame_size_nsr, self.is_strict, m_flows)
+    def _analyze_network(self):
+        """
+        Computes the end-to-end delays of the flows of interest and the delays and backlogs of the used links with a
+        single call.
+        """
+        result = self._compute_args["result"]
+        network = self._compute_args["network"]
+        matlab: CBSInterface = self._compute_args["matlab"]
+        flow_mapping = self._compute_args["flow_mapping"]
+        link_mapping = self._compute_args["link_mapping"]
+
+        flow_indices = [flow_mapping[network.flows[flow_id]] for flow_id in self.flow_ids_of_interest]
+        link_indices = [link_mapping[used_link] for used_link in self._get_used_links()]
+        plot_flow_indices, plot_link_indices = self._get_plot_indices(link_indices)
+        e2e_delays, link_delays, link_backlogs = matlab.analyze_network(
+            self.max_frame_size_a, self.max_frame_size_b, self.max_frame_size_nsr, self.is_strict,
+            self._compute_args["links"], self._compute_args["flows"], flow_indices, link_indices,
+            self._compute_args["tmp_dir"], str(result.id), plot_flow_indices, plot_link_indices)
+        self._compute_args["bounds"] = e2e_delays, link_delays, link_backlogs
+
+    def _get_plot_indices(self, link_indices: list[int]) -> tuple[list[int], list[int]]:
+        """
+        Returns the flows and links, whose curves are plotted.
+
+        :param link_indices: indices of the used links
+        :return: indices of the plotted flows and links
+        """
+        if not self.save_matlab_plots:
+            return [], []
+        if not self.matlab_plot_names:
+            return [], link_indices
+        flows = self._compute_args["flows"]
+        links = self._compute_args["links"]
+        plot_flow_indices = [index for index, row in enumerate(flows) if row[0] in self.matlab_plot_names]
+        plot_link_indices = [index for index, row in enumerate(links) if row[0] in self.matlab_plot_names]
+        return plot_flow_indices, plot_link_indices
 
     def _compute_end_to_end_delays(self):
         """
-        Computes the end-to-end delays for every flow of interest.
+        Adds the end-to-end delays of the flows of interest to the result.
         """
         result = self._compute_args["result"]
         result.append_result("End-to-End Delay:")
-        tmp_dir = self._compute_args["tmp_dir"]
         network = self._compute_args["network"]
-        matlab: MatlabWrapper = self._compute_args["matlab"]
-        flow_mapping = self._compute_args["flow_mapping"]
-        cbs = self._compute_args["cbs"]
+        e2e_delays, _, _ = self._compute_args["bounds"]
 
         delays_a = []
         names_a = []
         delays_b = []
         names_b = []
-        for flow_id in self.flow_ids_of_interest:
+        for flow_id, delay in zip(self.flow_ids_of_interest, e2e_delays):
             flow = network.flows[flow_id]
-            m_flow = flow_mapping[flow]
-            delay = matlab.end_to_end_delay(cbs, m_flow, tmp_dir, str(result.id))
             result.append_result(f"{flow.name}: {delay}s", 1)
 
             if flow.configurations[self.group_id].avb_class == "A":
@@ -214,25 +285,19 @@ class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
 
     def _compute_link_delays(self):
         """
-        Computes the delay at links of class A and B flows.
+        Adds the delays at links of class A and B flows to the result.
         """
         result = self._compute_args["result"]
-        tmp_dir = self._compute_args["tmp_dir"]
-        cbs = self._compute_args["cbs"]
-        matlab: MatlabWrapper = self._compute_args["matlab"]
-        link_mapping = self._compute_args["link_mapping"]
+        _, link_delays, _ = self._compute_args["bounds"]
 
         results_a = []
         results_b = []
         names = []
         result_a = ""
         result_b = ""
-        for (node_i, node_j) in self._get_used_links():
-            link = link_mapping[node_i, node_j]
+        for (node_i, node_j), (delay_a, delay_b) in zip(self._get_used_links(), link_delays):
             link_name = f"{node_i.name}-{node_j.name}"
-            delay_a = matlab.delay_link(cbs, link, "A", tmp_dir, str(result.id))
             result_a += f"{link_name}: {delay_a}s\n"
-            delay_b = matlab.delay_link(cbs, link, "B", tmp_dir, str(result.id))
             result_b += f"{link_name}: {delay_b}s\n"
 
             names.append(link_name)
@@ -248,25 +313,19 @@ class RTCToolboxCBSNetworkConfiguration(AbstractNetworkConfiguration):
 
     def _compute_link_backlogs(self):
         """
-        Computes backlog bounds of links of class A and B flows.
+        Adds the backlog bounds of links of class A and B flows to the result.
         """
         result = self._compute_args["result"]
-        tmp_dir = self._compute_args["tmp_dir"]
-        cbs = self._compute_args["cbs"]
-        matlab: MatlabWrapper = self._compute_args["matlab"]
-        link_mapping = self._compute_args["link_mapping"]
+        _, _, link_backlogs = self._compute_args["bounds"]
 
         results_a = []
         results_b = []
         names = []
         result_a = ""
         result_b = ""
-        for (node_i, node_j) in self._get_used_links():
-            link = link_mapping[node_i, node_j]
+        for (node_i, node_j), (backlog_a, backlog_b) in zip(self._get_used_links(), link_backlogs):
             link_name = f"{node_i.name}-{node_j.name}"
-            backlog_a = matlab.backlog_link(cbs, link, "A", tmp_dir, str(result.id))
             result_a += f"{link_name}: {backlog_a} bit\n"
-            backlog_b = matlab.backlog_link(cbs, link, "B", tmp_dir, str(result.id))
             result_b += f"{link_name}: {backlog_b} bit\n"
 
             names.append(link_name)
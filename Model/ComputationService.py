@@ -0,0 +1,230 @@
+import atexit
+import multiprocessing
+import queue
+import threading
+from typing import Callable
+
+from matplotlib import pyplot as plt
+
+from Model.Result import Result, CanceledError
+
+
+def _initialize_worker():
+    """
+    Imports the computation backends once per worker process, so computations do not pay for the imports.
+    """
+    import networkx
+    import scienceplots
+    import Model.ComputationConfigurations
+    _ = networkx, scienceplots, Model.ComputationConfigurations  # avoid unused import warning
+
+
+def _run_task(cancel_event, stream, function: Callable, args: tuple):
+    """
+    Runs a task in a worker process. Results passed to the task check the cancel event whenever they are changed and
+    send their partial results to the stream.
+
+    :param cancel_event: event of the computation, which is set when it is canceled
+    :param stream: queue for partial results or None
+    :param function: function to call
+    :param args: arguments of the function
+    :return: return value of the function
+    """
+    results = [arg for arg in args if isinstance(arg, Result)]
+    for result in results:
+        result.cancel_event = cancel_event
+        result.stream = stream
+    try:
+        if cancel_event.is_set():
+            raise CanceledError("Computation canceled")
+        return function(*args)
+    finally:
+        for result in results:
+            result.flush_stream()
+            result.cancel_event = None
+            result.stream = None
+        # the figures stay in the results, but a long-lived worker must not keep them
+        plt.close("all")
+
+
+class ComputationService:
+    """
+    Keeps a pool of warm worker processes for computations. The workers are started once with all computation
+    backends imported and are reused by later computations. Canceled computations are stopped cooperatively: pending
+    tasks are skipped and running tasks stop at the next change of their result, so the workers stay alive. Partial
+    results of running tasks are streamed to the main process and delivered by pump_updates().
+
+    :param number_of_workers: number of worker processes, defaults to the number of CPUs
+    """
+
+    def __init__(self, number_of_workers: int = None):
+        self.number_of_workers = number_of_workers or multiprocessing.cpu_count()
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._pool = None
+        # pools replaced by resize(), which finish their tasks
+        self._retired_pools = []
+        self._manager = None
+        self._stream = None
+        self._tasks = {}
+        self._cancel_events = {}
+        self._update_callbacks = {}
+
+    def warm(self):
+        """
+        Starts the worker processes in the background.
+        """
+        threading.Thread(target=self._get_pool, daemon=True).start()
+
+    def submit(self, key, function: Callable, args: tuple, callback: Callable = None,
+               error_callback: Callable = None, update_callback: Callable = None):
+        """
+        Runs a function in a worker process.
+
+        :param key: hashable key of the computation, the task belongs to
+        :param function: picklable function
+        :param args: picklable arguments of the function
+        :param callback: called in the main process with the return value
+        :param error_callback: called in the main process with the exception
+        :param update_callback: called by pump_updates() with the ID of a result passed to the task and a list of
+                                partial results, None does not stream partial results
+        """
+        pool = self._get_pool()
+        with self._lock:
+            if key not in self._cancel_events:
+                self._cancel_events[key] = self._manager.Event()
+            cancel_event = self._cancel_events[key]
+            stream = None
+            if update_callback is not None:
+                stream = self._stream
+                for arg in args:
+                    if isinstance(arg, Result):
+                        self._update_callbacks[arg.id] = key, update_callback
+            self._tasks.setdefault(key, []).append(
+                pool.apply_async(_run_task, (cancel_event, stream, function, args), callback=callback,
+                                 error_callback=error_callback))
+
+    def pump_updates(self, max_batches: int = 100) -> int:
+        """
+        Delivers the partial results streamed by the workers to the update callbacks of their tasks. Has to be called
+        periodically by the thread handling the updates, e.g. the GUI thread.
+
+        :param max_batches: maximal number of batches to deliver, so the calling thread is not blocked for long
+        :return: number of delivered batches
+        """
+        stream = self._stream
+        count = 0
+        while stream is not None and count < max_batches:
+            try:
+                result_id, updates = stream.get_nowait()
+            except (queue.Empty, EOFError, OSError):
+                # the stream is empty or was closed with the pool
+                break
+            count += 1
+            with self._lock:
+                _, update_callback = self._update_callbacks.get(result_id, (None, None))
+            if update_callback is not None:
+                update_callback(result_id, updates)
+        return count
+
+    def wait(self, key):
+        """
+        Waits for all tasks of a computation and forgets the computation. Tasks submitted by the callbacks of its
+        tasks are waited for as well.
+
+        :param key: key of the computation
+        """
+        while True:
+            with self._lock:
+                # a callback runs before its task is ready, so follow-up tasks are known at this point
+                pending = [task for task in self._tasks.get(key, []) if not task.ready()]
+            if not pending:
+                break
+            for task in pending:
+                task.wait()
+        with self._lock:
+            self._tasks.pop(key, None)
+            self._cancel_events.pop(key, None)
+            self._update_callbacks = {result_id: key_callback for result_id, key_callback
+                                      in self._update_callbacks.items() if key_callback[0] != key}
+
+    def cancel(self, key):
+        """
+        Cancels the tasks of a computation cooperatively.
+
+        :param key: key of the computation
+        """
+        with self._lock:
+            cancel_event = self._cancel_events.get(key)
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def resize(self, number_of_workers: int):
+        """
+        Changes the number of worker processes. New tasks are run by a new pool, the current workers finish their
+        tasks and stop afterwards. Running computations are not interrupted and can still be canceled.
+
+        :param number_of_workers: number of worker processes
+        """
+        with self._lock:
+            if number_of_workers == self.number_of_workers:
+                return
+            self.number_of_workers = number_of_workers
+            pool, self._pool = self._pool, None
+            if pool is not None:
+                # does not wait for the tasks
+                pool.close()
+                self._retired_pools.append(pool)
+        if pool is not None:
+            threading.Thread(target=self._join_retired_pool, args=(pool,), daemon=True).start()
+
+    def _join_retired_pool(self, pool):
+        """
+        Waits in a background thread until a pool replaced by resize() has finished its tasks.
+        """
+        pool.join()
+        with self._lock:
+            if pool in self._retired_pools:
+                self._retired_pools.remove(pool)
+
+    def close(self):
+        """
+        Stops the worker processes after their current tasks.
+        """
+        with self._lock:
+            pools = self._retired_pools + ([self._pool] if self._pool is not None else [])
+            self._pool = None
+            self._retired_pools = []
+            manager, self._manager = self._manager, None
+            self._stream = None
+        for pool in pools:
+            pool.close()
+            pool.join()
+        if manager is not None:
+            manager.shutdown()
+
+    def _get_pool(self):
+        """
+        :return: the pool, which is started on first use
+        """
+        with self._lock:
+            if self._manager is None:
+                self._manager = self._context.Manager()
+                self._stream = self._manager.Queue()
+            if self._pool is None:
+                self._pool = self._context.Pool(processes=self.number_of_workers, initializer=_initialize_worker)
+            return self._pool
+
+
+_computation_service: ComputationService | None = None
+
+
+def get_computation_service() -> ComputationService:
+    """
+    :return: the computation service of this process
+    """
+    global _computation_service
+    if _computation_service is None:
+        _computation_service = ComputationService()
+        atexit.register(_computation_service.close)
+    return _computation_service
@@ -7,28 +7,41 @@ if OS.Linux:
     matplotlib.use("agg")
 import json
 import math
-import multiprocessing
 import random
-from multiprocessing import Pool
-from threading import Thread
+from threading import Lock, Thread
 from typing import Union, Callable
 from uuid import UUID
 
 import networkx
+import numpy as np
 
 from Model.Computation import Computation
+from Model.ComputationService import ComputationService, get_computation_service
 from Model.GraphLayoutAlgorithm import GraphLayoutAlgorithm
 from Model.Network.Edge import Edge
 from Model.Network.Flow import Flow
 from Model.Network.Network import Network
 from Model.Network.Node import Node
+from Model.NetworkSnapshot import NetworkSnapshot
+from Model.ParameterSweep import sweep
 from Model.Result import Result
+from Model.ResultCache import ResultCache, get_result_cache
 from utils import utils
 
+# smaller shards spend more time on translating the network than on computing their work units
+_MIN_WORK_UNITS_PER_SHARD = 16
+
 
 class ModelFacade:
-    def __init__(self, network: Network = None):
-        self.computation_pools = {}
+    def __init__(self, network: Network = None, computation_service: ComputationService = None,
+                 result_cache: ResultCache = None):
+        if computation_service is None:
+            computation_service = get_computation_service()
+        if result_cache is None:
+            result_cache = get_result_cache()
+        self.computation_service = computation_service
+        self.result_cache = result_cache
+        self.running_computations = set()
         self.pending_results = {}
         if network is None:
             network = Network(model=self)
@@ -343,11 +356,14 @@ class ModelFacade:
         flow.highlight_color = highlight_color
         flow.notify((flow, "set_parameter"))
 
-    def run_computation(self, number_of_workers=None) -> Computation:
+    def run_computation(self, number_of_workers=None, stream_updates=False, use_result_cache=True) -> Computation:
         """
         Runs the computation with the current configurations.
 
         :param number_of_workers: number of processes
+        :param stream_updates: whether the results receive partial results while they are computed, which requires
+                               calling pump_updates() of the computation service periodically
+        :param use_result_cache: whether results of unchanged configurations are taken from the result cache
         :return: instance of a computation
         """
         active_configurations = list(filter(lambda c: c.is_active, self.network.configurations.values()))
@@ -356,47 +372,228 @@ class ModelFacade:
         if len(active_configurations) == 0 or not self.network.flows:
             raise ValueError("No active configuration or no flows")
 
+        computation = Computation()
+
+        def on_result(pickled_result, cache_key):
+            if computation.is_canceled:
+                # the task finished before it noticed the cancellation
+                self.pending_results.pop(pickled_result.id, None)
+            else:
+                if cache_key is not None:
+                    self.result_cache.put(cache_key, pickled_result)
+                self._notify_result(pickled_result)
+
+        def make_result_callback(cache_key):
+            return lambda pickled_result: on_result(pickled_result, cache_key)
+
         def on_error(error, error_result):
+            # several shards of a configuration can fail, the result is only reported once
+            if self.pending_results.pop(error_result.id, None) is None or computation.is_canceled:
+                return
             error_result.error()
             self.notify_error(error)
 
         def make_error_callback(error_result):
             return lambda error: on_error(error, error_result)
 
-        if number_of_workers is None:
-            process_count = min(multiprocessing.cpu_count(), len(active_configurations))
-        else:
-            process_count = number_of_workers
-        computation = Computation()
-        if OS.Linux:
-            try:
-                multiprocessing.set_start_method('spawn')
-            except RuntimeError:
-                pass
-        self.computation_pools[computation] = pool = Pool(processes=process_count)
+        def on_update(result_id, updates):
+            updated_result = self.pending_results.get(result_id)
+            if updated_result is not None and not computation.is_canceled:
+                updated_result.receive_updates(updates)
+
+        update_callback = on_update if stream_updates else None
+
+        if number_of_workers is not None:
+            self.computation_service.resize(number_of_workers)
+        self.running_computations.add(computation)
+        # the network is serialized once per configuration, the tasks only refer to the snapshot
+        snapshot = NetworkSnapshot(self.network)
+        cached_results = []
         for configuration in active_configurations:
             result = Result(configuration_name=configuration.name, configuration_id=configuration.group_id)
             self.pending_results[result.id] = result
             computation.add_result(result)
 
-            pool.apply_async(self._compute_configuration, (configuration, result),
-                             callback=self._notify_result,
-                             error_callback=make_error_callback(result))
+            cache_key = None
+            if use_result_cache and configuration.is_result_cacheable():
+                cache_key = self.result_cache.make_key(self.network, configuration)
+                cached_result = self.result_cache.get(cache_key, result)
+                if cached_result is not None:
+                    cached_results.append(cached_result)
+                    continue
+
+            configuration.prepare_computation()
+            shards = self._make_shards(configuration.get_work_units(self.network))
+            if shards is None:
+                self.computation_service.submit(computation.id, ModelFacade._compute_configuration,
+                                                (snapshot.get_path(configuration.group_id), configuration.group_id,
+                                                 result),
+                                                callback=make_result_callback(cache_key),
+                                                error_callback=make_error_callback(result),
+                                                update_callback=update_callback)
+            else:
+                self._submit_shards(computation, snapshot, configuration.group_id, result, shards,
+                                    make_result_callback(cache_key), make_error_callback(result), update_callback)
         computation.start()
         self.network.notify((computation, "computation_started"))
-        Thread(target=lambda: (pool.close(), pool.join(), self._end_computation(computation))).start()
+        for cached_result in cached_results:
+            self._notify_result(cached_result)
+        Thread(target=lambda: (self.computation_service.wait(computation.id), snapshot.close(),
+                               self._end_computation(computation))).start()
         return computation
 
-    def _compute_configuration(self, configuration, result: Result):
+    def check_admission(self, path: list[Node], flow_params: dict, deadline: float, configuration=None):
+        """
+        Checks whether a flow can be added to the network without exceeding its deadline or the deadline of another
+        flow. Neither the network nor the results are changed.
+
+        :param path: path of the flow
+        :param flow_params: flow parameters as expected by the check_admission method of the configuration
+        :param deadline: maximal end-to-end delay of the flow in s
+        :param configuration: configuration object supporting admission control, defaults to the first one
+        :return: (whether the flow can be admitted, {flow ID or None for the new flow: (end-to-end delay, deadline)})
+        """
+        try:
+            if configuration is None:
+                configurations = [c for c in self.network.configurations.values() if hasattr(c, "check_admission")]
+                if not configurations:
+                    raise ValueError("No configuration supports admission control")
+                configuration = configurations[0]
+            return configuration.check_admission(self.network, path, flow_params, deadline)
+        except Exception as e:
+            self.notify_error(e)
+            raise e
+
+    def run_sweep(self, configuration, axes: list[tuple], file_path: str = None, number_of_workers=None) -> tuple:
         """
-        Computes a configuration.
+        Computes the bounds of a configuration for every combination of parameter values. The network is not changed.
 
         :param configuration: configuration object
+        :param axes: one or two (parameter name, IDs of the edges or flows, values), see ParameterSweep.sweep()
+        :param file_path: optional path of a .npz file to export the arrays to
+        :param number_of_workers: number of processes, if the configuration evaluates grid points in parallel
+        :return: (NumPy arrays as returned by ParameterSweep.sweep(), result object with a table and heatmaps)
+        """
+        try:
+            result = Result(configuration_name=f"{configuration.name} (sweep)", configuration_id=configuration.group_id)
+            result.start()
+            arrays = sweep(configuration, self.network, axes, result, number_of_workers)
+            result.finish()
+            if file_path is not None:
+                np.savez(file_path, **arrays)
+            return arrays, result
+        except Exception as e:
+            self.notify_error(e)
+            raise e
+
+    def _make_shards(self, work_units: list | None) -> list[list] | None:
+        """
+        Splits the work units of a configuration into one shard per worker process. Every shard needs its own copy of
+        the computation model, so small configurations are not split.
+
+        :param work_units: work units of the configuration or None
+        :return: list of shards or None, if the configuration is computed as a whole
+        """
+        if work_units is None:
+            return None
+        number_of_shards = min(self.computation_service.number_of_workers,
+                               len(work_units) // _MIN_WORK_UNITS_PER_SHARD)
+        if number_of_shards < 2:
+            return None
+        # consecutive units share more upstream links than interleaved ones
+        size, remainder = divmod(len(work_units), number_of_shards)
+        shards = []
+        for index in range(number_of_shards):
+            start = index * size + min(index, remainder)
+            shards.append(work_units[start:start + size + (index < remainder)])
+        return shards
+
+    def _submit_shards(self, computation: Computation, snapshot: NetworkSnapshot, configuration_id: UUID,
+                       result: Result, shards: list[list], callback: Callable, error_callback: Callable,
+                       update_callback: Callable = None):
+        """
+        Computes the shards of a configuration in parallel. After the last shard, a final task merges their results
+        into the result object.
+
+        :param computation: computation object
+        :param snapshot: network snapshot, which is kept until the computation ends
+        :param configuration_id: group ID of the configuration
+        :param result: result object of the configuration
+        :param shards: lists of work units
+        :param callback: called with the merged result
+        :param error_callback: called with the exception of a failed task
+        :param update_callback: called with streamed partial results, None does not stream them
+        """
+        snapshot_path = snapshot.get_path(configuration_id)
+        partial_results = [None] * len(shards)
+        remaining = [len(shards)]
+        lock = Lock()
+
+        def on_partial_result(index, partial_result):
+            with lock:
+                partial_results[index] = partial_result
+                remaining[0] -= 1
+                is_complete = remaining[0] == 0
+            if is_complete and not computation.is_canceled and result.id in self.pending_results:
+                self.computation_service.submit(computation.id, ModelFacade._merge_work_units,
+                                                (snapshot_path, configuration_id, partial_results, result),
+                                                callback=callback, error_callback=error_callback,
+                                                update_callback=update_callback)
+
+        def make_callback(index):
+            return lambda partial_result: on_partial_result(index, partial_result)
+
+        result.start()
+        for index, shard in enumerate(shards):
+            self.computation_service.submit(computation.id, ModelFacade._compute_work_units,
+                                            (snapshot_path, configuration_id, shard, result),
+                                            callback=make_callback(index), error_callback=error_callback,
+                                            update_callback=update_callback)
+
+    @staticmethod
+    def _compute_work_units(snapshot_path: str, configuration_id: UUID, units: list, result: Result) -> dict:
+        """
+        Computes a shard of a configuration of a network snapshot in a worker process.
+
+        :param snapshot_path: path of the network snapshot
+        :param configuration_id: group ID of the configuration
+        :param units: work units of the shard
+        :param result: result object of the configuration to stream partial results to
+        :return: results of the work units
+        """
+        network = NetworkSnapshot.load(snapshot_path)
+        return network.configurations[configuration_id].compute_work_units(network, units, result)
+
+    @staticmethod
+    def _merge_work_units(snapshot_path: str, configuration_id: UUID, partial_results: list[dict], result: Result):
+        """
+        Computes a configuration of a network snapshot from the results of its shards in a worker process.
+
+        :param snapshot_path: path of the network snapshot
+        :param configuration_id: group ID of the configuration
+        :param partial_results: results of the shards
+        :param result: result object to store results
+        :return: result object
+        """
+        network = NetworkSnapshot.load(snapshot_path)
+        network.configurations[configuration_id].merge_work_units(network, result, partial_results)
+        result.finish()
+        return result
+
+    @staticmethod
+    def _compute_configuration(snapshot_path: str, configuration_id: UUID, result: Result):
+        """
+        Computes a configuration of a network snapshot in a worker process.
+
+        :param snapshot_path: path of the network snapshot
+        :param configuration_id: group ID of the configuration
         :param result: result object to store results
         :return: result object
         """
+        network = NetworkSnapshot.load(snapshot_path)
+        configuration = network.configurations[configuration_id]
         result.start()
-        configuration.compute(self.network, result)
+        configuration.compute(network, result)
         result.finish()
         return result
 
@@ -407,8 +604,7 @@ class ModelFacade:
         :param computation: computation object
         """
         computation.finish()
-        if computation in self.computation_pools:
-            del self.computation_pools[computation]
+        self.running_computations.discard(computation)
 
     def cancel_computation(self, computation: Computation):
         """
@@ -417,8 +613,9 @@ class ModelFacade:
         :param computation: computation object
         """
         computation.cancel()
-        if computation in self.computation_pools:
-            self.computation_pools[computation].terminate()
+        if computation in self.running_computations:
+            # the workers skip pending tasks and stop running ones at their next result change
+            self.computation_service.cancel(computation.id)
 
     def _notify_result(self, pickled_result: Result):
         """
@@ -428,6 +625,9 @@ class ModelFacade:
         """
         original_result = self.pending_results[pickled_result.id]
         original_result.__dict__ = original_result.__dict__ | pickled_result.__dict__
+        configuration = self.network.configurations.get(original_result.configuration_id)
+        if configuration is not None:
+            configuration.receive_result(original_result)
         original_result.notify((original_result, "finished_result"))
         del self.pending_results[pickled_result.id]
 
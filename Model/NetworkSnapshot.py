@@ -0,0 +1,89 @@
+import copyreg
+import os
+import pickle
+import tempfile
+import uuid
+
+from Model.ComputationConfigurations.ConfigurationTemplate.AbstractConfiguration import AbstractConfiguration
+from Model.Network.Edge import Edge
+from Model.Network.Flow import Flow
+from Model.Network.Network import Network
+from Model.Network.Node import Node
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickles a network with only the configurations of one configuration group. The model, which refers to the whole
+    network again, and the selection are left out, since computations do not read them.
+
+    :param file: binary file
+    :param configuration_id: group ID of the configuration
+    """
+
+    def __init__(self, file, configuration_id: uuid.UUID):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.configuration_id = configuration_id
+
+    def reducer_override(self, obj):
+        if not isinstance(obj, (Network, Node, Edge, Flow, AbstractConfiguration)):
+            return NotImplemented
+        attributes = obj.__getstate__()
+        if "configurations" in attributes:
+            attributes["configurations"] = {group_id: configuration
+                                            for group_id, configuration in attributes["configurations"].items()
+                                            if group_id == self.configuration_id}
+        if "model" in attributes:
+            attributes["model"] = None
+        if "selected_components" in attributes:
+            attributes["selected_components"] = []
+        return copyreg.__newobj__, (type(obj),), attributes
+
+
+class NetworkSnapshot:
+    """
+    Immutable copy of a network for worker processes. For every configuration, the network is serialized once with
+    only the configurations of this configuration group, so tasks only carry the path of the snapshot instead of a
+    pickled network each. Every load returns an independent copy, so tasks can not influence each other.
+
+    :param network: network object
+    """
+
+    def __init__(self, network: Network):
+        self.network = network
+        self.paths: dict[uuid.UUID, str] = {}
+
+    def get_path(self, configuration_id: uuid.UUID) -> str:
+        """
+        Serializes the network for a configuration on first use.
+
+        :param configuration_id: group ID of the configuration
+        :return: path of the snapshot of the configuration
+        """
+        if configuration_id not in self.paths:
+            file_descriptor, path = tempfile.mkstemp(prefix="npba_network_", suffix=".pickle")
+            with os.fdopen(file_descriptor, "wb") as file:
+                _SnapshotPickler(file, configuration_id).dump(self.network)
+            self.paths[configuration_id] = path
+        return self.paths[configuration_id]
+
+    @staticmethod
+    def load(path: str) -> Network:
+        """
+        Loads a copy of the network of a snapshot.
+
+        :param path: path of the snapshot
+        :return: network object
+        """
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+    def close(self):
+        """
+        Deletes the snapshots.
+        """
+        for path in self.paths.values():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.paths = {}
@@ -0,0 +1,136 @@
+import itertools
+import uuid
+
+import numpy as np
+from matplotlib import pyplot as plt
+
+from Model.ComputationService import get_computation_service
+from Model.Result import Result
+
+
+def sweep(configuration, network, axes: list[tuple], result: Result = None, number_of_workers=None) -> dict:
+    """
+    Computes the end-to-end delays and link backlogs of a configuration for every combination of parameter values. The
+    bounds of the grid points are computed by compute_sweep() of the configuration.
+
+    :param configuration: configuration object
+    :param network: network object
+    :param axes: one or two (parameter name, IDs of the edges or flows, values), the values are set for all given
+                 edges or flows at once
+    :param result: optional result object for a table and heatmaps of the maximal bounds
+    :param number_of_workers: number of processes, if the configuration evaluates grid points in parallel
+    :return: NumPy arrays: "axis_0" (and "axis_1") with the values of the axes, "flows" and "links" with the names of
+             the analyzed class A and B flows of interest and their links, "end_to_end_delay" in s of shape
+             (*grid, flows) and "backlog" in bit of shape (*grid, links, 2) for class A and B
+    """
+    parameters = configuration.get_sweep_parameters()
+    if not parameters:
+        raise ValueError(f"{configuration.get_configuration_name()} does not support sweeps")
+    if not 1 <= len(axes) <= 2:
+        raise ValueError("One or two axes expected")
+    for parameter, component_ids, values in axes:
+        if parameter not in parameters:
+            raise ValueError(f"Unknown sweep parameter: '{parameter}'. Expected: {list(parameters)}")
+        components = network.edges if parameters[parameter] == "edge" else network.flows
+        for component_id in component_ids:
+            if component_id not in components:
+                raise ValueError(f"Unknown {parameters[parameter]} for '{parameter}': {component_id}")
+        if len(values) == 0:
+            raise ValueError(f"No values for '{parameter}'")
+
+    grid = []
+    for point in itertools.product(*(values for _, _, values in axes)):
+        overrides = {}
+        for (parameter, component_ids, _), value in zip(axes, point):
+            for component_id in component_ids:
+                overrides.setdefault(component_id, {})[parameter] = value
+        grid.append(overrides)
+    flow_names, link_names, delays, backlogs = configuration.compute_sweep(network, grid, number_of_workers)
+
+    shape = tuple(len(values) for _, _, values in axes)
+    arrays = {f"axis_{index}": np.array(values) for index, (_, _, values) in enumerate(axes)}
+    arrays["flows"] = np.array(flow_names, dtype=str)
+    arrays["links"] = np.array(link_names, dtype=str)
+    arrays["end_to_end_delay"] = np.array(delays, dtype=np.float64).reshape(shape + (len(flow_names),))
+    arrays["backlog"] = np.array(backlogs, dtype=np.float64).reshape(shape + (len(link_names), 2))
+    if result is not None:
+        _add_sweep_results(result, axes, arrays)
+    return arrays
+
+
+def compute_grid(function, args: tuple, grid: list[dict], number_of_workers=None) -> list:
+    """
+    Computes the grid points of a sweep with the worker processes of the computation service. The grid is split into
+    one chunk per worker, so every chunk translates the network only once.
+
+    :param function: picklable function, which computes the bounds of a chunk of grid points given as last argument
+    :param args: other arguments of the function
+    :param grid: {edge or flow ID: {parameter name: value}} for every grid point
+    :param number_of_workers: number of chunks, defaults to the number of worker processes
+    :return: results of the function for every grid point
+    """
+    computation_service = get_computation_service()
+    if number_of_workers is None:
+        number_of_workers = computation_service.number_of_workers
+    number_of_chunks = max(1, min(number_of_workers, len(grid)))
+    size, remainder = divmod(len(grid), number_of_chunks)
+    chunks = []
+    for index in range(number_of_chunks):
+        start = index * size + min(index, remainder)
+        chunks.append(grid[start:start + size + (index < remainder)])
+
+    key = uuid.uuid4()
+    results = [None] * len(chunks)
+    errors = []
+
+    def make_callback(index):
+        return lambda chunk_results: results.__setitem__(index, chunk_results)
+
+    for index, chunk in enumerate(chunks):
+        computation_service.submit(key, function, args + (chunk,), callback=make_callback(index),
+                                   error_callback=errors.append)
+    computation_service.wait(key)
+    if errors:
+        raise errors[0]
+    return [point_result for chunk_results in results for point_result in chunk_results]
+
+
+def _add_sweep_results(result: Result, axes: list[tuple], arrays: dict):
+    """
+    Adds a table and heatmaps of a sweep to a result. A single axis is plotted against the flows and links, two axes
+    against each other with the maximum over all flows and links.
+
+    :param result: result object
+    :param axes: axes of the sweep
+    :param arrays: arrays returned by sweep()
+    """
+    delays, backlogs = arrays["end_to_end_delay"], arrays["backlog"].max(axis=-1, initial=0)
+    max_delays, max_backlogs = delays.max(axis=-1, initial=0), backlogs.max(axis=-1, initial=0)
+    axis_values = [arrays[f"axis_{index}"] for index in range(len(axes))]
+    rows = [tuple(values[index] for values, index in zip(axis_values, point)) +
+            (max_delays[point], max_backlogs[point]) for point in np.ndindex(max_delays.shape)]
+    result.add_table([parameter for parameter, _, _ in axes] + ["Max. End-to-End Delay (s)", "Max. Backlog (bit)"],
+                     rows, "Sweep")
+
+    def heatmap(data, y_labels, y_name, color_name, display_name):
+        fig = plt.figure()
+        axe = fig.add_subplot(111)
+        image = axe.imshow(data, aspect="auto", origin="lower")
+        fig.colorbar(image, ax=axe, label=color_name)
+        axe.set_xlabel(axes[-1][0])
+        axe.set_ylabel(y_name)
+        for labels, set_ticks in ((axis_values[-1], axe.set_xticks), (y_labels, axe.set_yticks)):
+            if len(labels) < 50:
+                set_ticks(np.arange(len(labels)), [str(label) for label in labels])
+        result.add_plot(fig, display_name)
+
+    if len(axes) == 1:
+        if delays.size:
+            heatmap(delays.T, arrays["flows"], "Flows", "End-to-End Delay (s)", "End-to-End Delay Sweep")
+        if backlogs.size:
+            heatmap(backlogs.T, arrays["links"], "Edges", "Backlog (bit)", "Backlog Sweep")
+    else:
+        if delays.size:
+            heatmap(max_delays, arrays["axis_0"], axes[0][0], "Max. End-to-End Delay (s)", "End-to-End Delay Sweep")
+        if backlogs.size:
+            heatmap(max_backlogs, arrays["axis_0"], axes[0][0], "Max. Backlog (bit)", "Backlog Sweep")
@@ -6,6 +6,18 @@ import matplotlib.figure
 
 from Model.Subject import Subject
 
+# seconds between two batches of partial results sent by a worker process
+_STREAM_INTERVAL = 0.2
+
+# seconds between two queries of the cancel event by poll_canceled()
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+class CanceledError(Exception):
+    """
+    Raised in a worker process, when the computation of a result was canceled.
+    """
+
 
 class Result(Subject):
 
@@ -17,10 +29,25 @@ class Result(Subject):
         self.is_finished = False
         self.is_canceled = False
         self.is_error = False
+        # whether the result was taken from the result cache instead of being computed
+        self.is_cached = False
         self.result_text = ""
         self.plots: list[tuple[str, matplotlib.figure.Figure]] = []
+        self.tables: list[tuple[str, list[str], list[tuple]]] = []
         self.start_time = None
         self.end_time = None
+        # state handed from the computing process back to the configuration, see receive_result()
+        self.configuration_state = None
+        # event of the computation in a worker process, which is set when the computation is canceled
+        self.cancel_event = None
+        # queue to the main process for partial results in a worker process, see publish()
+        self.stream = None
+        self._stream_buffer = []
+        self._stream_time = 0.0
+        self._cancel_poll_time = 0.0
+        # partial results received in the main process while the computation is running
+        self.phase = None
+        self.partial_bounds: dict[str, dict[str, Any]] = {}
 
     @staticmethod
     def get_timestamp(format_str, time) -> str:
@@ -37,7 +64,8 @@ class Result(Subject):
         """
         Sets the start time.
         """
-        self.start_time = time_mod.time()
+        if self.start_time is None:
+            self.start_time = time_mod.time()
 
     def set_end_time(self):
         """
@@ -75,6 +103,80 @@ class Result(Subject):
         self.is_error = True
         self.notify((self, "error_result"))
 
+    def check_canceled(self):
+        """
+        Stops a computation in a worker process, if it was canceled.
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise CanceledError("Computation canceled")
+
+    def poll_canceled(self):
+        """
+        Stops a computation in a worker process, if it was canceled. The cancel event belongs to the main process, so
+        unlike check_canceled(), it is only queried every _CANCEL_POLL_INTERVAL seconds. This method can be called for
+        every flow or link.
+        """
+        if self.cancel_event is not None and time_mod.monotonic() - self._cancel_poll_time >= _CANCEL_POLL_INTERVAL:
+            self.check_canceled()
+            self._cancel_poll_time = time_mod.monotonic()
+
+    def publish(self, kind: str, name: str, value: Any):
+        """
+        Streams a bound to the main process while the computation is running. Bounds are sent in batches.
+
+        :param kind: kind of the bound with its unit, e.g. "End-to-End Delay (s)"
+        :param name: name of the flow or link
+        :param value: bound
+        """
+        self.poll_canceled()
+        if self.stream is None:
+            return
+        self._stream_buffer.append((kind, name, value))
+        if time_mod.monotonic() - self._stream_time >= _STREAM_INTERVAL:
+            self.flush_stream()
+
+    def set_phase(self, phase: str):
+        """
+        Streams the current phase of the computation to the main process.
+
+        :param phase: description of the phase
+        """
+        self.check_canceled()
+        self.publish("phase", "", phase)
+        self.flush_stream()
+
+    def flush_stream(self):
+        """
+        Sends the buffered partial results to the main process.
+        """
+        if self.stream is not None and self._stream_buffer:
+            self.stream.put((self.id, self._stream_buffer))
+            self._stream_buffer = []
+            self._stream_time = time_mod.monotonic()
+
+    def receive_updates(self, updates: list[tuple[str, str, Any]]):
+        """
+        Adds partial results streamed by a worker process in the main process.
+
+        :param updates: list of (kind, name, value) as passed to publish()
+        """
+        for kind, name, value in updates:
+            if kind == "phase":
+                self.phase = value
+            else:
+                self.partial_bounds.setdefault(kind, {})[name] = value
+        self.notify((self, "partial_result"))
+
+    def get_partial_text(self) -> str:
+        """
+        :return: the partial results received so far as text
+        """
+        lines = [f"Phase: {self.phase}"] if self.phase is not None else []
+        for kind, bounds in self.partial_bounds.items():
+            lines.append(f"{kind}:")
+            lines.extend(f"        {name}: {float(value)}" for name, value in bounds.items())
+        return "\n".join(lines)
+
     def append_result(self, value: Any, num_of_tabs=0, tab="        "):
         """
         Appends results to the current result object.
@@ -83,6 +185,7 @@ class Result(Subject):
         :param num_of_tabs: number of tabs
         :param tab: can be used to define a tab
         """
+        self.check_canceled()
         result_text = str(value)
         if num_of_tabs > 0:
             result_text = (tab * num_of_tabs) + (tab * num_of_tabs).join(result_text.splitlines(keepends=True))
@@ -95,4 +198,29 @@ class Result(Subject):
         :param fig: plot
         :param display_name: name of the plot
         """
+        self.check_canceled()
         self.plots.append((display_name, fig))
+
+    def add_table(self, header: list[str], rows: list[tuple], display_name: str = "Table"):
+        """
+        Adds a table to the current result object and appends it to the result text.
+
+        :param header: column names
+        :param rows: table rows with one value per column
+        :param display_name: name of the table
+        """
+        self.check_canceled()
+        self.tables.append((display_name, header, rows))
+        lines = [header] + [[str(value) for value in row] for row in rows]
+        widths = [max(len(line[column]) for line in lines) for column in range(len(header))]
+        self.append_result(f"{display_name}:")
+        self.append_result("\n".join("  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip()
+                                     for line in lines) + "\n", 1)
+
+    def __getstate__(self):
+        attributes = super().__getstate__()
+        # partial results only belong to the main process, the finished result replaces them
+        attributes["_stream_buffer"] = []
+        attributes["phase"] = None
+        attributes["partial_bounds"] = {}
+        return attributes
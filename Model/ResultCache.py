@@ -0,0 +1,310 @@
+import atexit
+import collections
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import pickle
+import queue
+import stat
+import sys
+import tempfile
+import threading
+
+from Model.Result import Result
+
+# part of every key, has to be increased when a change of the computations invalidates stored results
+_CACHE_VERSION = 1
+
+# keys of configuration dictionaries, which identify a configuration, but do not change its results
+_IDENTITY_KEYS = {"id", "group_id", "name", "is_active"}
+
+
+def _get_default_directory() -> pathlib.Path:
+    """
+    :return: the cache directory of the current user
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or pathlib.Path.home().joinpath("AppData", "Local")
+    elif sys.platform == "darwin":
+        base = pathlib.Path.home().joinpath("Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home().joinpath(".cache")
+    return pathlib.Path(base).joinpath("npba", "results")
+
+
+def _is_owned(status: os.stat_result) -> bool:
+    """
+    :param status: status of a file or directory
+    :return: whether the current user owns the file or directory, always true on systems without user IDs
+    """
+    return not hasattr(os, "getuid") or status.st_uid == os.getuid()
+
+
+class ResultCache:
+    """
+    Content-addressed store of finished results. A result is found by a hash of the parts of the network, which its
+    configuration reads, so repeated computations of an unchanged network are not computed again. Results are kept
+    in memory and as files, so they are also reused by later sessions. The least recently used files are deleted,
+    when all files exceed max_bytes. The files are unpickled, so only files of the current user in a directory, which
+    other users can not write to, are read.
+
+    :param directory: directory of the files, defaults to the cache directory of the current user
+    :param max_bytes: maximal size of all files in bytes
+    :param max_memory_bytes: maximal size of the results kept in memory in bytes
+    """
+
+    def __init__(self, directory: pathlib.Path = None, max_bytes: int = 512 * 2 ** 20,
+                 max_memory_bytes: int = 64 * 2 ** 20):
+        if directory is None:
+            directory = _get_default_directory()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._lock = threading.Lock()
+        self._memory: collections.OrderedDict[str, bytes] = collections.OrderedDict()
+        self._memory_bytes = 0
+        # sizes of the files in the order of their last use, read from the directory by the first write
+        self._files: collections.OrderedDict[str, int] | None = None
+        self._file_bytes = 0
+        # results to store, which are pickled and written by the writer thread
+        self._writes = queue.Queue()
+        self._writer = None
+
+    @staticmethod
+    def make_key(network, configuration) -> str:
+        """
+        Computes a stable hash of the parameters of a configuration and of its node, edge and flow configurations,
+        the paths of the flows and the names used in the results.
+
+        :param network: network object
+        :param configuration: network configuration
+        :return: key of the results of the configuration
+        """
+        group_id = configuration.group_id
+
+        def parameters(component_configuration) -> dict:
+            return {key: value for key, value in component_configuration.to_serializable_dict().items()
+                    if key not in _IDENTITY_KEYS}
+
+        content = {
+            "version": _CACHE_VERSION,
+            "configuration": parameters(configuration),
+            "nodes": [(str(node.id), node.name, parameters(node.configurations[group_id]))
+                      for node in network.nodes.values()],
+            "edges": [(str(edge.id), edge.name, str(edge.start.id), str(edge.end.id),
+                       parameters(edge.configurations[group_id])) for edge in network.edges.values()],
+            "flows": [(str(flow.id), flow.name, [str(node.id) for node in flow.path],
+                       parameters(flow.configurations[group_id])) for flow in network.flows.values()]}
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str, result: Result) -> Result | None:
+        """
+        Returns a copy of a stored result.
+
+        :param key: key returned by make_key()
+        :param result: unfinished result object, which receives the stored result
+        :return: finished result object with the ID of the given result or None, if no result is stored
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is None:
+            data = self._read_file(key)
+            if data is None:
+                return None
+            self._remember(key, data)
+        try:
+            stored = pickle.loads(data)
+        except Exception:
+            # e.g. a file of an older version of the application
+            return None
+
+        cached_result = Result(result.configuration_name, result.configuration_id)
+        cached_result.id = result.id
+        cached_result.result_text = stored["result_text"]
+        cached_result.plots = stored["plots"]
+        cached_result.tables = stored["tables"]
+        cached_result.is_cached = True
+        cached_result.start()
+        cached_result.finish()
+        return cached_result
+
+    def put(self, key: str, result: Result):
+        """
+        Stores a finished result. The result is pickled and written by a background thread, so the caller, e.g. the
+        thread handling the results of the worker processes, is not blocked.
+
+        :param key: key returned by make_key()
+        :param result: finished result object
+        """
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_results, daemon=True)
+                self._writer.start()
+        self._writes.put((key, {"result_text": result.result_text, "plots": result.plots, "tables": result.tables}))
+
+    def flush(self):
+        """
+        Waits until all results passed to put() are stored.
+        """
+        if self._writer is not None:
+            self._writes.join()
+
+    def clear(self):
+        """
+        Deletes all stored results.
+        """
+        self.flush()
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._files = collections.OrderedDict()
+            self._file_bytes = 0
+        for path in self.directory.glob("*.pickle"):
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+    def _get_path(self, key: str) -> pathlib.Path:
+        return self.directory.joinpath(f"{key}.pickle")
+
+    def _is_directory_safe(self) -> bool:
+        """
+        Creates the directory, which only the current user can access.
+
+        :return: whether the directory is owned by the current user and other users can not write to it
+        """
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            status = self.directory.stat()
+        except OSError:
+            return False
+        return _is_owned(status) and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _read_file(self, key: str) -> bytes | None:
+        """
+        Reads a stored result, if the file and its directory belong to the current user.
+
+        :param key: key of the result
+        :return: pickled result or None
+        """
+        if not self._is_directory_safe():
+            return None
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as file:
+                if not _is_owned(os.fstat(file.fileno())):
+                    return None
+                data = file.read()
+            # the modification time orders the files for the eviction by later sessions
+            os.utime(path)
+        except OSError:
+            return None
+        with self._lock:
+            if self._files is not None and key in self._files:
+                self._files.move_to_end(key)
+        return data
+
+    def _write_results(self):
+        """
+        Pickles and writes the results passed to put() in a background thread.
+        """
+        while True:
+            key, stored = self._writes.get()
+            try:
+                data = pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL)
+                self._remember(key, data)
+                self._write_file(key, data)
+            except Exception:
+                # the result is computed again next time
+                pass
+            finally:
+                self._writes.task_done()
+
+    def _write_file(self, key: str, data: bytes):
+        """
+        Writes a pickled result and deletes the least recently used files, which exceed max_bytes.
+
+        :param key: key of the result
+        :param data: pickled result
+        """
+        if not self._is_directory_safe():
+            return
+        if self._files is None:
+            self._files = self._scan_files()
+            self._file_bytes = sum(self._files.values())
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(data)
+        # other processes only see complete files
+        os.replace(temporary_path, self._get_path(key))
+        with self._lock:
+            self._file_bytes += len(data) - self._files.pop(key, 0)
+            self._files[key] = len(data)
+        self._evict()
+
+    def _remember(self, key: str, data: bytes):
+        """
+        Keeps a result in memory and forgets the least recently used results, which exceed max_memory_bytes.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_memory_bytes and self._memory:
+                _, forgotten = self._memory.popitem(last=False)
+                self._memory_bytes -= len(forgotten)
+
+    def _scan_files(self) -> collections.OrderedDict[str, int]:
+        """
+        :return: sizes of the files in the directory, ordered by their modification time
+        """
+        files = []
+        for path in self.directory.glob("*.pickle"):
+            with contextlib.suppress(FileNotFoundError):
+                status = path.stat()
+                files.append((status.st_mtime, path.stem, status.st_size))
+        return collections.OrderedDict((key, size) for _, key, size in sorted(files))
+
+    def _evict(self):
+        """
+        Deletes the least recently used files, until all files fit into max_bytes. The sizes are taken from the
+        running total, files stored by other processes meanwhile are found by the next session.
+        """
+        evicted = []
+        with self._lock:
+            while self._file_bytes > self.max_bytes and self._files:
+                key, size = self._files.popitem(last=False)
+                self._file_bytes -= size
+                evicted.append(key)
+        for key in evicted:
+            # another process may have deleted the file already
+            with contextlib.suppress(FileNotFoundError):
+                self._get_path(key).unlink()
+
+
+_result_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """
+    :return: the result cache of this process
+    """
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+        atexit.register(_result_cache.flush)
+    return _result_cache
+
+
+def set_result_cache(result_cache: ResultCache):
+    """
+    Replaces the result cache of this process, e.g. by a cache in another directory.
+
+    :param result_cache: result cache
+    """
+    global _result_cache
+    _result_cache = result_cache
@@ -55,6 +55,9 @@ class GUI(ctk.CTkToplevel, Observer):
         self.layout = None
         self.init_view()
 
+        self._pump_handler = None
+        self.pump_computation_updates()
+
     def init_view(self):
         """
         Initializes the default layout.
@@ -73,11 +76,19 @@ class GUI(ctk.CTkToplevel, Observer):
                 return
             elif save and not self.menubar.export_network():
                 return
+        self.after_cancel(self._pump_handler)
         self.observed_subject.unsubscribe(self)
         self.observed_subject = None
         super().destroy()
         self.wrapper.remove_gui(self)
 
+    def pump_computation_updates(self):
+        """
+        Periodically delivers the partial results of running computations in the GUI thread.
+        """
+        self.controller.pump_computation_updates()
+        self._pump_handler = self.after(200, self.pump_computation_updates)
+
     def restore_default_layout(self):
         """
         Destroys current layout and restores the default layout.
@@ -16,6 +16,8 @@ class ComputationNotebook(NotebookCloseableTabs, Observer):
 
         self.add_widget(ComputationStatusBoard(self, computation, controller), "Status Board")
         self.results = []
+        self.partial_results = []
+        self._live_textboxes = {}
         self.handler_id = None
         self.subscribed_results = []
 
@@ -32,6 +34,10 @@ class ComputationNotebook(NotebookCloseableTabs, Observer):
         if updated_component[1] == "finished_result":
             result = updated_component[0]
             self.results.append(result)
+        elif updated_component[1] == "partial_result":
+            result = updated_component[0]
+            if result not in self.partial_results:
+                self.partial_results.append(result)
 
     def start_task_handler(self):
         """
@@ -44,9 +50,17 @@ class ComputationNotebook(NotebookCloseableTabs, Observer):
         Handles received results.
         """
         for result in list(self.results):
+            textbox = self._live_textboxes.pop(result, None)
+            if textbox is not None and textbox.winfo_exists():
+                self.remove(textbox)
             self.add_result(result)
             self.results.remove(result)
 
+        for result in self.partial_results:
+            if not (result.is_finished or result.is_canceled or result.is_error):
+                self.show_partial_result(result)
+        self.partial_results.clear()
+
         self.start_task_handler()
 
     def destroy(self):
@@ -58,6 +72,24 @@ class ComputationNotebook(NotebookCloseableTabs, Observer):
         self.subscribed_results.clear()
         super().destroy()
 
+    def show_partial_result(self, result):
+        """
+        Shows the partial results of a running computation in a tab, which is replaced by the finished result.
+
+        :param result: result object
+        """
+        textbox = self._live_textboxes.get(result)
+        if textbox is None:
+            fg_color = ThemeManager.theme["color_scale"]["inner"]
+            self._live_textboxes[result] = textbox = ctk.CTkTextbox(self, fg_color=fg_color, bg_color=fg_color,
+                                                                    wrap="word")
+            self.add_widget(textbox, f"{result.configuration_name} (running)")
+        elif not textbox.winfo_exists():
+            # the tab was closed
+            return
+        textbox.delete("1.0", tk.END)
+        textbox.insert(tk.END, result.get_partial_text())
+
     def add_result(self, result):
         """
         Adds results to the notebook.
@@ -36,7 +36,7 @@ class ComputationStatusBoard(ctk.CTkFrame, Observer):
         if message == "computation_finished" or message == "computation_canceled":
             computation = updated_component[0]
             self.tasks.append(computation)
-        elif message == "finished_result" or message == "canceled_result" or message == "error_result":
+        elif message in ("finished_result", "canceled_result", "error_result", "partial_result"):
             result = updated_component[0]
             self.tasks.append(result)
 
@@ -87,14 +87,7 @@ class ComputationStatusBoard(ctk.CTkFrame, Observer):
 
         offset = 4
         for index, result in enumerate(self.observed_subject.results):
-            if result.is_error:
-                status = "Error"
-            elif result.is_canceled:
-                status = "Canceled"
-            elif result.is_finished:
-                status = "Finished"
-            else:
-                status = "Running"
+            status = self._get_result_status(result)
             ctk.CTkLabel(content_frame.scrolled_frame, text=result.configuration_name).grid(column=0,
                                                                                             row=offset + index)
             self._items[result] = label = ctk.CTkLabel(content_frame.scrolled_frame, text=status)
@@ -120,15 +113,24 @@ class ComputationStatusBoard(ctk.CTkFrame, Observer):
         self._items["cancel_button"].configure(state=active)
 
         for result in self.observed_subject.results:
-            if result.is_error:
-                status = "Error"
-            elif result.is_canceled:
-                status = "Canceled"
-            elif result.is_finished:
-                status = "Finished"
-            else:
-                status = "Running"
-            self._items[result].configure(text=status)
+            self._items[result].configure(text=self._get_result_status(result))
+
+    @staticmethod
+    def _get_result_status(result) -> str:
+        """
+        :param result: result object
+        :return: status of the result, including the phase and the number of received bounds while it is running
+        """
+        if result.is_error:
+            return "Error"
+        elif result.is_canceled:
+            return "Canceled"
+        elif result.is_finished:
+            return "Finished (cached)" if result.is_cached else "Finished"
+        elif result.phase is None:
+            return "Running"
+        number_of_bounds = sum(len(bounds) for bounds in result.partial_bounds.values())
+        return f"Running: {result.phase} ({number_of_bounds} bounds received)"
 
     def start_task_handler(self):
         """
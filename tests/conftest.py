@@ -0,0 +1,47 @@
+import pathlib
+
+import matplotlib
+import pytest
+import scienceplots
+
+from Model.ComputationConfigurations.CBS_CDT_ATS_Configuration.ATSConfiguration import ATSConfiguration
+from Model.ComputationConfigurations.Nancy_CBS_Configuration.NancyCBSNetworkConfiguration import \
+    NancyCBSNetworkConfiguration
+from Model.ComputationConfigurations.RTCToolbox_CBS_Configuration.RTCToolboxCBSNetworkConfiguration import \
+    RTCToolboxCBSNetworkConfiguration
+from Model.ModelFacade import ModelFacade
+
+matplotlib.use("Agg")
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+DATA = pathlib.Path(__file__).resolve().parent.joinpath("data")
+
+
+def load_example(name: str) -> ModelFacade:
+    """
+    :param name: file name of an example project
+    :return: model of the example project
+    """
+    return ModelFacade.load_network(str(ROOT.joinpath("ExampleProjects", name)))
+
+
+def get_configuration(model: ModelFacade, identifier: str = "CBS-CDT-ATS"):
+    """
+    :param model: model of an example project
+    :param identifier: configuration identifier
+    :return: first configuration of the project with the identifier
+    """
+    return next(configuration for configuration in model.network.configurations.values()
+                if configuration.get_configuration_identifier() == identifier)
+
+
+@pytest.fixture
+def without_plots(monkeypatch):
+    """
+    The tests compare the bounds, so the plots of the ATS, Nancy and RTC Toolbox configurations are not created.
+    """
+    monkeypatch.setattr(ATSConfiguration, "_make_plots", lambda self: None)
+    monkeypatch.setattr(NancyCBSNetworkConfiguration, "_make_plots", lambda self: None)
+    monkeypatch.setattr(RTCToolboxCBSNetworkConfiguration, "_make_plots", lambda self: None)
+    # compute() reads the attribute only to mark the style import as used, newer SciencePlots releases lack it
+    monkeypatch.setattr(scienceplots, "inode", None, raising=False)
@@ -0,0 +1,35 @@
+from fractions import Fraction
+
+import pytest
+
+from ComputationMethods.AnalyticCBS import ConcaveCurve, RateLatencyCurve
+from conftest import get_configuration, load_example
+
+
+@pytest.mark.parametrize("burst, rate, service_rate, latency", [(1000, 20, 100, 0.5), (64, 1, 3, 0), (8, 7, 7, 2)])
+def test_deviations_are_exact(burst, rate, service_rate, latency):
+    curve = ConcaveCurve.token_bucket(burst, rate)
+    service = RateLatencyCurve(service_rate, latency)
+    assert curve.horizontal_deviation(service) == latency + Fraction(burst, service_rate)
+    assert curve.vertical_deviation(service) == burst + rate * latency
+
+
+def test_unstable_curves_have_no_deviation():
+    assert ConcaveCurve.token_bucket(10, 5).horizontal_deviation(RateLatencyCurve(4, 1)) is None
+
+
+def test_analytic_engine_computes_exact_bounds():
+    model = load_example("CBS Case Study.json")
+    network = model.network
+    configuration = get_configuration(model, "Nancy-CBS")
+    parameters = configuration.make_parameter_dict()
+    parameters["engine (Nancy/Analytic/NumPy)"] = "Analytic"
+    configuration.update_parameter_dict(parameters)
+    bounds = configuration.compute_work_units(network, configuration.get_work_units(network))
+
+    assert bounds.pop("engine")[0] == "Bounds computed in closed form, all arrival curves are token buckets"
+    flow_ids = {unit_id for kind, unit_id in bounds if kind == "flow"}
+    assert flow_ids == set(configuration.flow_ids_of_interest)
+    for (kind, _), bound in bounds.items():
+        values = [bound] if kind == "flow" else [value for pair in bound.values() for value in pair]
+        assert all(isinstance(value, Fraction) and value >= 0 for value in values)
@@ -0,0 +1,133 @@
+import pickle
+import random
+
+import pytest
+
+from ComputationMethods.CBS_CDT_ATS import CBS, Flow as ATS_flow
+from Model.ComputationConfigurations.CBS_CDT_ATS_Configuration.ATSConfiguration import ATSConfiguration
+from Model.ComputationConfigurations.ConfigurationTemplate.AbstractNetworkConfiguration import \
+    AbstractNetworkConfiguration
+from Model.ModelFacade import ModelFacade
+from Model.Result import Result
+from conftest import DATA, get_configuration, load_example
+
+
+def compute(configuration, network) -> Result:
+    result = Result(configuration.name, configuration.group_id)
+    configuration.compute(network, result)
+    return result
+
+
+@pytest.mark.parametrize("number", [1, 2])
+def test_case_study_matches_baseline(without_plots, number):
+    # result texts of the case studies computed before the link aggregates were introduced
+    model = load_example(f"CBS-CDT-ATS Case Study {number}.json")
+    result = compute(get_configuration(model), model.network)
+    assert result.result_text == DATA.joinpath(f"ats_case_study_{number}.txt").read_text()
+
+
+@pytest.mark.parametrize("number", [1, 2])
+def test_incremental_matches_full_computation(without_plots, number):
+    model = load_example(f"CBS-CDT-ATS Case Study {number}.json")
+    network = model.network
+    configuration = get_configuration(model)
+    configuration.incremental = True
+    rand = random.Random(number)
+    for _ in range(8):
+        # like in a worker process, the configuration is computed as a copy, which carries the previous model
+        state = configuration._incremental_state
+        worker_configuration = pickle.loads(pickle.dumps(configuration))
+        result = compute(worker_configuration, network)
+        if state is not None:
+            assert worker_configuration._compute_args["cbs"] is worker_configuration._incremental_state["cbs"]
+        # a copy without the state of the previous computation computes all bounds again
+        full_configuration = pickle.loads(pickle.dumps(configuration))
+        full_configuration.incremental = False
+        full_configuration._incremental_state = None
+        assert result.result_text == compute(full_configuration, network).result_text
+        configuration.receive_result(result)
+        assert configuration._incremental_state is not None
+
+        if rand.random() < 0.5:
+            edge = rand.choice(list(network.edges.values()))
+            edge_configuration = edge.configurations[configuration.group_id]
+            edge_configuration.link_speed = rand.choice([100, 200, 1000])
+            edge_configuration.idle_slope_A = rand.choice([30, 50])
+        else:
+            flow = rand.choice(list(network.flows.values()))
+            flow.configurations[configuration.group_id].l_max = rand.choice([0.0001, 0.0005, 0.012])
+
+
+def test_incremental_result_is_not_cached():
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    configuration = get_configuration(model)
+    assert configuration.is_result_cacheable()
+    configuration.incremental = True
+    assert not configuration.is_result_cacheable()
+
+
+def test_admission_matches_full_computation():
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    network = model.network
+    configuration = get_configuration(model)
+    flows = list(network.flows.values())
+    for flow in flows:
+        flow.configurations[configuration.group_id].deadline = 0.001
+    params = {"regulation_rate": 2, "l_min": 0.0001, "l_max": 0.0005, "flow_type": "A", "ac_type": "LRQ"}
+    rand = random.Random(1)
+    for _ in range(5):
+        path = rand.choice(flows).path
+        admitted, bounds = configuration.check_admission(network, path, params, 0.001)
+        assert None in bounds and admitted == all(delay <= deadline for delay, deadline in bounds.values())
+        # a copy without the kept model translates the network again
+        fresh_configuration = pickle.loads(pickle.dumps(configuration))
+        assert fresh_configuration.check_admission(network, path, params, 0.001) == (admitted, bounds)
+
+        # a model built from scratch with the candidate evaluates every flow
+        fresh_configuration.make_computation_model(network)
+        flow_mapping = fresh_configuration._compute_args["flow_mapping"]
+        links = fresh_configuration._compute_args["link_mapping"]
+        candidate = ATS_flow(2e6, 100, 500, [links[i.id, j.id] for i, j in zip(path, path[1:])], "A", "LRQ")
+        cbs = CBS(list(flow_mapping.values()) + [candidate])
+        for flow_id, (delay, _) in bounds.items():
+            ats_flow = candidate if flow_id is None else flow_mapping[flow_id]
+            assert delay == pytest.approx(cbs.end_to_end_delay(ats_flow))
+        assert not configuration.check_admission(network, path, params, 0)[0]
+
+        edge = rand.choice(list(network.edges.values()))
+        edge.configurations[configuration.group_id].link_speed = rand.choice([100, 200, 1000])
+
+
+def test_top_k_matches_full_sort(without_plots):
+    model = ModelFacade().generate_random_network_in_new_model(seed=3, min_num_nodes=30, max_num_nodes=30,
+                                                                min_num_edges=50, max_num_edges=50)
+    model.add_random_flows(60, 60, 2, 6, flow_seed=4)
+    network = model.network
+    configuration = model.add_configuration(ATSConfiguration)
+    rand = random.Random(1)
+    for flow in network.flows.values():
+        flow.configurations[configuration.group_id].type = rand.choice(["A", "B"])
+        model.add_flow_of_interest(configuration.group_id, flow)
+
+    compute(configuration, network)
+    records = configuration._compute_args["flow_records"]
+    expected = sorted(records, key=lambda flow_id: -records[flow_id]["end_to_end_delay"])[:5]
+    configuration.top_k = 5
+    result = compute(configuration, network)
+    assert configuration._compute_args["flow_ids"] == expected
+    assert [row[1] for row in result.tables[0][2]] == [network.flows[flow_id].name for flow_id in expected]
+
+
+def test_top_k_prunes_flows_by_their_bounds():
+    rand = random.Random(1)
+    delays = {flow_id: rand.uniform(0, 1) for flow_id in range(100)}
+    bounds = {flow_id: (0.9 * delay, 1.1 * delay) for flow_id, delay in delays.items()}
+    computed = []
+
+    def compute_delays(flow_ids):
+        computed.extend(flow_ids)
+        return [delays[flow_id] for flow_id in flow_ids]
+
+    ranking = AbstractNetworkConfiguration._select_top_k(bounds, 3, compute_delays)
+    assert ranking == sorted(delays.items(), key=lambda flow_delay: -flow_delay[1])[:3]
+    assert len(computed) < len(delays)
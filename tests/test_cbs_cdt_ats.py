@@ -0,0 +1,147 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from ComputationMethods.CBS_CDT_ATS import CBS, Flow, Link
+from ComputationMethods.CBS_CDT_ATS.CBS_CDT_ATS import _Aggregate
+
+C = 100 * math.pow(10, 6)
+IDSL = 50 * math.pow(10, 6)
+SDSL = -50 * math.pow(10, 6)
+
+
+def make_link(i, j):
+    return Link(i, j, C, IDSL, SDSL, 0, 0, 0, 0, 0, 0)
+
+
+def make_path(*nodes):
+    return [make_link(i, j) for i, j in zip(nodes, nodes[1:])]
+
+
+@pytest.fixture
+def example():
+    """
+    The example network of CBS_CDT_ATS.py.
+    """
+    f1 = Flow(20 * math.pow(10, 6), 1000, 1000, make_path("H1", "1", "2", "3", "4", "H4"), "A", "LRQ")
+    f2 = Flow(20 * math.pow(10, 6), 2000, 2000, make_path("H1", "1", "2", "H2"), "A", "LRQ")
+    f3 = Flow(20 * math.pow(10, 6), 2000, 2000, make_path("H3", "3", "4", "5", "H5"), "A", "LRQ")
+    f4 = Flow(20 * math.pow(10, 6), 2000, 2000, make_path("H4", "4", "5", "2", "H2"), "A", "LRQ")
+    f5 = Flow(20 * math.pow(10, 6), 2000, 2000, make_path("H5", "5", "2", "3", "H3"), "A", "LRQ")
+    cdt = Flow(20 * math.pow(10, 6), 4000, 4000,
+               make_path("H1", "1", "2", "3", "H3") + make_path("H3", "3", "4", "H4") +
+               make_path("H4", "4", "5", "H5") + make_path("H5", "5", "2", "H2") + make_path("H2", "2"),
+               "CDT", "LB")
+    be = Flow(20 * math.pow(10, 6), 2000, 2000, make_path("H1", "1", "2", "3", "4", "H4"), "BE", "LB")
+    return CBS([f1, f2, f3, f4, f5, cdt, be]), f1
+
+
+def test_example_matches_baseline(example):
+    # values printed by the example of CBS_CDT_ATS.py before the link aggregates were introduced
+    cbs, f1 = example
+    assert cbs.s_i_j(f1, f1.p[0]) == 0.00014
+    assert cbs.s_i_j(f1, f1.p[4]) == 0.00014
+    assert cbs.end_to_end_delay(f1) == 0.0006999999999999999
+    assert cbs.backlog_interleaved_regulator(f1, f1.p[0], f1.p[1]) == 11399.999999999998
+    assert cbs.backlog_cbfs("A", f1.p[0]) == 6200.0
+    assert cbs.h_i_j_k(f1, f1.p[0], f1.p[1]) == 0.00012999999999999996
+
+
+def test_end_to_end_delays_match_single_flows(example):
+    cbs, _ = example
+    flows = [flow for flow in cbs.f if flow.t in ("A", "B")]
+    assert cbs.end_to_end_delays(flows).tolist() == [cbs.end_to_end_delay(flow) for flow in flows]
+    lower, upper = cbs.end_to_end_delay_bounds(flows)
+    assert all(lower <= cbs.end_to_end_delays(flows)) and all(cbs.end_to_end_delays(flows) <= upper)
+
+
+@pytest.mark.parametrize("cdt_rate, idsl", [(C, IDSL), (20 * math.pow(10, 6), 0)])
+def test_degenerate_links_raise_like_single_flows(cdt_rate, idsl):
+    # a CDT rate equal to the link speed or an idle slope equal to the send slope divide by zero
+    shared = Link("1", "2", C, idsl, idsl, 0, 0, 0, 0, 0, 0)
+    flow = Flow(20 * math.pow(10, 6), 1000, 1000, make_path("H1", "1") + [shared], "A", "LRQ")
+    cdt = Flow(cdt_rate, 1000, 1000, [shared], "CDT", "LB")
+    cbs = CBS([flow, cdt])
+    with pytest.raises(ZeroDivisionError):
+        cbs.end_to_end_delay(flow)
+    with pytest.raises(ZeroDivisionError):
+        cbs.end_to_end_delays([flow])
+    with pytest.raises(ZeroDivisionError):
+        cbs.end_to_end_delay_bounds([flow])
+    # flows of other classes have no delay
+    assert np.isnan(cbs.end_to_end_delays([cdt])).all()
+
+
+class RandomNetwork:
+    """
+    Random flows on a full mesh, whose links are shared by the flows.
+    """
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+        nodes = [str(index) for index in range(8)]
+        self.nodes = nodes
+        self.links = {(i, j): Link(i, j, C, IDSL, SDSL, 30e6, -70e6, 0, 1e-6, 0, 1e-6)
+                      for i in nodes for j in nodes if i != j}
+
+    def make_flow(self) -> Flow:
+        path = self.random.sample(self.nodes, self.random.randint(2, 5))
+        return Flow(self.random.choice([1e6, 2e6]), self.random.choice([500, 1000]),
+                    self.random.choice([1000, 2000, 4000]), [self.links[i, j] for i, j in zip(path, path[1:])],
+                    self.random.choice(["A", "B", "CDT", "BE"]), self.random.choice(["LRQ", "LB"]))
+
+
+def assert_same_bounds(cbs: CBS):
+    expected = CBS(list(cbs.f))
+    flows = [flow for flow in cbs.f if flow.t in ("A", "B")]
+    if flows:
+        np.testing.assert_array_equal(cbs.end_to_end_delays(flows), expected.end_to_end_delays(flows))
+    assert [cbs.s_i_j(flow, flow.p[-1]) for flow in flows] == [expected.s_i_j(flow, flow.p[-1]) for flow in flows]
+    # the backlog is only defined at links of class A flows
+    links = {(link.i, link.j): link for flow in flows if flow.t == "A" for link in flow.p}.values()
+    assert [cbs.backlog_cbfs("A", link) for link in links] == [expected.backlog_cbfs("A", link) for link in links]
+
+
+def test_invalidated_links_and_flows_match_rebuild():
+    network = RandomNetwork(2)
+    cbs = CBS([network.make_flow() for _ in range(40)])
+    for _ in range(100):
+        if network.random.random() < 0.5:
+            link = network.random.choice(list(network.links.values()))
+            link.c = network.random.choice([100e6, 200e6, 1000e6])
+            link.idsl_a = network.random.choice([50e6, 40e6])
+            cbs.invalidate(link=link)
+        else:
+            flow = network.random.choice(cbs.f)
+            changed = network.make_flow()
+            flow.r, flow.l_max, flow.t, flow.p = changed.r, changed.l_max, changed.t, changed.p
+            cbs.invalidate(flow=flow)
+        assert_same_bounds(cbs)
+
+
+def test_aggregates_must_implement_their_parameters():
+    with pytest.raises(TypeError):
+        _Aggregate()
+
+
+def test_added_and_removed_flows_match_rebuild():
+    network = RandomNetwork(1)
+    cbs = CBS([network.make_flow() for _ in range(40)])
+    for _ in range(100):
+        if network.random.random() < 0.5 and len(cbs.f) > 3:
+            cbs.remove_flow(network.random.choice(cbs.f))
+        else:
+            cbs.add_flow(network.make_flow())
+        assert_same_bounds(cbs)
+
+
+def test_flows_are_shared_by_models(example):
+    cbs, f1 = example
+    # the keys of the links are kept by the model, a flow only holds its parameters
+    assert not hasattr(f1, "__dict__") and Flow.__slots__ == ("r", "p", "l_min", "l_max", "t", "at")
+    other = CBS([Flow(20 * math.pow(10, 6), 500, 500, make_path("H0", "H1"), "A", "LRQ"), f1])
+    assert other.links.key_of(f1.p[0]) != cbs.links.key_of(f1.p[0])
+    assert cbs.end_to_end_delay(f1) == 0.0006999999999999999
+    assert other.end_to_end_delays([f1]).tolist() == [other.end_to_end_delay(f1)]
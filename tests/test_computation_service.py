@@ -0,0 +1,76 @@
+import time
+import uuid
+
+import pytest
+
+from Model.ComputationService import ComputationService
+from Model.Result import Result
+
+
+def double(value):
+    return 2 * value
+
+
+def double_slowly(value):
+    time.sleep(2)
+    return 2 * value
+
+
+def fail():
+    raise ValueError("failed")
+
+
+def compute_slowly(result: Result):
+    for index in range(100):
+        result.publish("End-to-End Delay (s)", f"f{index}", index)
+        time.sleep(0.05)
+    result.finish()
+    return result
+
+
+@pytest.fixture
+def service():
+    service = ComputationService(2)
+    yield service
+    service.close()
+
+
+def test_results_are_returned(service):
+    key = uuid.uuid4()
+    results = []
+    errors = []
+    for value in range(4):
+        service.submit(key, double, (value,), callback=results.append)
+    service.submit(key, fail, (), error_callback=errors.append)
+    service.wait(key)
+    assert sorted(results) == [0, 2, 4, 6]
+    assert [str(error) for error in errors] == ["failed"]
+
+
+def test_canceled_computation_stops(service):
+    # the workers are started first, so the task is running when it is canceled
+    key = uuid.uuid4()
+    service.submit(key, double, (1,))
+    service.wait(key)
+    errors = []
+    service.submit(key, compute_slowly, (Result("configuration", None),), error_callback=errors.append)
+    time.sleep(0.5)
+    start = time.monotonic()
+    service.cancel(key)
+    service.wait(key)
+    assert time.monotonic() - start < 2
+    assert [type(error).__name__ for error in errors] == ["CanceledError"]
+
+
+def test_resize_keeps_running_tasks(service):
+    key = uuid.uuid4()
+    results = []
+    service.submit(key, double_slowly, (1,), callback=results.append)
+    start = time.monotonic()
+    service.resize(3)
+    # the current workers finish their task in the background
+    assert time.monotonic() - start < 1
+    service.submit(key, double, (2,), callback=results.append)
+    service.wait(key)
+    assert sorted(results) == [2, 4]
+    assert service.number_of_workers == 3
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from ComputationMethods.RTCToolboxCBS.MatlabEnginePool import MatlabEnginePool
+
+
+class StandInEngine:
+    """
+    Engine without MATLAB, which records the calls of the pool.
+    """
+
+    def __init__(self, is_broken=False):
+        self.is_broken = is_broken
+        self.commands = []
+        self.has_exited = False
+
+    def eval(self, command, nargout=0):
+        if self.is_broken:
+            raise RuntimeError("MATLAB was closed")
+        self.commands.append(command)
+
+    def exit(self):
+        self.has_exited = True
+
+
+def make_pool(engines: list, **kwargs) -> MatlabEnginePool:
+    """
+    :param engines: list collecting the started engines
+    :return: pool starting stand-in engines
+    """
+
+    def start():
+        engines.append(StandInEngine())
+        return engines[-1]
+
+    return MatlabEnginePool(engine_factory=start, **kwargs)
+
+
+def test_engines_are_reset_and_reused():
+    engines = []
+    pool = make_pool(engines)
+    with pool.engine() as engine:
+        assert engine.commands == []
+    with pool.engine() as second_engine:
+        assert second_engine is engine
+    assert engines == [engine]
+    assert engine.commands == ["clear all; close all force;"] * 2
+    pool.close()
+    assert engine.has_exited
+
+
+def test_warm_starts_engines_in_the_background():
+    engines = []
+    pool = make_pool(engines, size=2)
+    pool.warm()
+    first_engine = pool.acquire()
+    second_engine = pool.acquire()
+    assert {id(first_engine), id(second_engine)} == {id(engine) for engine in engines}
+    pool.release(first_engine)
+    pool.release(second_engine)
+    pool.close()
+
+
+def test_busy_engines_are_not_shared():
+    engines = []
+    pool = make_pool(engines, size=1)
+    engine = pool.acquire()
+    # another computation gets a new engine instead of waiting for the busy one
+    with pool.engine() as other_engine:
+        assert other_engine is not engine
+    pool.release(engine)
+    assert len(engines) == 2
+    pool.close()
+
+
+def test_broken_engines_are_shut_down():
+    engines = []
+    pool = make_pool(engines)
+    engine = pool.acquire()
+    engine.is_broken = True
+    pool.release(engine)
+    assert engine.has_exited
+    with pool.engine() as new_engine:
+        assert new_engine is not engine
+    pool.close()
+
+
+def test_idle_engines_are_shut_down():
+    engines = []
+    pool = make_pool(engines, idle_timeout=0.1)
+    with pool.engine() as engine:
+        pass
+    time.sleep(0.5)
+    assert engine.has_exited
+    pool.close()
+
+
+def test_errors_of_the_engine_factory_are_raised():
+    def fail():
+        raise RuntimeError("no license")
+
+    pool = MatlabEnginePool(engine_factory=fail)
+    with pytest.raises(RuntimeError, match="no license"):
+        pool.acquire()
+    pool.close()
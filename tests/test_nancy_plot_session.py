@@ -0,0 +1,64 @@
+import queue
+
+from Model.ComputationConfigurations.Nancy_CBS_Configuration import NancyPlotSession as plot_session_module
+from Model.ComputationConfigurations.Nancy_CBS_Configuration.NancyPlotSession import NancyPlotSession, _run_session
+from conftest import get_configuration, load_example
+
+
+class StandInProcess:
+    """
+    Process of a plot session, which keeps the requests in the queue of the session.
+    """
+
+    def is_alive(self):
+        return True
+
+
+class StandInConfiguration:
+    """
+    Configuration without Nancy, which records the plot calls of a session.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.associated_component = self
+        self.edges = {"edge": "edge"}
+
+    def open_plot_model(self):
+        self.calls.append("open")
+
+    def get_link_curves(self, edge):
+        self.calls.append(("link", edge))
+        return ["curve"], [f"curve of {edge}"]
+
+
+def test_network_is_only_sent_again_after_changes():
+    model = load_example("CBS Case Study.json")
+    network = model.network
+    configuration = get_configuration(model, "Nancy-CBS")
+    edge_id, other_edge_id = list(network.edges)[:2]
+    session = NancyPlotSession(configuration)
+    session._process = StandInProcess()
+    session._requests = queue.Queue()
+
+    session.plot_link(edge_id)
+    session.plot_link(other_edge_id)
+    assert [request[0] for request in session._requests.queue] == ["network", "link", "link"]
+
+    session._requests.queue.clear()
+    network.edges[edge_id].configurations[configuration.group_id].link_speed *= 2
+    session.plot_flow(next(iter(network.flows)))
+    assert [request[0] for request in session._requests.queue] == ["network", "flow"]
+
+
+def test_requests_are_plotted_in_one_figure(monkeypatch):
+    plots = []
+    monkeypatch.setattr(plot_session_module.nancy.Plot, "PythonPlot", lambda curves, names: plots.append(names))
+    configuration = StandInConfiguration()
+    requests = queue.Queue()
+    for request in [("network", configuration), ("link", "edge"), ("link", "removed"), ("link", "edge"), None]:
+        requests.put(request)
+    # the removed edge fails without stopping the session
+    _run_session(requests, batch_delay=0.1)
+    assert configuration.calls == ["open", ("link", "edge"), ("link", "edge")]
+    assert plots == [["curve of edge", "curve of edge"]]
@@ -0,0 +1,29 @@
+import os
+
+from Model.NetworkSnapshot import NetworkSnapshot
+from conftest import get_configuration, load_example
+
+
+def test_snapshot_has_only_the_configurations_of_one_group():
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    network = model.network
+    network.selected_components.append(next(iter(network.nodes.values())))
+    configuration = get_configuration(model)
+    group_id = configuration.group_id
+    model.add_configuration(type(configuration))
+    assert len(network.configurations) == 2
+    snapshot = NetworkSnapshot(network)
+    path = snapshot.get_path(group_id)
+    assert snapshot.get_path(group_id) == path
+
+    copy = NetworkSnapshot.load(path)
+    assert copy is not NetworkSnapshot.load(path)
+    assert copy.model is None and copy.selected_components == []
+    assert list(copy.configurations) == [group_id] and copy.configurations[group_id].model is None
+    for components in (copy.nodes, copy.edges, copy.flows):
+        for component in components.values():
+            assert list(component.configurations) == [group_id]
+    assert [flow.name for flow in copy.flows.values()] == [flow.name for flow in network.flows.values()]
+
+    snapshot.close()
+    assert not os.path.exists(path)
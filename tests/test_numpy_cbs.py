@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from ComputationMethods.AnalyticCBS import ConcaveCurve, RateLatencyCurve
+from ComputationMethods.NumpyCBS import Curve
+from conftest import get_configuration, load_example
+
+
+@pytest.mark.parametrize("burst, rate, service_rate, latency", [(1000, 20, 100, 0.5), (64, 1, 3, 0), (8, 7, 7, 2)])
+def test_deviations_match_analytic_curves(burst, rate, service_rate, latency):
+    exact = ConcaveCurve.token_bucket(burst, rate)
+    exact_service = RateLatencyCurve(service_rate, latency)
+    curve = Curve.sigma_rho(burst, rate)
+    service = Curve.rate_latency(service_rate, latency)
+    assert curve.horizontal_deviation(service) == pytest.approx(float(exact.horizontal_deviation(exact_service)))
+    assert curve.vertical_deviation(service) == pytest.approx(float(exact.vertical_deviation(exact_service)))
+
+
+def test_unstable_curves_have_no_deviation():
+    assert Curve.sigma_rho(10, 5).horizontal_deviation(Curve.rate_latency(4, 1)) is None
+    assert Curve.sigma_rho(10, 5).vertical_deviation(Curve.rate_latency(4, 1)) is None
+
+
+def test_stair_curve_is_bounded_by_its_token_bucket():
+    stair = Curve.stair(100, 2, 10)
+    token_bucket = Curve.sigma_rho(100, 50)
+    for t in (0.5, 1.9, 2.0, 2.1, 19.9, 25.0):
+        assert stair(t) == pytest.approx(100 * math.ceil(t / 2) if t <= 20 else 100 + 50 * t)
+        assert stair(t) <= token_bucket(t)
+
+
+def test_numpy_engine_matches_analytic_engine():
+    model = load_example("CBS Case Study.json")
+    network = model.network
+    configuration = get_configuration(model, "Nancy-CBS")
+    bounds = {}
+    for engine in ("Analytic", "NumPy"):
+        parameters = configuration.make_parameter_dict()
+        parameters["engine (Nancy/Analytic/NumPy)"] = engine
+        configuration.update_parameter_dict(parameters)
+        bounds[engine] = configuration.compute_work_units(network, configuration.get_work_units(network))
+
+    assert bounds["Analytic"].keys() == bounds["NumPy"].keys()
+    for unit, exact in bounds["Analytic"].items():
+        if unit == "engine":
+            continue
+        kind, _ = unit
+        if kind == "flow":
+            assert bounds["NumPy"][unit] == pytest.approx(float(exact))
+        else:
+            for avb_class, (delay, backlog) in exact.items():
+                assert bounds["NumPy"][unit][avb_class] == pytest.approx((float(delay), float(backlog)))
@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from Model.ParameterSweep import sweep
+from Model.Result import Result
+from conftest import get_configuration, load_example
+
+
+def test_sweep_matches_changed_networks(without_plots):
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    network = model.network
+    configuration = get_configuration(model)
+    group_id = configuration.group_id
+    edge_ids = list(network.edges)[:2]
+    flow_ids = list(network.flows)[:1]
+    axes = [("link_speed", edge_ids, [100, 1000]), ("l_max", flow_ids, [0.0005, 0.001, 0.002])]
+    arrays, result = model.run_sweep(configuration, axes, number_of_workers=2)
+
+    assert arrays["axis_0"].tolist() == [100, 1000] and arrays["axis_1"].tolist() == [0.0005, 0.001, 0.002]
+    assert arrays["end_to_end_delay"].shape == (2, 3, len(arrays["flows"]))
+    assert arrays["backlog"].shape == (2, 3, len(arrays["links"]), 2)
+    assert len(result.tables[0][2]) == 6
+
+    # every grid point equals a computation of the network with the values of the point
+    flow_names = {flow.name: flow.id for flow in network.flows.values()}
+    link_names = {f"{node_i.name}-{node_j.name}": (node_i.id, node_j.id)
+                  for flow in network.flows.values() for node_i, node_j in zip(flow.path, flow.path[1:])}
+    for (index_0, link_speed), (index_1, l_max) in itertools.product(*(enumerate(values) for _, _, values in axes)):
+        for edge_id in edge_ids:
+            network.edges[edge_id].configurations[group_id].link_speed = link_speed
+        for flow_id in flow_ids:
+            network.flows[flow_id].configurations[group_id].l_max = l_max
+        configuration.compute(network, Result(configuration.name, group_id))
+        flow_records = configuration._compute_args["flow_records"]
+        link_records = configuration._compute_args["link_records"]
+        assert arrays["end_to_end_delay"][index_0, index_1].tolist() == \
+               [flow_records[flow_names[name]]["end_to_end_delay"] for name in arrays["flows"]]
+        assert arrays["backlog"][index_0, index_1].tolist() == \
+               [[link_records[link_names[name]][traffic_class] for traffic_class in ("A", "B")]
+                for name in arrays["links"]]
+
+
+def test_sweep_rejects_unknown_parameters():
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    network = model.network
+    configuration = get_configuration(model)
+    edge_ids = list(network.edges)[:1]
+    with pytest.raises(ValueError):
+        sweep(configuration, network, [("max_frame_size", edge_ids, [1])])
+    with pytest.raises(ValueError):
+        sweep(configuration, network, [("link_speed", list(network.flows)[:1], [100])])
+    with pytest.raises(ValueError):
+        sweep(configuration, network, [("link_speed", edge_ids, [])])
+    assert np.array_equal(sweep(configuration, network, [("link_speed", edge_ids, [100])])["axis_0"], [100])
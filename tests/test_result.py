@@ -0,0 +1,64 @@
+import queue
+import threading
+
+import pytest
+
+from Model.Result import CanceledError, Result
+from conftest import get_configuration, load_example
+
+
+def receive(stream: queue.Queue, result: Result):
+    while not stream.empty():
+        result_id, updates = stream.get()
+        assert result_id == result.id
+        result.receive_updates(updates)
+
+
+def test_streamed_bounds_match_the_result(without_plots):
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    network = model.network
+    configuration = get_configuration(model)
+    result = Result(configuration.name, configuration.group_id)
+    result.stream = queue.Queue()
+    configuration.compute(network, result)
+    result.flush_stream()
+
+    # the main process receives the bounds on its own copy of the result
+    received_result = Result(configuration.name, configuration.group_id)
+    received_result.id = result.id
+    receive(result.stream, received_result)
+    assert received_result.phase == "Creating plots"
+    flow_records = configuration._compute_args["flow_records"]
+    assert received_result.partial_bounds["End-to-End Delay (s)"] == \
+           {network.flows[flow_id].name: flow_records[flow_id]["end_to_end_delay"]
+            for flow_id in configuration.flow_ids_of_interest}
+    assert {"Backlog class A (bit)", "Backlog class B (bit)"} <= received_result.partial_bounds.keys()
+    assert received_result.get_partial_text().startswith("Phase: Creating plots\nEnd-to-End Delay (s):\n")
+
+
+def test_bounds_are_not_streamed_without_stream():
+    result = Result("configuration", None)
+    result.publish("End-to-End Delay (s)", "f0", 1.0)
+    result.set_phase("Computing")
+    result.flush_stream()
+    assert result.partial_bounds == {} and result._stream_buffer == []
+
+
+def test_canceled_computation_stops(without_plots):
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    configuration = get_configuration(model)
+    result = Result(configuration.name, configuration.group_id)
+    result.cancel_event = threading.Event()
+    result.cancel_event.set()
+    with pytest.raises(CanceledError):
+        configuration.compute(model.network, result)
+    assert result.result_text == ""
+
+    # publish() only queries the event of the main process from time to time
+    result = Result("configuration", None)
+    result.cancel_event = threading.Event()
+    result.publish("End-to-End Delay (s)", "f0", 1.0)
+    result.cancel_event.set()
+    result.publish("End-to-End Delay (s)", "f1", 1.0)
+    with pytest.raises(CanceledError):
+        result.check_canceled()
@@ -0,0 +1,81 @@
+import os
+import stat
+
+import pytest
+
+from Model.Result import Result
+from Model.ResultCache import ResultCache
+from conftest import get_configuration, load_example
+
+
+def make_result(text: str) -> Result:
+    result = Result("configuration", None)
+    result.result_text = text
+    result.tables = [("Table", ["Flow", "Delay"], [("f1", 0.1)])]
+    result.finish()
+    return result
+
+
+def test_stored_result_is_returned(tmp_path):
+    cache = ResultCache(tmp_path.joinpath("results"))
+    cache.put("key", make_result("bounds"))
+    cache.flush()
+
+    result = Result("configuration", None)
+    # a new cache only finds the file
+    cached_result = ResultCache(tmp_path.joinpath("results")).get("key", result)
+    assert cached_result.result_text == "bounds"
+    assert cached_result.tables == [("Table", ["Flow", "Delay"], [("f1", 0.1)])]
+    assert cached_result.id == result.id
+    assert cached_result.is_cached and cached_result.is_finished
+    assert cache.get("unknown", result) is None
+
+
+def test_directory_is_private(tmp_path):
+    directory = tmp_path.joinpath("results")
+    cache = ResultCache(directory)
+    cache.put("key", make_result("bounds"))
+    cache.flush()
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+    # files in a directory, which other users can write to, are not unpickled
+    directory.chmod(0o777)
+    assert ResultCache(directory).get("key", Result("configuration", None)) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid") or os.getuid() != 0, reason="changing the owner requires root")
+def test_files_of_other_users_are_ignored(tmp_path):
+    directory = tmp_path.joinpath("results")
+    cache = ResultCache(directory)
+    cache.put("key", make_result("bounds"))
+    cache.flush()
+    os.chown(directory.joinpath("key.pickle"), 1, 1)
+    assert ResultCache(directory).get("key", Result("configuration", None)) is None
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    directory = tmp_path.joinpath("results")
+    cache = ResultCache(directory, max_bytes=2000)
+    for index in range(5):
+        cache.put(f"key{index}", make_result("a" * 600))
+    cache.flush()
+    files = {path.stem: path.stat().st_size for path in directory.glob("*.pickle")}
+    assert "key4" in files and "key0" not in files
+    assert sum(files.values()) <= 2000
+
+    cache.clear()
+    assert list(directory.glob("*.pickle")) == []
+
+
+def test_key_depends_on_parameters_only():
+    model = load_example("CBS-CDT-ATS Case Study 1.json")
+    network = model.network
+    configuration = get_configuration(model)
+    key = ResultCache.make_key(network, configuration)
+
+    configuration.name = "Renamed"
+    assert ResultCache.make_key(network, configuration) == key
+
+    edge = next(iter(network.edges.values()))
+    edge.configurations[configuration.group_id].link_speed = 1000
+    assert ResultCache.make_key(network, configuration) != key
@@ -0,0 +1,118 @@
+import pathlib
+import shutil
+import tempfile
+
+import pytest
+
+from ComputationMethods.NumpyCBS import NumpyWrapper
+from ComputationMethods.RTCToolboxCBS import MatlabEnginePool as engine_pool_module
+from ComputationMethods.RTCToolboxCBS.MatlabEnginePool import MatlabEnginePool
+from Model.Result import Result
+from conftest import get_configuration, load_example
+
+
+class StandInEngine:
+    """
+    Engine without MATLAB, which computes analyze_network.m with NumPy curves. It has no other calls of the MATLAB
+    implementation, so a computation fails if it does not use the single call.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def analyze_network(self, *args, nargout=0):
+        self.calls.append(args)
+        return NumpyWrapper().analyze_network(*args)
+
+    def eval(self, command, nargout=0):
+        pass
+
+    def exit(self):
+        pass
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """
+    Replaces the engine pool of this process by a pool of stand-in engines.
+
+    :return: list of the started engines
+    """
+    engines = []
+
+    def start():
+        engines.append(StandInEngine())
+        return engines[-1]
+
+    pool = MatlabEnginePool(engine_factory=start)
+    monkeypatch.setattr(engine_pool_module, "_engine_pool", pool)
+    yield engines
+    pool.close()
+
+
+def compute(configuration, network, engine: str) -> Result:
+    configuration.engine = engine
+    result = Result(configuration.name, configuration.group_id)
+    configuration.compute(network, result)
+    return result
+
+
+def test_bounds_are_computed_with_a_single_call(without_plots, engines):
+    model = load_example("CBS Case Study.json")
+    network = model.network
+    configuration = get_configuration(model, "rtctoolbox-matlab-CBS")
+    result = compute(configuration, network, "RTC Toolbox")
+    assert len(engines) == 1 and len(engines[0].calls) == 1
+    assert result.result_text == compute(configuration, network, "NumPy").result_text
+
+    # the batch call equals the calls for single links and flows
+    wrapper = NumpyWrapper()
+    configuration._compute_args = {}
+    configuration._make_matlab_objects()
+    links = [wrapper.Link(*row) for row in configuration._compute_args["links"]]
+    flows = [wrapper.Flow(*row[:4], [links[index] for index in row[4]], *row[5:])
+             for row in configuration._compute_args["flows"]]
+    cbs = wrapper.CBS(configuration.max_frame_size_a, configuration.max_frame_size_b,
+                      configuration.max_frame_size_nsr, configuration.is_strict, flows)
+    _, _, _, _, _, _, flow_indices, link_indices, path_folder, network_name, _, _ = engines[0].calls[0]
+    e2e_delays, link_delays, link_backlogs = wrapper.analyze_network(*engines[0].calls[0])
+    assert e2e_delays == [wrapper.end_to_end_delay(cbs, flows[index], path_folder, network_name)
+                          for index in flow_indices]
+    assert link_delays == [[wrapper.delay_link(cbs, links[index], avb_class, path_folder, network_name)
+                            for avb_class in ("A", "B")] for index in link_indices]
+    assert link_backlogs == [[wrapper.backlog_link(cbs, links[index], avb_class, path_folder, network_name)
+                              for avb_class in ("A", "B")] for index in link_indices]
+
+
+def test_no_files_are_written_without_plots(without_plots, engines):
+    model = load_example("CBS Case Study.json")
+    network = model.network
+    configuration = get_configuration(model, "rtctoolbox-matlab-CBS")
+    assert configuration.is_result_cacheable()
+    result = compute(configuration, network, "RTC Toolbox")
+    *_, path_folder, _, plot_flow_indices, plot_link_indices = engines[0].calls[-1]
+    assert (path_folder, plot_flow_indices, plot_link_indices) == ("", [], [])
+    assert not pathlib.Path(tempfile.gettempdir()).joinpath(str(result.id)).exists()
+
+
+def test_only_requested_curves_are_plotted(without_plots, engines):
+    model = load_example("CBS Case Study.json")
+    network = model.network
+    configuration = get_configuration(model, "rtctoolbox-matlab-CBS")
+    configuration.save_matlab_plots = True
+    flow = network.flows[configuration.flow_ids_of_interest[0]]
+    link_name = f"{flow.path[0].name}-{flow.path[1].name}"
+    configuration.matlab_plot_names = [flow.name, link_name]
+    assert not configuration.is_result_cacheable()
+    result = compute(configuration, network, "RTC Toolbox")
+    directory = pathlib.Path(tempfile.gettempdir()).joinpath(str(result.id))
+    try:
+        assert directory.is_dir()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    _, _, _, _, links, flows, *_, path_folder, network_name, plot_flow_indices, plot_link_indices = \
+        engines[0].calls[-1]
+    assert (path_folder, network_name) == (tempfile.gettempdir(), str(result.id))
+    assert [flows[index][0] for index in plot_flow_indices] == [flow.name]
+    assert [links[index][0] for index in plot_link_indices] == [link_name]
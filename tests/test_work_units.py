@@ -0,0 +1,41 @@
+import pickle
+
+import pytest
+
+from Model.Result import Result
+from conftest import get_configuration, load_example
+
+
+def without_cache_statistics(result: Result) -> list[str]:
+    return [line for line in result.result_text.splitlines() if not line.startswith("Curve cache")]
+
+
+@pytest.mark.parametrize("example, identifier, engine", [("CBS-CDT-ATS Case Study 1.json", "CBS-CDT-ATS", None),
+                                                         ("CBS Case Study.json", "Nancy-CBS", "NumPy"),
+                                                         ("CBS Case Study.json", "Nancy-CBS", "Analytic")])
+def test_sharded_computation_matches_computation_as_a_whole(without_plots, example, identifier, engine):
+    model = load_example(example)
+    network = model.network
+    configuration = get_configuration(model, identifier)
+    if engine is not None:
+        parameters = configuration.make_parameter_dict()
+        parameters["engine (Nancy/Analytic/NumPy)"] = engine
+        configuration.update_parameter_dict(parameters)
+    result = Result(configuration.name, configuration.group_id)
+    configuration.compute(network, result)
+
+    units = configuration.get_work_units(network)
+    assert len(units) == len(set(units)) > 3
+    # every shard and the merge run on their own copy of the network as in the worker processes
+    partial_results = []
+    for shard in (units[::3], units[1::3], units[2::3]):
+        network_copy = pickle.loads(pickle.dumps(network))
+        configuration_copy = network_copy.configurations[configuration.group_id]
+        partial_results.append(configuration_copy.compute_work_units(network_copy, shard))
+    assert {unit for partial_result in partial_results for unit in partial_result} - {"engine"} == set(units)
+    network_copy = pickle.loads(pickle.dumps(network))
+    merged_result = Result(configuration.name, configuration.group_id)
+    network_copy.configurations[configuration.group_id].merge_work_units(network_copy, merged_result,
+                                                                         partial_results)
+    # the cache statistics sum up the shards, which compute the curves of shared upstream links each
+    assert without_cache_statistics(merged_result) == without_cache_statistics(result)